@@ -0,0 +1,51 @@
+"""
+Password hashers whose cost comes from settings.
+
+They store hashes in the same format as Django's own Argon2 and scrypt
+hashers, so either can verify the other's hashes. Because ``must_update``
+compares a stored hash's parameters with the configured ones, changing
+the cost re-hashes each user's password the next time they log in.
+"""
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with ``PASSWORD_ARGON2_COST`` (time, memory in KiB and
+    parallelism)."""
+
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_COST["time_cost"]
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_COST["memory_cost"]
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_COST["parallelism"]
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """scrypt with ``PASSWORD_SCRYPT_COST`` (work factor N, block size r
+    and parallelism p)."""
+
+    @property
+    def work_factor(self):
+        return settings.PASSWORD_SCRYPT_COST["work_factor"]
+
+    @property
+    def block_size(self):
+        return settings.PASSWORD_SCRYPT_COST["block_size"]
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_SCRYPT_COST["parallelism"]
+
+    @property
+    def maxmem(self):
+        # scrypt needs 128 * N * r bytes. Allow twice that, so work factors
+        # above OpenSSL's default 32 MiB limit still work.
+        return 2 * 128 * self.work_factor * self.block_size
@@ -0,0 +1,65 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete expired sessions in small batches, so the purge never holds "
+        "a long lock on the session table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Sessions deleted per transaction.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.0,
+            help="Seconds to pause between batches.",
+        )
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database alias holding the session table.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        engine = import_module(settings.SESSION_ENGINE)
+        if not hasattr(engine.SessionStore, "get_model_class"):
+            self.stdout.write(
+                f"{settings.SESSION_ENGINE} keeps no session table; "
+                "nothing to purge.")
+            return
+        Session = engine.SessionStore.get_model_class()
+
+        using = options["database"]
+        batch_size = options["batch_size"]
+        # Only sessions that had expired when the purge started, so it
+        # always finishes even while new sessions keep expiring.
+        expired = Session.objects.using(using).filter(
+            expire_date__lt=timezone.now())
+        total = 0
+        while True:
+            with transaction.atomic(using=using):
+                keys = list(expired.values_list(
+                    "session_key", flat=True)[:batch_size])
+                if not keys:
+                    break
+                total += Session.objects.using(using).filter(
+                    session_key__in=keys).delete()[0]
+            self.stdout.write(f"Deleted {total} expired sessions...")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Purged {total} expired sessions."))
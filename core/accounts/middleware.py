@@ -0,0 +1,30 @@
+from functools import partial
+
+from django.contrib import auth
+from django.contrib.auth import middleware
+from django.utils.functional import SimpleLazyObject
+
+
+def get_user(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = auth.get_user(request)
+    return request._cached_user
+
+
+async def auser(request):
+    if not hasattr(request, "_cached_user"):
+        request._cached_user = await auth.aget_user(request)
+    return request._cached_user
+
+
+class AuthenticationMiddleware(middleware.AuthenticationMiddleware):
+    """
+    Django memoises ``request.user`` and ``request.auser()`` separately, so
+    a request that uses both (an async view whose template reads ``user``,
+    say) loads the session and user twice. Here they share one result.
+    """
+
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(partial(get_user, request))
+        request.auser = partial(auser, request)
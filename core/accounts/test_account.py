@@ -1,6 +1,18 @@
+from datetime import timedelta
+from io import StringIO
+
+from asgiref.sync import async_to_sync
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.contrib.sessions.models import Session
+from django.core.management import CommandError, call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
+
+from .middleware import AuthenticationMiddleware
 
 
 class CustomUserModelTests(TestCase):
@@ -76,3 +88,147 @@ class SignUpViewTests(TestCase):
 
         User = get_user_model()
         self.assertFalse(User.objects.filter(username="baduser").exists())
+
+
+class AuthenticationMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="tuser",
+            email="tuser@example.com",
+            password="pass12345!",
+        )
+
+    def test_user_and_auser_share_one_lookup(self):
+        request = RequestFactory().get("/")
+        SessionMiddleware(lambda request: HttpResponse()).process_request(
+            request)
+        request.session["_auth_user_id"] = str(self.user.pk)
+        request.session["_auth_user_backend"] = (
+            "django.contrib.auth.backends.ModelBackend")
+        request.session["_auth_user_hash"] = (
+            self.user.get_session_auth_hash())
+        AuthenticationMiddleware(
+            lambda request: HttpResponse()).process_request(request)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(request.user.pk, self.user.pk)
+            self.assertIs(async_to_sync(request.auser)(), request._cached_user)
+
+
+class SessionEngineTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        get_user_model().objects.create_user(
+            username="tuser",
+            email="tuser@example.com",
+            password="pass12345!",
+        )
+
+    def assertPageLoadsWithOneQuery(self):
+        self.client.login(username="tuser", password="pass12345!")
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("home"))
+        self.assertContains(response, "tuser")
+
+    @override_settings(
+        SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+    def test_cached_db_sessions_are_read_from_the_cache(self):
+        # Only the user is loaded; the session comes from the cache.
+        self.assertPageLoadsWithOneQuery()
+
+    @override_settings(
+        SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+    def test_signed_cookie_sessions_need_no_table(self):
+        self.assertPageLoadsWithOneQuery()
+        self.assertFalse(Session.objects.exists())
+
+
+class PurgeSessionsCommandTests(TestCase):
+    def make_session(self, expire_date):
+        session = SessionStore()
+        session["data"] = "x"
+        session.create()
+        Session.objects.filter(session_key=session.session_key).update(
+            expire_date=expire_date)
+        return session.session_key
+
+    def test_deletes_only_expired_sessions_in_batches(self):
+        now = timezone.now()
+        expired = [self.make_session(now - timedelta(days=1))
+                   for _ in range(5)]
+        live = [self.make_session(now + timedelta(days=1)) for _ in range(2)]
+
+        out = StringIO()
+        call_command("purge_sessions", batch_size=2, stdout=out)
+
+        self.assertFalse(Session.objects.filter(session_key__in=expired))
+        self.assertEqual(
+            set(Session.objects.values_list("session_key", flat=True)),
+            set(live),
+        )
+        self.assertIn("Deleted 2 expired sessions", out.getvalue())
+        self.assertIn("Purged 5 expired sessions.", out.getvalue())
+
+    def test_rejects_batch_sizes_below_one(self):
+        expired = self.make_session(timezone.now() - timedelta(days=1))
+        for batch_size in (0, -1):
+            with self.assertRaisesMessage(CommandError, "--batch-size"):
+                call_command("purge_sessions", batch_size=batch_size,
+                             stdout=StringIO())
+        self.assertTrue(Session.objects.filter(session_key=expired).exists())
+
+    @override_settings(
+        SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+    def test_nothing_to_purge_for_cookie_sessions(self):
+        out = StringIO()
+        call_command("purge_sessions", stdout=out)
+        self.assertIn("nothing to purge", out.getvalue())
+
+
+@override_settings(
+    PASSWORD_HASHERS=[
+        "accounts.hashers.Argon2PasswordHasher",
+        "accounts.hashers.ScryptPasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+    ],
+    PASSWORD_ARGON2_COST={
+        "time_cost": 1, "memory_cost": 64, "parallelism": 1},
+    PASSWORD_SCRYPT_COST={
+        "work_factor": 2 ** 4, "block_size": 8, "parallelism": 1},
+)
+class PasswordHashingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="tuser", password="pass12345!")
+
+    def login(self):
+        self.assertTrue(
+            self.client.login(username="tuser", password="pass12345!"))
+        self.user.refresh_from_db()
+        return self.user.password
+
+    def test_new_passwords_use_the_configured_cost(self):
+        self.assertTrue(self.user.password.startswith(
+            "argon2$argon2id$v=19$m=64,t=1,p=1$"))
+
+    def test_legacy_hashes_are_upgraded_on_login(self):
+        with self.settings(PASSWORD_HASHERS=[
+                "django.contrib.auth.hashers.PBKDF2PasswordHasher"]):
+            self.user.set_password("pass12345!")
+            self.user.save()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+
+        self.assertTrue(self.login().startswith("argon2$"))
+
+    def test_changing_the_cost_rehashes_on_login(self):
+        with self.settings(PASSWORD_ARGON2_COST={
+                "time_cost": 2, "memory_cost": 128, "parallelism": 1}):
+            self.assertIn("$m=128,t=2,p=1$", self.login())
+
+    def test_scrypt_cost_is_configurable(self):
+        with self.settings(PASSWORD_HASHERS=[
+                "accounts.hashers.ScryptPasswordHasher",
+                "accounts.hashers.Argon2PasswordHasher"]):
+            self.assertTrue(self.login().startswith("scrypt$16$"))
@@ -0,0 +1,60 @@
+"""
+Time what admission control costs and what a rejection saves.
+
+Sends a burst of ``--burst`` ticket_add POSTs from one user, first with
+``ADMISSION_CONTROL`` off and then with a per-user bucket that only lets
+``--allow`` of them through, and reports the median time of an admitted
+write, of a rejected one and of a ticket list read::
+
+    python -m benchmarks.bench_admission --burst 500 --allow 50
+"""
+
+import argparse
+import statistics
+import time
+
+from . import common
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--burst", type=int, default=500)
+    parser.add_argument("--allow", type=int, default=50)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.conf import settings
+    from django.core.cache import caches
+    from django.test import Client, override_settings
+    from django.urls import reverse
+
+    authors = common.seed(users=10, tickets=1000)
+    client = Client()
+    client.force_login(authors[0])
+    add_url = reverse("ticket_add")
+    list_url = reverse("ticket_list")
+    limits = {"ticket_add": {"user": (0.001, args.allow), "concurrency": 4}}
+
+    print(f"{args.burst} ticket_add POSTs from one user, median ms\n")
+    print(f"{'admission control':<20}{'admitted':>10}{'rejected':>10}"
+          f"{'list read':>11}")
+    for label, config in (("off", {}), ("on", limits)):
+        caches[settings.ADMISSION_CACHE].clear()
+        timings = {302: [], 429: []}
+        with override_settings(ADMISSION_CONTROL=config):
+            for _ in range(args.burst):
+                started = time.perf_counter()
+                response = client.post(add_url, {"title": "T", "body": "B"})
+                timings[response.status_code].append(
+                    (time.perf_counter() - started) * 1000)
+            read = common.timed(lambda: client.get(list_url), 30)
+        medians = [
+            f"{statistics.median(values):.2f}" if values else "-"
+            for values in timings.values()
+        ]
+        print(f"{label:<20}{medians[0]:>10}{medians[1]:>10}"
+              f"{read['median_ms']:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
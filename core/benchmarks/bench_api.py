@@ -0,0 +1,71 @@
+"""
+Compare the JSON ticket API with the HTML ticket list.
+
+Seeds the tickets table, then fetches the first page of the HTML list and
+of the API (all fields, and a narrow ``id,title,is_completed``
+projection) as a superuser, who sees every ticket in both, with the same
+page size::
+
+    python -m benchmarks.bench_api --tickets 100000 --per-page 50
+
+Reports latency, requests per second, response bytes per ticket and
+queries per request.
+"""
+
+import argparse
+from unittest import mock
+
+from . import common
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--per-page", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.db import connection
+    from django.test import Client
+    from django.urls import reverse
+
+    from accounts.models import CustomUser
+    from core.metrics import QueryTimer
+    from tickets.views import TicketListView
+
+    common.seed(tickets=args.tickets)
+    client = Client()
+    client.force_login(CustomUser.objects.create_superuser(
+        username="bench-admin", password="bench-admin"))
+    api = reverse("ticket_api")
+    runs = {
+        "html list": (reverse("ticket_list"), {}),
+        "api all fields": (api, {"limit": args.per_page}),
+        "api id,title,is_completed": (api, {
+            "limit": args.per_page, "fields": "id,title,is_completed"}),
+    }
+
+    print(f"{args.tickets} tickets, {args.per_page} per page, "
+          f"{args.repeat} requests\n")
+    print(f"{'run':<28}{'p50 ms':>9}{'req/s':>9}{'bytes':>9}"
+          f"{'B/ticket':>10}{'queries':>9}")
+    with mock.patch.object(TicketListView, "paginate_by", args.per_page):
+        for name, (url, params) in runs.items():
+            def fetch():
+                return client.get(url, params)
+
+            response = fetch()
+            assert response.status_code == 200, response.status_code
+            queries = QueryTimer()
+            with connection.execute_wrapper(queries):
+                fetch()
+            stats = common.timed(fetch, repeat=args.repeat)
+            size = len(response.content)
+            print(f"{name:<28}{stats['median_ms']:>9.2f}"
+                  f"{1000 / stats['median_ms']:>9.0f}{size:>9}"
+                  f"{size / args.per_page:>10.0f}{queries.count:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Show how archiving keeps the hot ticket paths flat as history grows.
+
+For each history size, seeds a fresh ticket table with that many
+completed tickets from before the last ``--days`` days plus a fixed
+``--recent`` set raised within them (80% completed), times the hot paths,
+archives the old tickets and times them again::
+
+    python -m benchmarks.bench_archive --history 10000 50000 200000
+
+The hot paths are the first page of the ticket list, a page of completed
+tickets, an owner's JSON API page and a search. Also reports how long
+archiving took.
+"""
+
+import argparse
+import random
+import time
+from datetime import timedelta
+
+from . import common, factories
+
+
+def hot_paths(client, owner_client):
+    from django.urls import reverse
+
+    from tickets.models import Ticket
+    from tickets.pagination import KeysetPaginator
+    from tickets.views import TicketListView
+
+    url = reverse("ticket_list")
+    # A page of completed tickets, which sort after every open one.
+    first_completed = Ticket.objects.filter(is_completed=True).order_by(
+        "-date", "-id").first()
+    cursor = KeysetPaginator(
+        Ticket.objects.all(), 50, TicketListView.ordering,
+    ).encode_cursor(first_completed)
+    return {
+        "list page 1": lambda: client.get(url),
+        "list, completed": lambda: client.get(url, {"after": cursor}),
+        "owner api": lambda: owner_client.get(reverse("ticket_api")),
+        "search": lambda: client.get(url, {"q": "printer"}),
+    }
+
+
+def seed(history, recent, days, authors):
+    """``history`` completed tickets from before the last ``days`` days and
+    ``recent`` tickets from within them."""
+    from django.db.models import F
+    from django.utils import timezone
+
+    from tickets.models import Ticket
+
+    rng = random.Random(1234)
+    factories.create_tickets(history, authors, rng, completed_ratio=1.0)
+    age = timedelta(days=days)
+    Ticket._base_manager.update(date=F("date") - age, modified=F("date") - age)
+    now = timezone.now()
+    tickets = []
+    for n in range(recent):
+        ticket = factories.build_ticket(history + n, rng, authors, now)
+        ticket.date = ticket.modified = now - timedelta(
+            seconds=rng.randrange(days * 86400))
+        tickets.append(ticket)
+    with common.explicit_dates(Ticket):
+        Ticket.objects.bulk_create(tickets)
+
+
+def measure(paths, repeat):
+    return {name: common.timed(path, repeat)["median_ms"]
+            for name, path in paths.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--history", type=int, nargs="+",
+                        default=[10_000, 50_000, 200_000])
+    parser.add_argument("--recent", type=int, default=5_000)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    connection = common.setup()
+    from django.test import Client
+
+    from accounts.models import CustomUser
+    from tickets.archive import archive_tickets
+    from tickets.models import ArchivedTicket, Ticket
+
+    print(f"Archiving tickets completed over {args.days} days ago, "
+          f"median ms over {args.repeat} requests\n")
+    authors = factories.create_users(100)
+    client = Client()
+    client.force_login(CustomUser.objects.create_superuser(
+        username="bench-admin", password="bench-admin"))
+    owner_client = Client()
+    owner_client.force_login(authors[0])
+    for size in args.history:
+        # Start each size from an empty table.
+        Ticket._base_manager.all()._raw_delete(connection.alias)
+        ArchivedTicket.objects.all()._raw_delete(connection.alias)
+        seed(size, args.recent, args.days, authors)
+
+        before = measure(hot_paths(client, owner_client), args.repeat)
+        started = time.perf_counter()
+        archived = sum(archive_tickets(days=args.days))
+        elapsed = time.perf_counter() - started
+        hot = Ticket.objects.count()
+        after = measure(hot_paths(client, owner_client), args.repeat)
+
+        print(f"{size} old + {args.recent} recent tickets: archived "
+              f"{archived} in {elapsed:.1f} s ({archived / elapsed:.0f}/s), "
+              f"{hot} left in the hot table")
+        print(f"  {'path':<18}{'before':>9}{'after':>9}")
+        for name in before:
+            print(f"  {name:<18}{before[name]:>9.2f}{after[name]:>9.2f}")
+        print()
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Measure the ticket card fragment cache on the local-memory and LRU
+file-based backends.
+
+A few users page through the ticket list repeatedly while a share of the
+tickets is edited between passes; the hit rate and list latency are
+reported for each backend, with the dummy backend as the uncached
+baseline::
+
+    python -m benchmarks.bench_card_cache --tickets 5000 --passes 5
+"""
+
+import argparse
+import random
+import tempfile
+
+from . import common
+
+
+def run(users, passes, pages, edit_ratio):
+    from django.core.cache import caches
+    from django.test import Client
+    from django.urls import reverse
+
+    from tickets import cards
+    from tickets.models import Ticket
+
+    caches[cards.CACHE_ALIAS].clear()
+    cards.stats.reset()
+    rng = random.Random(1234)
+    clients = []
+    for user in users:
+        client = Client()
+        client.force_login(user)
+        clients.append(client)
+    url = reverse("ticket_list")
+    ids = list(Ticket.objects.values_list("pk", flat=True))
+
+    def browse():
+        for client in clients:
+            params = {}
+            for _ in range(pages):
+                page = client.get(url, params).context["page_obj"]
+                if not page.has_next():
+                    break
+                params = {"after": page.next_cursor}
+
+    latency = None
+    for _ in range(passes):
+        edited = rng.sample(ids, int(len(ids) * edit_ratio))
+        for ticket in Ticket.objects.filter(pk__in=edited):
+            ticket.title += "!"
+            ticket.save(update_fields=["title"])
+        latency = common.timed(browse, repeat=1)
+    return cards.stats.hit_rate, latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tickets", type=int, default=5_000)
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--passes", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--edit-ratio", type=float, default=0.02)
+    args = parser.parse_args()
+
+    common.setup()
+    from django.test import override_settings
+
+    authors = common.seed(users=args.users, tickets=args.tickets)
+    with tempfile.TemporaryDirectory() as directory:
+        backends = {
+            "none": {
+                "BACKEND": "django.core.cache.backends.dummy.DummyCache",
+            },
+            "locmem": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": "bench-ticket-cards",
+            },
+            "file (LRU)": {
+                "BACKEND": "core.cache.LRUFileBasedCache",
+                "LOCATION": directory,
+            },
+        }
+        print(f"{'backend':<12}{'hit rate':>10}{'last pass ms':>14}")
+        for name, backend in backends.items():
+            caches = {
+                "default": backends["locmem"],
+                "ticket_cards": {
+                    **backend, "OPTIONS": {"MAX_ENTRIES": 50_000}},
+            }
+            with override_settings(CACHES=caches):
+                hit_rate, latency = run(
+                    authors, args.passes, args.pages, args.edit_ratio)
+            print(f"{name:<12}{hit_rate:>10.1%}"
+                  f"{latency['median_ms']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Compare opening a database connection per request with reusing one, on
+the ticket list.
+
+Requests go through the test client, and connections are released after
+each one with ``close_old_connections()`` just as the real request
+handlers do, so ``CONN_MAX_AGE`` decides whether the next request
+reconnects::
+
+    python -m benchmarks.bench_connections --requests 500
+    DATABASE_URL=postgres://... python -m benchmarks.bench_connections
+
+Modes:
+
+* ``per-request``: ``CONN_MAX_AGE = 0``, connect and disconnect every time.
+* ``persistent``: ``CONN_MAX_AGE = 600``, one connection per worker.
+* ``pooled``: Django's psycopg pool; PostgreSQL with psycopg_pool only.
+"""
+
+import argparse
+from importlib.util import find_spec
+
+from . import common
+
+
+def configure(connection, mode):
+    connection.close()
+    if connection.vendor == "postgresql":
+        connection.close_pool()
+        connection.settings_dict["OPTIONS"].pop("pool", None)
+    if mode == "pooled":
+        connection.settings_dict["CONN_MAX_AGE"] = 0
+        connection.settings_dict["OPTIONS"]["pool"] = {
+            "min_size": 1, "max_size": 4}
+    else:
+        connection.settings_dict["CONN_MAX_AGE"] = (
+            0 if mode == "per-request" else 600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tickets", type=int, default=10_000)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    connection = common.setup(on_disk=True)
+    authors = common.seed(users=10, tickets=args.tickets)
+
+    from django.db import close_old_connections
+    from django.test import Client
+    from django.urls import reverse
+
+    client = Client()
+    client.force_login(authors[0])
+    url = reverse("ticket_list")
+
+    def request():
+        response = client.get(url)
+        assert response.status_code == 200, response.status_code
+        close_old_connections()
+
+    modes = ["per-request", "persistent"]
+    if connection.vendor == "postgresql" and find_spec("psycopg_pool"):
+        modes.append("pooled")
+
+    print(f"{args.tickets} tickets, {connection.vendor}, "
+          f"{args.requests} requests per mode\n")
+    print(f"{'mode':<14}{'median ms':>12}{'p95 ms':>10}{'max ms':>10}")
+    for mode in modes:
+        configure(connection, mode)
+        request()
+        result = common.timed(request, args.requests)
+        print(f"{mode:<14}{result['median_ms']:>12.2f}"
+              f"{result['p95_ms']:>10.2f}{result['max_ms']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
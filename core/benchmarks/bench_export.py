@@ -0,0 +1,65 @@
+"""
+Check that ``export_tickets`` streams in constant memory.
+
+Seeds the tickets table, exports it in each format to /dev/null and fails
+if resident memory grows by more than ``--max-rss-mb`` during an export::
+
+    python -m benchmarks.bench_export --tickets 1000000 --max-rss-mb 64
+
+``--naive`` also times loading every ticket into a list first, for
+comparison.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from . import common
+
+
+def export(fmt):
+    from django.core.management import call_command
+
+    call_command("export_tickets", format=fmt, output=os.devnull)
+
+
+def naive():
+    from tickets.models import Ticket
+
+    return len(list(Ticket.objects.select_related("author")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--max-rss-mb", type=float, default=64)
+    parser.add_argument("--naive", action="store_true")
+    args = parser.parse_args()
+
+    common.setup()
+    common.seed(tickets=args.tickets)
+
+    runs = {"csv": lambda: export("csv"), "ndjson": lambda: export("ndjson")}
+    if args.naive:
+        runs["naive list"] = naive
+
+    failed = False
+    print(f"{args.tickets} tickets, ceiling {args.max_rss_mb:.0f} MiB\n")
+    print(f"{'run':<12}{'seconds':>9}{'rows/s':>12}{'RSS growth MiB':>16}")
+    for name, run in runs.items():
+        with common.PeakRSS() as peak:
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+        print(f"{name:<12}{elapsed:>9.2f}{args.tickets / elapsed:>12.0f}"
+              f"{peak.growth_mb:>16.1f}")
+        if name != "naive list" and peak.growth_mb > args.max_rss_mb:
+            failed = True
+    if failed:
+        print("\nFAIL: an export went over the RSS ceiling.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
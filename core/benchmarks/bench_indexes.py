@@ -0,0 +1,88 @@
+"""
+Compare the ticket listing queries with and without the indexes declared
+in ``Ticket.Meta.indexes``.
+
+The tickets table is seeded once without the indexes, each query is
+EXPLAINed and timed, then the indexes are created and the same queries are
+measured again::
+
+    python -m benchmarks.bench_indexes --tickets 1000000
+"""
+
+import argparse
+
+from . import common
+
+
+LISTING = ["is_completed", "-date", "-id"]
+
+
+def listing_queries(authors):
+    from tickets.models import Ticket
+    from tickets.pagination import KeysetPaginator
+
+    base = Ticket.objects.select_related("author")
+    paginator = KeysetPaginator(base, 50, LISTING)
+    middle = base.order_by(*LISTING)[base.count() // 2]
+    cursor = paginator.encode_cursor(middle)
+    owner = authors[0]
+    return {
+        "first page": base.order_by(*LISTING)[:51],
+        "deep page": next(paginator.page_querysets(after=cursor))[:51],
+        "owner page": base.filter(author=owner).order_by(*LISTING)[:51],
+        "open tickets": base.filter(
+            is_completed=False).order_by("-date", "-id")[:51],
+    }
+
+
+def set_indexes(connection, enabled):
+    from tickets.models import Ticket
+
+    with connection.schema_editor() as editor:
+        for index in Ticket._meta.indexes:
+            if enabled:
+                editor.add_index(Ticket, index)
+            else:
+                editor.remove_index(Ticket, index)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def measure(queries, repeat):
+    return {
+        name: {
+            "plan": queryset.explain(),
+            **common.timed(lambda: list(queryset.all()), repeat),
+        }
+        for name, queryset in queries.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    connection = common.setup()
+    set_indexes(connection, enabled=False)
+    authors = common.seed(users=args.users, tickets=args.tickets)
+    queries = listing_queries(authors)
+    before = measure(queries, args.repeat)
+    set_indexes(connection, enabled=True)
+    after = measure(queries, args.repeat)
+
+    print(f"{args.tickets} tickets, {args.users} authors, "
+          f"{connection.vendor}, median of {args.repeat} runs\n")
+    print(f"{'query':<14}{'before ms':>12}{'after ms':>12}{'speedup':>10}")
+    for name in queries:
+        was, now = before[name]["median_ms"], after[name]["median_ms"]
+        print(f"{name:<14}{was:>12.2f}{now:>12.2f}{was / now:>9.1f}x")
+    for name in queries:
+        print(f"\n== {name}\n-- before\n{before[name]['plan']}"
+              f"\n-- after\n{after[name]['plan']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Compare ticket search through the full-text index with the ``icontains``
+(LIKE '%word%') scan it replaces.
+
+Each query fetches the first page of 50 results the way the list view
+does: best match first through ``search_tickets`` (which ranks at most
+``MAX_RANKED`` matches), newest first for LIKE::
+
+    python -m benchmarks.bench_search --tickets 1000000
+"""
+
+import argparse
+
+from . import common
+
+
+QUERIES = {
+    "common word": "printer",
+    "rare word": "error",
+    "two words": "vpn backup",
+    "no match": "zebra",
+}
+
+
+def like_queryset(text):
+    from django.db.models import Q
+
+    from tickets.models import Ticket
+
+    condition = Q()
+    for word in text.split():
+        condition &= Q(title__icontains=word) | Q(body__icontains=word)
+    return Ticket.objects.select_related("author").filter(
+        condition).order_by("-date", "-id")
+
+
+def search_queryset(text):
+    from tickets.models import Ticket
+    from tickets.search import ORDERING, search_tickets
+
+    return search_tickets(
+        Ticket.objects.select_related("author"), text).order_by(*ORDERING)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tickets", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    connection = common.setup()
+    common.seed(users=args.users, tickets=args.tickets)
+
+    print(f"{args.tickets} tickets, {args.users} authors, "
+          f"{connection.vendor}, median of {args.repeat} runs\n")
+    print(f"{'query':<14}{'matches':>10}{'ranked':>8}{'like ms':>12}"
+          f"{'fts ms':>12}{'speedup':>10}")
+    for name, text in QUERIES.items():
+        like = like_queryset(text)
+        fts = search_queryset(text)
+        matches, ranked = like.count(), fts.count()
+        was = common.timed(lambda: list(like[:51]), args.repeat)
+        now = common.timed(lambda: list(fts[:51]), args.repeat)
+        was, now = was["median_ms"], now["median_ms"]
+        print(f"{name:<14}{matches:>10}{ranked:>8}{was:>12.2f}"
+              f"{now:>12.2f}{was / now:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
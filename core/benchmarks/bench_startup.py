@@ -0,0 +1,94 @@
+"""
+Measure how much memory forked workers share with a preloaded master.
+
+Loads the WSGI application and runs ``core.warmup.warm_up()`` the way
+``gunicorn.conf.py`` does, then forks ``--workers`` children, with and
+without ``gc.freeze()`` before the fork. Each child serves a few
+anonymous pages, runs a full garbage collection (as any worker soon
+does) and reports its private memory, i.e. the pages it no longer shares
+with the master::
+
+    python -m benchmarks.bench_startup --workers 4
+
+Linux only (it reads ``/proc/self/smaps_rollup``). No database is used.
+"""
+
+import argparse
+import gc
+import io
+import os
+import statistics
+import sys
+
+PATHS = ("/accounts/login/", "/accounts/signup/", "/tickets/")
+
+
+def private_kib():
+    with open("/proc/self/smaps_rollup") as smaps:
+        return sum(
+            int(line.split()[1]) for line in smaps
+            if line.startswith(("Private_Clean:", "Private_Dirty:")))
+
+
+def serve(application, path):
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": "",
+        "SERVER_NAME": "localhost", "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1", "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+    }
+    response = application(environ, lambda status, headers: None)
+    b"".join(response)
+    response.close()
+
+
+def fork_workers(application, count):
+    """Private KiB of each of ``count`` forked workers."""
+    sizes = []
+    for _ in range(count):
+        read, write = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read)
+            for path in PATHS:
+                serve(application, path)
+            gc.collect()
+            os.write(write, str(private_kib()).encode())
+            os._exit(0)
+        os.close(write)
+        with os.fdopen(read) as pipe:
+            sizes.append(int(pipe.read()))
+        os.waitpid(pid, 0)
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    gc.disable()
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    from django.conf import settings
+    from django.utils.module_loading import import_string
+
+    application = import_string(settings.WSGI_APPLICATION)
+    from core.warmup import warm_up
+    warm_up()
+
+    print(f"Private memory per worker after serving {len(PATHS)} pages and "
+          f"a full collection,\nmedian of {args.workers} workers\n")
+    for label, freeze in (("gc.freeze() off", False),
+                          ("gc.freeze() on", True)):
+        if freeze:
+            gc.freeze()
+        gc.enable()
+        sizes = fork_workers(application, args.workers)
+        gc.disable()
+        if freeze:
+            gc.unfreeze()
+        print(f"{label:<18}{statistics.median(sizes) / 1024:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
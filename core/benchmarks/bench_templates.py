@@ -0,0 +1,84 @@
+"""
+Time rendering the ticket list with many cards, and profile it.
+
+Seeds ``--cards`` tickets and times, with the card cache emptied before
+every request so each card is rendered:
+
+- ``cards``: ``render_ticket_cards`` alone, for every ticket.
+- ``list page``: the whole ticket list showing every ticket on one page.
+- ``warm list page``: the same page with every card already cached.
+
+``--profile`` then renders the cold list page once under
+``core.profiling.TemplateProfiler`` and prints where the time went::
+
+    python -m benchmarks.bench_templates --cards 1000 --profile
+"""
+
+import argparse
+from unittest import mock
+
+from . import common
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--cards", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--profile", action="store_true")
+    args = parser.parse_args()
+
+    common.setup()
+    from django.core.cache import caches
+    from django.test import Client
+    from django.urls import reverse
+
+    from core.profiling import TemplateProfiler
+    from tickets import cards
+    from tickets.models import Ticket
+    from tickets.views import TicketListView
+
+    authors = common.seed(users=20, tickets=args.cards, completed_ratio=0.5)
+    viewer = authors[0]
+    client = Client()
+    client.force_login(viewer)
+    url = reverse("ticket_list")
+    tickets = list(TicketListView.model._default_manager.select_related(
+        "author").order_by(*TicketListView.ordering))
+    assert len(tickets) == Ticket.objects.count()
+    cache = caches[cards.CACHE_ALIAS]
+
+    def cold(func):
+        def run():
+            cache.clear()
+            return func()
+        return run
+
+    def get_page():
+        response = client.get(url)
+        assert len(response.context["ticket_cards"]) == args.cards
+        return response
+
+    runs = {
+        "cards": cold(lambda: cards.render_ticket_cards(tickets, viewer)),
+        "list page": cold(get_page),
+        "warm list page": get_page,
+    }
+    print(f"{args.cards} cards, median of {args.repeat} runs\n")
+    print(f"{'run':<18}{'median ms':>11}{'us/card':>9}")
+    with mock.patch.object(TicketListView, "paginate_by", args.cards):
+        for name, run in runs.items():
+            run()
+            median = common.timed(run, args.repeat)["median_ms"]
+            print(f"{name:<18}{median:>11.1f}"
+                  f"{median * 1000 / args.cards:>9.1f}")
+
+        if args.profile:
+            cache.clear()
+            with TemplateProfiler() as profiler:
+                get_page()
+            print()
+            print(profiler.report())
+
+
+if __name__ == "__main__":
+    main()
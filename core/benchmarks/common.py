@@ -0,0 +1,132 @@
+"""
+Shared helpers for the benchmark scripts in this package.
+
+Benchmarks run against a throwaway test database created from the current
+settings, so they never touch development or production data. Run them
+from the ``core`` directory, e.g. ``python -m benchmarks.bench_indexes``.
+"""
+
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def setup(verbosity=0, on_disk=False):
+    """
+    Configure Django and create a fresh, migrated benchmark database.
+
+    SQLite test databases live in memory and ignore close(); pass
+    ``on_disk=True`` for a temporary file instead when connection handling
+    is being measured.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    from django.conf import settings
+
+    # Like the tests, render {% static %} without collectstatic's manifest.
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND":
+                "django.contrib.staticfiles.storage.StaticFilesStorage",
+        },
+    }
+    django.setup()
+
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    setup_test_environment()
+    if on_disk and connection.vendor == "sqlite":
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(
+            tempfile.mkdtemp(), "benchmark.sqlite3")
+    connection.creation.create_test_db(
+        verbosity=verbosity, autoclobber=True, keepdb=False)
+    return connection
+
+
+@contextmanager
+def explicit_dates(model):
+    """Let seeded rows keep the dates they were given instead of having
+    ``auto_now``/``auto_now_add`` fields overwrite them with the time of
+    insertion."""
+    fields = [
+        field for field in model._meta.concrete_fields
+        if getattr(field, "auto_now", False)
+        or getattr(field, "auto_now_add", False)
+    ]
+    saved = [(field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, (auto_now, auto_now_add) in zip(fields, saved):
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def seed(users=100, tickets=10_000, completed_ratio=0.8, batch_size=10_000,
+         password=None):
+    """Bulk insert ``users`` authors and ``tickets`` tickets spread over a
+    year, and return the list of authors."""
+    from . import factories
+
+    authors = factories.create_users(users, password, batch_size)
+    factories.create_tickets(
+        tickets, authors, random.Random(1234), completed_ratio, batch_size)
+    return authors
+
+
+def timed(func, repeat=20):
+    """Call ``func`` ``repeat`` times and return latency stats in ms."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[max(0, int(len(samples) * 0.95) - 1)],
+        "max_ms": samples[-1],
+    }
+
+
+def rss_mb():
+    """Current resident set size of this process in MiB (Linux only)."""
+    with open("/proc/self/statm") as statm:
+        pages = int(statm.read().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class PeakRSS:
+    """
+    Context manager that samples RSS in a background thread and records
+    how far it rose above the level on entry, in MiB, as ``growth_mb``.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.growth_mb = 0.0
+
+    def __enter__(self):
+        self.baseline = self.peak = rss_mb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_mb())
+        self.growth_mb = self.peak - self.baseline
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_mb())
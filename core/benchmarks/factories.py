@@ -0,0 +1,84 @@
+"""
+Factories for benchmark data.
+
+Each ``build_*`` function returns an unsaved instance and each
+``create_*`` function bulk inserts a batch of them, so seeding a large
+table costs a handful of INSERTs rather than one per row. Every factory
+takes a ``random.Random`` so the same arguments always produce the same
+rows.
+"""
+
+from datetime import timedelta
+
+# Ticket bodies are drawn from this vocabulary with a skewed distribution,
+# so some words are in most tickets and others in very few.
+WORDS = (
+    "printer network laptop password email login screen keyboard mouse "
+    "monitor vpn wifi server backup disk update install license account "
+    "phone headset camera invoice report spreadsheet calendar meeting "
+    "badge door desk chair projector toner scanner cable router firewall "
+    "certificate timeout crash slow error"
+).split()
+WORD_WEIGHTS = [1 / rank for rank in range(1, len(WORDS) + 1)]
+
+PASSWORD = "bench-pass-123"
+
+
+def build_user(n, password_hash=""):
+    from django.contrib.auth import get_user_model
+
+    return get_user_model()(
+        username=f"bench{n}",
+        first_name="Bench",
+        last_name=str(n),
+        password=password_hash,
+    )
+
+
+def create_users(count, password=None, batch_size=10_000):
+    """
+    Bulk insert ``count`` users. With a ``password`` they can log in with
+    it; it is hashed once and the hash shared, which keeps seeding fast.
+    """
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+
+    password_hash = make_password(password) if password else ""
+    return get_user_model().objects.bulk_create(
+        (build_user(n, password_hash) for n in range(count)),
+        batch_size=batch_size,
+    )
+
+
+def build_ticket(n, rng, authors, now, completed_ratio=0.8):
+    from tickets.models import Ticket
+
+    date = now - timedelta(seconds=rng.randrange(365 * 86400))
+    words = rng.choices(WORDS, weights=WORD_WEIGHTS, k=8)
+    return Ticket(
+        title=f"Ticket {n}",
+        body=" ".join(words),
+        date=date,
+        modified=date,
+        author=rng.choice(authors),
+        is_completed=rng.random() < completed_ratio,
+    )
+
+
+def create_tickets(count, authors, rng, completed_ratio=0.8,
+                   batch_size=10_000):
+    """Bulk insert ``count`` tickets by ``authors``, dated over the past
+    year."""
+    from django.utils import timezone
+
+    from tickets.models import Ticket
+
+    from .common import explicit_dates
+
+    now = timezone.now()
+    with explicit_dates(Ticket):
+        for start in range(0, count, batch_size):
+            Ticket.objects.bulk_create([
+                build_ticket(n, rng, authors, now, completed_ratio)
+                for n in range(start, min(start + batch_size, count))
+            ])
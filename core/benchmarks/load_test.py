@@ -0,0 +1,155 @@
+"""
+Load test one or more running servers and compare requests/sec and
+latency percentiles at a given concurrency.
+
+Unlike the other benchmarks this drives real servers over HTTP, so start
+them first against the same database, e.g. the sync and async profiles
+from the README::
+
+    gunicorn core.wsgi:application --chdir core -w 4 -b :8001
+    gunicorn core.asgi:application --chdir core -w 4 -b :8002 \\
+        -k uvicorn_worker.UvicornWorker
+
+    python -m benchmarks.load_test --username alice --password ... \\
+        sync=http://127.0.0.1:8001 async=http://127.0.0.1:8002
+
+Each target gets its own logged-in session. ``--concurrency`` client
+threads then request ``--path`` (repeatable) in turn over keep-alive
+connections for ``--duration`` seconds.
+"""
+
+import argparse
+import http.client
+import re
+import statistics
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class Session:
+    """A minimal cookie-keeping HTTP/1.1 client for one server."""
+
+    def __init__(self, base_url, cookies=None):
+        url = urlsplit(base_url)
+        self.base_url = base_url.rstrip("/")
+        self.connection = http.client.HTTPConnection(
+            url.hostname, url.port or 80, timeout=30)
+        self.cookies = dict(cookies or {})
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.cookies:
+            headers["Cookie"] = "; ".join(
+                f"{name}={value}" for name, value in self.cookies.items())
+        try:
+            self.connection.request(method, path, body, headers)
+            response = self.connection.getresponse()
+        except (http.client.HTTPException, OSError):
+            # The server closed an idle keep-alive connection; retry once.
+            self.connection.close()
+            self.connection.request(method, path, body, headers)
+            response = self.connection.getresponse()
+        content = response.read()
+        for header in response.headers.get_all("Set-Cookie") or ():
+            name, _, value = header.split(";", 1)[0].partition("=")
+            self.cookies[name.strip()] = value.strip()
+        return response.status, content
+
+    def login(self, username, password, path="/accounts/login/"):
+        _, page = self.request("GET", path)
+        token = CSRF_INPUT.search(page.decode()).group(1)
+        status, _ = self.request(
+            "POST",
+            path,
+            urlencode({
+                "csrfmiddlewaretoken": token,
+                "username": username,
+                "password": password,
+            }),
+            {
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Referer": self.base_url + path,
+            },
+        )
+        if status != 302:
+            raise SystemExit(f"Login to {self.base_url} failed ({status}).")
+
+
+def run(base_url, cookies, paths, concurrency, duration):
+    samples, errors = [], []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(offset):
+        session = Session(base_url, cookies)
+        mine, failed = [], 0
+        n = offset
+        while time.perf_counter() < deadline:
+            path = paths[n % len(paths)]
+            n += 1
+            started = time.perf_counter()
+            try:
+                status, _ = session.request("GET", path)
+            except (http.client.HTTPException, OSError):
+                status = None
+            mine.append((time.perf_counter() - started) * 1000)
+            failed += status != 200
+        with lock:
+            samples.extend(mine)
+            errors.append(failed)
+
+    threads = [
+        threading.Thread(target=worker, args=(i,)) for i in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    samples.sort()
+    return {
+        "requests": len(samples),
+        "errors": sum(errors),
+        "rps": len(samples) / elapsed,
+        "p50_ms": statistics.median(samples) if samples else 0.0,
+        "p99_ms": samples[int(len(samples) * 0.99)] if samples else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "targets", nargs="+", metavar="LABEL=URL",
+        help="server to test, e.g. async=http://127.0.0.1:8002")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument(
+        "--path", action="append", dest="paths",
+        help="path to request (repeatable, default /tickets/)")
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+    paths = args.paths or ["/tickets/"]
+
+    print(f"{args.concurrency} clients, {args.duration:g}s per target, "
+          f"paths: {' '.join(paths)}\n")
+    print(f"{'target':<10}{'requests':>10}{'errors':>8}{'req/s':>10}"
+          f"{'p50 ms':>10}{'p99 ms':>10}")
+    for target in args.targets:
+        label, _, url = target.partition("=")
+        session = Session(url)
+        session.login(args.username, args.password)
+        result = run(
+            url, session.cookies, paths, args.concurrency, args.duration)
+        print(f"{label:<10}{result['requests']:>10}{result['errors']:>8}"
+              f"{result['rps']:>10.1f}{result['p50_ms']:>10.1f}"
+              f"{result['p99_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
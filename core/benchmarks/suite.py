@@ -0,0 +1,421 @@
+"""
+Benchmark the app's hot paths end to end and compare runs against a
+baseline.
+
+A fresh database is seeded with ``--users`` users and ``--tickets``
+tickets, then each scenario sends its request through the test client, so
+it goes through the real URL routes, middleware, views and templates.
+For every scenario the suite reports latency percentiles, the number of
+queries per request and the peak Python memory allocated while handling
+one request. Admission control is turned off while they run, since its
+per-user buckets would turn away a scenario's repeated writes::
+
+    python -m benchmarks.suite --output baseline.json
+    # ...make a change...
+    python -m benchmarks.suite --compare baseline.json
+
+With ``--compare``, a scenario is flagged as a regression when its median
+latency or peak memory grew by more than ``--threshold`` (default 10%) or
+when it runs more queries than before, and the command exits with status
+1. Only compare runs made with the same arguments on the same machine.
+``--scenario`` (repeatable) limits the run to some scenarios and
+``--list`` prints their names.
+"""
+
+import argparse
+import itertools
+import json
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from . import common, factories
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    """Register a scenario. It is called once with the ``Bench`` and
+    returns a function that sends one request."""
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+class Bench:
+    """The seeded data and logged-in client shared by the scenarios."""
+
+    def __init__(self, user, repeat):
+        from django.test import Client
+
+        from tickets.models import Ticket
+
+        self.user = user
+        self.repeat = repeat
+        self.client = Client()
+        self.client.force_login(user)
+        self.ticket_ids = list(
+            Ticket.objects.filter(author=user).order_by("pk").values_list(
+                "pk", flat=True)[:500])
+
+    def create_tickets(self, count):
+        """Extra tickets for scenarios that use one up per request."""
+        from tickets.models import Ticket
+
+        return [ticket.pk for ticket in Ticket.objects.bulk_create(
+            Ticket(title=f"Spare {n}", body="spare", author=self.user)
+            for n in range(count))]
+
+
+def send(client, method, path, data=None, status=200):
+    response = getattr(client, method)(path, data)
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    if response.status_code != status:
+        raise SystemExit(
+            f"{method.upper()} {path} returned {response.status_code}, "
+            f"expected {status}.")
+    return response
+
+
+@scenario("home")
+def home(bench):
+    return lambda: send(bench.client, "get", "/")
+
+
+@scenario("ticket_list")
+def ticket_list(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_list")
+    return lambda: send(bench.client, "get", url)
+
+
+@scenario("ticket_list_page_2")
+def ticket_list_page_2(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_list")
+    cursor = send(bench.client, "get", url).context["page_obj"].next_cursor
+    return lambda: send(bench.client, "get", url, {"after": cursor})
+
+
+@scenario("ticket_search")
+def ticket_search(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_list")
+    return lambda: send(bench.client, "get", url, {"q": "vpn timeout"})
+
+
+@scenario("ticket_add_form")
+def ticket_add_form(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_add")
+    return lambda: send(bench.client, "get", url)
+
+
+@scenario("ticket_add")
+def ticket_add(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_add")
+    data = {"title": "Benchmark ticket", "body": "printer offline"}
+    return lambda: send(bench.client, "post", url, data, status=302)
+
+
+@scenario("ticket_edit_form")
+def ticket_edit_form(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_edit", args=[bench.ticket_ids[0]])
+    return lambda: send(bench.client, "get", url)
+
+
+@scenario("ticket_edit")
+def ticket_edit(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_edit", args=[bench.ticket_ids[0]])
+    data = {"title": "Edited ticket", "body": "vpn down"}
+    return lambda: send(bench.client, "post", url, data, status=302)
+
+
+@scenario("ticket_complete")
+def ticket_complete(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_complete", args=[bench.ticket_ids[0]])
+    return lambda: send(bench.client, "post", url, status=302)
+
+
+@scenario("ticket_delete")
+def ticket_delete(bench):
+    from django.urls import reverse
+
+    ids = iter(bench.create_tickets(bench.repeat + 10))
+    return lambda: send(
+        bench.client, "post", reverse("ticket_delete", args=[next(ids)]),
+        status=302)
+
+
+@scenario("ticket_bulk_complete")
+def ticket_bulk_complete(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_bulk")
+    data = {"action": "complete", "ids": bench.ticket_ids[:100]}
+    return lambda: send(bench.client, "post", url, data)
+
+
+@scenario("ticket_export")
+def ticket_export(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_export")
+    data = {"format": "csv", "status": "open"}
+    return lambda: send(bench.client, "get", url, data)
+
+
+@scenario("ticket_api")
+def ticket_api(bench):
+    from django.urls import reverse
+
+    url = reverse("ticket_api")
+    return lambda: send(bench.client, "get", url)
+
+
+@scenario("ticket_dashboard")
+def ticket_dashboard(bench):
+    from django.test import Client
+    from django.urls import reverse
+
+    from accounts.models import CustomUser
+
+    client = Client()
+    client.force_login(CustomUser.objects.create_superuser(
+        username="bench-admin", password=factories.PASSWORD))
+    url = reverse("ticket_dashboard")
+    return lambda: send(client, "get", url)
+
+
+@scenario("login_form")
+def login_form(bench):
+    from django.test import Client
+    from django.urls import reverse
+
+    url = reverse("login")
+    client = Client()
+    return lambda: send(client, "get", url)
+
+
+@scenario("login")
+def login(bench):
+    from django.test import Client
+    from django.urls import reverse
+
+    url = reverse("login")
+    data = {"username": bench.user.username, "password": factories.PASSWORD}
+    return lambda: send(Client(), "post", url, data, status=302)
+
+
+@scenario("signup_form")
+def signup_form(bench):
+    from django.test import Client
+    from django.urls import reverse
+
+    url = reverse("signup")
+    client = Client()
+    return lambda: send(client, "get", url)
+
+
+@scenario("signup")
+def signup(bench):
+    from django.test import Client
+    from django.urls import reverse
+
+    url = reverse("signup")
+    client = Client()
+    numbers = itertools.count()
+
+    def request():
+        return send(client, "post", url, {
+            "username": f"signup{next(numbers)}",
+            "email": "signup@example.com",
+            "password1": "Unguessable-Pass-42",
+            "password2": "Unguessable-Pass-42",
+        }, status=302)
+
+    return request
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of sorted ``samples``."""
+    return samples[max(0, math.ceil(len(samples) * fraction) - 1)]
+
+
+def measure(request, repeat, warmup):
+    from django.db import connection
+
+    from core.metrics import QueryTimer
+
+    for _ in range(warmup):
+        request()
+    queries = QueryTimer()
+    with connection.execute_wrapper(queries):
+        request()
+    tracemalloc.start()
+    try:
+        request()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        request()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        "requests": repeat,
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(percentile(samples, 0.50), 3),
+        "p90_ms": round(percentile(samples, 0.90), 3),
+        "p99_ms": round(percentile(samples, 0.99), 3),
+        "queries": queries.count,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run(bench, names, repeat, warmup):
+    """Measure each of the ``names`` scenarios with ADMISSION_CONTROL
+    off."""
+    from django.test import override_settings
+
+    with override_settings(ADMISSION_CONTROL={}):
+        return {
+            name: measure(SCENARIOS[name](bench), repeat, warmup)
+            for name in names
+        }
+
+
+def compare(results, baseline, threshold):
+    """Return ``{scenario: [problem, ...]}`` for every regression."""
+    regressions = {}
+    for name, current in results["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            continue
+        problems = []
+        if current["p50_ms"] > before["p50_ms"] * (1 + threshold):
+            problems.append("latency")
+        if current["queries"] > before["queries"]:
+            problems.append("queries")
+        if current["peak_kib"] > before["peak_kib"] * (1 + threshold):
+            problems.append("memory")
+        if problems:
+            regressions[name] = problems
+    return regressions
+
+
+def change(current, before):
+    if not before:
+        return ""
+    return f"{(current - before) / before:+.0%}"
+
+
+def report(results, baseline=None, regressions=None):
+    header = (f"{'scenario':<22}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}"
+              f"{'queries':>9}{'peak KiB':>10}")
+    if baseline:
+        header += f"{'p50':>7}{'peak':>7}  regression"
+    print(header)
+    for name, result in results["scenarios"].items():
+        line = (f"{name:<22}{result['p50_ms']:>9.2f}"
+                f"{result['p90_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                f"{result['queries']:>9}{result['peak_kib']:>10.1f}")
+        before = baseline and baseline["scenarios"].get(name)
+        if before:
+            line += (f"{change(result['p50_ms'], before['p50_ms']):>7}"
+                     f"{change(result['peak_kib'], before['peak_kib']):>7}")
+            if name in regressions:
+                line += "  " + ", ".join(regressions[name])
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tickets", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument(
+        "--scenario", action="append", dest="scenarios",
+        choices=sorted(SCENARIOS), metavar="NAME",
+        help="scenario to run (repeatable, default all)")
+    parser.add_argument("--list", action="store_true",
+                        help="list the scenarios and exit")
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--compare", metavar="BASELINE",
+                        help="flag regressions against these results")
+    parser.add_argument("--threshold", type=float, default=0.10)
+    args = parser.parse_args()
+    if args.list:
+        print("\n".join(SCENARIOS))
+        return
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    connection = common.setup()
+    import django
+
+    authors = common.seed(
+        users=args.users, tickets=args.tickets, password=factories.PASSWORD)
+    bench = Bench(authors[0], args.repeat)
+    results = {
+        "meta": {
+            "users": args.users,
+            "tickets": args.tickets,
+            "repeat": args.repeat,
+            "vendor": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "machine": platform.node(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+    }
+    print(f"{args.users} users, {args.tickets} tickets, {connection.vendor}, "
+          f"{args.repeat} requests per scenario\n")
+    results["scenarios"] = run(
+        bench, args.scenarios or list(SCENARIOS), args.repeat, args.warmup)
+
+    regressions = {}
+    if baseline:
+        keys = ("users", "tickets", "vendor")
+        if any(baseline["meta"].get(key) != results["meta"][key]
+               for key in keys):
+            print("Warning: the baseline was run with different data.\n")
+        regressions = compare(results, baseline, args.threshold)
+    report(results, baseline, regressions)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+    if regressions:
+        print(f"\n{len(regressions)} scenario(s) regressed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,210 @@
+"""
+Admission control for the write endpoints.
+
+``AdmissionControlMiddleware`` turns away writes (any method but GET,
+HEAD and OPTIONS) to the URL names in ``ADMISSION_CONTROL`` straight away,
+instead of letting them queue for a worker while reads wait behind them.
+Each URL name can have:
+
+- ``user``: a token bucket per user (per client address for anonymous
+  requests, see ``client_address()``) as ``(requests per second,
+  burst)``. Running out gets a 429.
+- ``global``: one token bucket shared by every client. Running out gets
+  a 503.
+- ``concurrency``: how many of its requests a worker handles at once.
+  Going over gets a 503. Only threaded and ASGI workers can go over; a
+  sync worker never has more than one request in flight.
+
+Rejections carry a ``Retry-After`` header and every decision is counted in
+``admission_requests_total`` on ``/metrics``. The buckets are kept in the
+``ADMISSION_CACHE`` cache, local memory by default, and the concurrency
+slots in the process, so both limits apply per worker.
+"""
+
+import math
+import threading
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+from core import metrics
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+decisions = metrics.registry.register(metrics.Counter(
+    "admission_requests_total",
+    "Writes seen by admission control, by URL name and decision.",
+    ["view", "decision"],
+))
+
+
+class TokenBucket:
+    """
+    Refill ``rate`` tokens a second, up to ``burst``; each request takes
+    one. The state of each key is a ``(tokens, timestamp)`` pair in the
+    cache, which expires once the bucket would be full again anyway.
+    """
+
+    _lock = threading.Lock()
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.timeout = math.ceil(burst / rate) + 1
+
+    def take(self, cache, key, now):
+        """Take a token and return 0, or return how many seconds until
+        there will be one."""
+        with self._lock:
+            tokens, stamp = cache.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - stamp) * self.rate)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            if not wait:
+                tokens -= 1
+            cache.set(key, (tokens, now), self.timeout)
+        return wait
+
+
+class ConcurrencyLimiter:
+    """Count the requests in flight per URL name in this process."""
+
+    def __init__(self):
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, name, limit):
+        with self._lock:
+            if self._in_flight.get(name, 0) >= limit:
+                return False
+            self._in_flight[name] = self._in_flight.get(name, 0) + 1
+            return True
+
+    def release(self, name):
+        with self._lock:
+            self._in_flight[name] -= 1
+
+    def in_flight(self, name):
+        return self._in_flight.get(name, 0)
+
+
+limiter = ConcurrencyLimiter()
+
+
+def _rejected(status, reason, retry_after):
+    response = HttpResponse(
+        reason, status=status, content_type="text/plain; charset=utf-8")
+    response["Retry-After"] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def client_address(request):
+    """
+    The address of the client, taken from X-Forwarded-For when there are
+    ``ADMISSION_PROXY_COUNT`` proxies in front of the server. Each proxy
+    appends the address it was connected from, so only the entry added
+    by the outermost trusted one can be relied on; anything before it
+    comes from the client.
+    """
+    proxies = settings.ADMISSION_PROXY_COUNT
+    if proxies:
+        forwarded = [
+            address.strip() for address in
+            request.META.get("HTTP_X_FORWARDED_FOR", "").split(",")
+            if address.strip()
+        ]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _client_key(request, user):
+    if user is not None and user.is_authenticated:
+        return f"user:{user.pk}"
+    return f"addr:{client_address(request)}"
+
+
+def _limits(request):
+    if request.method in SAFE_METHODS:
+        return None
+    return settings.ADMISSION_CONTROL.get(request.resolver_match.view_name)
+
+
+class AdmissionControlMiddleware:
+    """
+    Apply ``ADMISSION_CONTROL`` to writes. Goes after the authentication
+    middleware, so per-user buckets can tell users apart. Runs natively
+    under both WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django runs a sync hook through sync_to_async() in async mode.
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self.release(request)
+
+    async def __acall__(self, request):
+        try:
+            return await self.get_response(request)
+        finally:
+            self.release(request)
+
+    def release(self, request):
+        name = getattr(request, "_admission_slot", None)
+        if name is not None:
+            limiter.release(name)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        limits = _limits(request)
+        if not limits:
+            return None
+        user = getattr(request, "user", None)
+        return self.admit(request, limits, _client_key(request, user))
+
+    async def aprocess_view(self, request, view_func, view_args,
+                            view_kwargs):
+        limits = _limits(request)
+        if not limits:
+            return None
+        user = await request.auser() if hasattr(request, "auser") else None
+        return self.admit(request, limits, _client_key(request, user))
+
+    def admit(self, request, limits, client):
+        """Take what ``limits`` asks for and return None, or return the
+        response turning the request away."""
+        name = request.resolver_match.view_name
+        cache = caches[settings.ADMISSION_CACHE]
+        now = time.time()
+        if "user" in limits:
+            wait = TokenBucket(*limits["user"]).take(
+                cache, f"admission:{name}:{client}", now)
+            if wait:
+                decisions.inc((name, "rejected_user"))
+                return _rejected(429, "Too many requests.", wait)
+        if "global" in limits:
+            wait = TokenBucket(*limits["global"]).take(
+                cache, f"admission:{name}", now)
+            if wait:
+                decisions.inc((name, "rejected_global"))
+                return _rejected(503, "Server busy, try again.", wait)
+        if "concurrency" in limits:
+            if not limiter.acquire(name, limits["concurrency"]):
+                decisions.inc((name, "rejected_concurrency"))
+                return _rejected(503, "Server busy, try again.", 1)
+            request._admission_slot = name
+        decisions.inc((name, "admitted"))
+        return None
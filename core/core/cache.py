@@ -0,0 +1,38 @@
+import os
+
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+class LRUFileBasedCache(FileBasedCache):
+    """
+    File-based cache that culls the least recently used entries instead of
+    a random sample. Reads bump a file's mtime, so it doubles as the last
+    access time.
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, default, version)
+        if value is not default:
+            try:
+                os.utime(self._key_to_file(key, version))
+            except FileNotFoundError:
+                pass
+        return value
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+
+        def last_used(fname):
+            try:
+                return os.stat(fname).st_mtime_ns
+            except FileNotFoundError:
+                return 0
+
+        filelist.sort(key=last_used)
+        for fname in filelist[:num_entries // self._cull_frequency]:
+            self._delete(fname)
@@ -0,0 +1,21 @@
+from functools import cache
+
+from django.urls import get_script_prefix, get_urlconf, reverse
+
+NAV_URL_NAMES = (
+    "ticket_list", "ticket_add", "ticket_archive", "ticket_dashboard",
+    "login", "logout", "signup",
+)
+
+
+@cache
+def _nav_urls(urlconf, prefix):
+    return {name: reverse(name, urlconf=urlconf) for name in NAV_URL_NAMES}
+
+
+def nav_urls(request):
+    """
+    The navbar links as ``nav_urls.<url name>``, reversed once per URLconf
+    and script prefix rather than on every page.
+    """
+    return {"nav_urls": _nav_urls(get_urlconf(), get_script_prefix())}
@@ -0,0 +1,288 @@
+"""
+In-process request metrics, exposed in the Prometheus text format.
+
+``MetricsMiddleware`` records, per URL name, the wall time of each
+request, how many SQL queries it ran and how long they took, and how long
+its template took to render. ``metrics_view`` serves them at ``/metrics``.
+Each process keeps its own numbers, so scrape every worker.
+"""
+
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse, HttpResponseForbidden
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+
+def _escape(value):
+    return (
+        str(value).replace("\\", "\\\\").replace("\n", "\\n")
+        .replace('"', '\\"'))
+
+
+def _format_labels(names, values, extra=""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(
+        names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+
+class Histogram:
+    """Cumulative buckets plus sum and count, per combination of labels."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        # Index of the first bucket the value fits in; len(buckets) is +Inf.
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [
+                    [0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            series = sorted(
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._series.items())
+        bounds = [_format_number(bound) for bound in self.buckets] + ["+Inf"]
+        for labels, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket",
+                    _format_labels(self.labelnames, labels, f'le="{bound}"'),
+                    cumulative,
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum", label_text, total
+            yield f"{self.name}_count", label_text, cumulative
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def expose(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(
+                f"{name}{labels} {_format_number(value)}"
+                for name, labels, value in metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+requests_total = registry.register(Counter(
+    "http_requests_total",
+    "Requests served, by URL name, method and status code.",
+    ["view", "method", "status"],
+))
+request_seconds = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "Wall time spent handling a request.",
+    ["view", "method"],
+    SECONDS_BUCKETS,
+))
+db_queries = registry.register(Histogram(
+    "http_request_db_queries",
+    "SQL queries run while handling a request.",
+    ["view"],
+    QUERY_BUCKETS,
+))
+db_seconds = registry.register(Histogram(
+    "http_request_db_duration_seconds",
+    "Time spent in SQL queries while handling a request.",
+    ["view"],
+    SECONDS_BUCKETS,
+))
+template_seconds = registry.register(Histogram(
+    "http_request_template_duration_seconds",
+    "Time spent rendering a response's template.",
+    ["view"],
+    SECONDS_BUCKETS,
+))
+
+
+class QueryTimer:
+    """``execute_wrapper`` that counts and times every query it sees."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+
+
+# The QueryTimer of the request being handled. sync_to_async() copies the
+# context into the thread it runs in, so under ASGI the ORM calls of a
+# request still find their timer.
+_query_timer = ContextVar("query_timer", default=None)
+
+
+def _time_query(execute, sql, params, many, context):
+    timer = _query_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+def _install_query_timer(connection, **kwargs):
+    # Connections are per thread, and the wrapper stays on a connection
+    # across reconnects, so each one only needs it once.
+    if _time_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_query)
+
+
+connection_created.connect(_install_query_timer)
+
+
+class MetricsMiddleware:
+    """
+    Record request, SQL and template timings by URL name. Runs natively
+    under both WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # Connections opened before the receiver above was connected.
+        for connection in connections.all(initialized_only=True):
+            _install_query_timer(connection)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django runs a sync hook through sync_to_async() in async mode.
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timer = QueryTimer()
+        token = _query_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_timer.reset(token)
+        self.record(request, response, timer, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        timer = QueryTimer()
+        token = _query_timer.set(timer)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_timer.reset(token)
+        self.record(request, response, timer, time.perf_counter() - started)
+        return response
+
+    def record(self, request, response, timer, elapsed):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "<unresolved>"
+        requests_total.inc((view, request.method, str(response.status_code)))
+        request_seconds.observe((view, request.method), elapsed)
+        db_queries.observe((view,), timer.count)
+        db_seconds.observe((view,), timer.seconds)
+        rendering = getattr(request, "_metrics_template_seconds", None)
+        if rendering is not None:
+            template_seconds.observe((view,), rendering)
+
+    def process_template_response(self, request, response):
+        # Called just before the response is rendered; the callback runs
+        # straight after.
+        started = time.perf_counter()
+
+        def rendered(response):
+            request._metrics_template_seconds = (
+                time.perf_counter() - started)
+
+        response.add_post_render_callback(rendered)
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        return self.process_template_response(request, response)
+
+
+def metrics_view(request):
+    """
+    Serve the metrics in the Prometheus text format to staff users and to
+    scrapers sending METRICS_TOKEN as a bearer token. With DEBUG on and no
+    token set, anyone can read them.
+    """
+    token = getattr(settings, "METRICS_TOKEN", None)
+    supplied = request.headers.get("Authorization", "")
+    allowed = (
+        request.user.is_staff
+        or (token and hmac.compare_digest(supplied, f"Bearer {token}"))
+        or (settings.DEBUG and not token)
+    )
+    if not allowed:
+        return HttpResponseForbidden()
+    return HttpResponse(registry.expose(), content_type=CONTENT_TYPE)
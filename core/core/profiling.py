@@ -0,0 +1,109 @@
+"""
+Find out where template rendering time goes.
+
+``TemplateProfiler`` wraps every template node while it is active and
+attributes the time spent in each one, excluding its children, to the
+template the node came from and to its tag (``url``, ``if``, ``for``...)
+or variable (``{{ ticket.date }}``)::
+
+    with TemplateProfiler() as profiler:
+        client.get("/tickets/")
+    print(profiler.report())
+
+Timing every node slows rendering down several times over, so compare
+the shares rather than the absolute numbers with an unprofiled run. The
+profiler patches Django's ``Node`` class for the whole process; it is
+meant for benchmarks and local debugging, not for production traffic.
+"""
+
+import threading
+import time
+from collections import defaultdict
+
+from django.template.base import Node, TokenType
+
+
+def node_tag(node):
+    """The tag name of a block node, or the whole ``{{ variable }}``."""
+    token = getattr(node, "token", None)
+    if token is None:
+        return type(node).__name__
+    if token.token_type == TokenType.VAR:
+        return f"{{{{ {token.contents} }}}}"
+    return token.split_contents()[0] if token.contents else "?"
+
+
+class Timing:
+    __slots__ = ("calls", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+
+
+class TemplateProfiler:
+    """Self time of template nodes, by template and by tag."""
+
+    def __init__(self):
+        self.by_template = defaultdict(Timing)
+        self.by_tag = defaultdict(Timing)
+        self.total = 0.0
+        self._tags = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._original = None
+
+    def __enter__(self):
+        self._original = Node.render_annotated
+        profiler = self
+
+        def render_annotated(node, context):
+            return profiler._time(node, context)
+
+        Node.render_annotated = render_annotated
+        return self
+
+    def __exit__(self, *exc_info):
+        Node.render_annotated = self._original
+
+    def _time(self, node, context):
+        # Each frame collects the time its children took, so that can be
+        # taken off the node's own time.
+        stack = self._local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original(node, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            own = elapsed - stack.pop()
+            if stack:
+                stack[-1] += elapsed
+            origin = getattr(node, "origin", None)
+            template = getattr(origin, "template_name", None) or "<string>"
+            tag = self._tags.get(node) or self._tags.setdefault(
+                node, node_tag(node))
+            with self._lock:
+                for timing in (self.by_template[template],
+                               self.by_tag[tag]):
+                    timing.calls += 1
+                    timing.seconds += own
+                if not stack:
+                    self.total += elapsed
+
+    def report(self, limit=15):
+        """The templates and tags with the most self time, as text."""
+        lines = [f"Template render time: {self.total * 1000:.1f} ms"]
+        for title, timings in (("template", self.by_template),
+                               ("tag", self.by_tag)):
+            lines.append("")
+            lines.append(f"{title:<40}{'calls':>9}{'ms':>10}{'share':>8}")
+            ranked = sorted(
+                timings.items(), key=lambda item: item[1].seconds,
+                reverse=True)
+            for name, timing in ranked[:limit]:
+                share = timing.seconds / self.total if self.total else 0.0
+                lines.append(
+                    f"{name:<40}{timing.calls:>9}"
+                    f"{timing.seconds * 1000:>10.1f}{share:>8.0%}")
+        return "\n".join(lines)
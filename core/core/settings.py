@@ -10,10 +10,10 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 
+from importlib.util import find_spec
 from pathlib import Path
 import os
-import django_heroku
-import dj_database_url # noqa: F401
+import dj_database_url
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -48,11 +48,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its timings cover the rest of the stack.
+    'core.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'accounts.middleware.AuthenticationMiddleware',
+    'core.admission.AdmissionControlMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -63,13 +67,23 @@ TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [str(BASE_DIR.joinpath('templates'))],
-        'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'core.context_processors.nav_urls',
+            ],
+            # Parse each template once per process. This is what Django
+            # does by default since 4.1, DEBUG or not; spelled out so the
+            # loaders stay cached if more are added. Under runserver the
+            # autoreloader clears the cache when a template changes.
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
             ],
         },
     },
@@ -77,18 +91,161 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'core.wsgi.application'
 
+# Serve the async ticket list/create/complete/delete views. Only worth
+# enabling when running core.asgi under an ASGI server (see README).
+TICKETS_ASYNC_VIEWS = os.environ.get('TICKETS_ASYNC_VIEWS') == '1'
+
+# Completed tickets untouched for this many days are moved to the archive
+# table by ``manage.py archive_tickets``.
+TICKETS_ARCHIVE_AFTER_DAYS = int(
+    os.environ.get('TICKETS_ARCHIVE_AFTER_DAYS', 90))
+
+# /metrics answers staff users and requests carrying
+# "Authorization: Bearer <METRICS_TOKEN>"; with DEBUG on and no token set,
+# it answers anyone.
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
+# Writes to these URL names are turned away with a 429/503 and Retry-After
+# once a token bucket, as (requests per second, burst), runs dry or too
+# many are already in flight in the worker (see core.admission). The
+# concurrency caps only matter for threaded or ASGI workers: the
+# Procfile's sync gunicorn workers handle one request at a time.
+ADMISSION_CONTROL = {
+    'ticket_add': {'user': (0.2, 10), 'global': (10, 50), 'concurrency': 4},
+    'ticket_complete': {
+        'user': (1, 20), 'global': (30, 100), 'concurrency': 8},
+    'signup': {'user': (0.02, 5), 'global': (1, 20), 'concurrency': 2},
+}
+ADMISSION_CACHE = 'admission'
+# How many proxies in front of the app append to X-Forwarded-For, so
+# anonymous clients are told apart by their own address rather than the
+# proxy's. Heroku's router is one; DYNO is only set on Heroku.
+ADMISSION_PROXY_COUNT = int(os.environ.get(
+    'ADMISSION_PROXY_COUNT', 1 if 'DYNO' in os.environ else 0))
+
 
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
 
+# Configured from DATABASE_URL, falling back to the SQLite file for
+# development. Connections are kept open for DB_CONN_MAX_AGE seconds
+# (0 closes them after every request) and checked before being reused.
+# Django advises against persistent connections in async mode, so the ASGI
+# profile (core.asgi or TICKETS_ASYNC_VIEWS) defaults to 0; use DB_POOL
+# there to reuse connections.
+
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+    'default': dj_database_url.config(
+        default=f"sqlite:///{BASE_DIR / 'db.sqlite3'}",
+        conn_max_age=int(os.environ.get(
+            'DB_CONN_MAX_AGE', 0 if TICKETS_ASYNC_VIEWS else 600)),
+        conn_health_checks=True,
+    ),
+}
+
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # WAL lets readers carry on while a write is in progress; IMMEDIATE
+    # transactions take the write lock up front, so concurrent writers
+    # queue on busy_timeout (``timeout``) instead of failing with
+    # "database is locked" part-way through.
+    DATABASES['default']['OPTIONS'] = {
+        'transaction_mode': 'IMMEDIATE',
+        'timeout': 5,
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'PRAGMA temp_store=MEMORY;'
+            'PRAGMA mmap_size=134217728;'
+            'PRAGMA journal_size_limit=27103364;'
+            'PRAGMA cache_size=-20000;'
+        ),
+    }
+elif DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default']['OPTIONS'] = {
+        'sslmode': os.environ.get('DB_SSLMODE', 'require'),
     }
+    # Django's native pool needs psycopg 3 with psycopg_pool. It replaces
+    # persistent connections, so CONN_MAX_AGE has to be 0.
+    if os.environ.get('DB_POOL') == '1' and find_spec('psycopg_pool'):
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', 10)),
+        }
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Rendered ticket cards are cached separately so they can be sized and
+# backed independently. Set TICKET_CARD_CACHE_DIR to use the LRU file cache
+# instead of the per-process local-memory cache.
+TICKET_CARD_CACHE_DIR = os.environ.get('TICKET_CARD_CACHE_DIR')
+# Backs the cached_db session engine (see Sessions below).
+SESSION_CACHE_DIR = os.environ.get('SESSION_CACHE_DIR')
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'ticket_cards': {
+        'BACKEND': (
+            'core.cache.LRUFileBasedCache' if TICKET_CARD_CACHE_DIR
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': TICKET_CARD_CACHE_DIR or 'ticket-cards',
+        'TIMEOUT': 60 * 60 * 24,
+        # Bump whenever tickets/ticket_card.html changes so persisted cards
+        # rendered from the old template are not served.
+        'VERSION': 4,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+            'CULL_FREQUENCY': 10,
+        },
+    },
+    'admission': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'admission',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        },
+    },
+    'sessions': {
+        'BACKEND': (
+            'django.core.cache.backends.filebased.FileBasedCache'
+            if SESSION_CACHE_DIR
+            else 'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': SESSION_CACHE_DIR or 'sessions',
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        },
+    },
 }
 
 
+# Sessions
+# https://docs.djangoproject.com/en/5.2/topics/http/sessions/
+#
+# SESSION_BACKEND picks where sessions live:
+# - 'db' (default): one django_session read per authenticated request.
+# - 'cached_db': read from the 'sessions' cache, written through to the
+#   database. The cache must be shared by every process serving requests,
+#   or a logout handled by one is not seen by the others until the entry
+#   expires: local memory is only safe with a single process; set
+#   SESSION_CACHE_DIR to share a file cache between workers on one host.
+# - 'signed_cookies': no server-side storage at all; sessions cannot be
+#   revoked server-side before they expire.
+
+SESSION_BACKEND = os.environ.get('SESSION_BACKEND', 'db')
+SESSION_ENGINE = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}[SESSION_BACKEND]
+SESSION_CACHE_ALIAS = 'sessions'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -108,6 +265,39 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Password hashing
+# https://docs.djangoproject.com/en/5.2/topics/auth/passwords/
+
+# PASSWORD_HASHER picks the hasher for new passwords: argon2 (the default
+# when argon2-cffi is installed), scrypt or pbkdf2. The costs below default
+# to OWASP's minimums, which hash in tens of milliseconds rather than the
+# ~0.6 s of Django's PBKDF2. Hashes made by the other hashers still verify
+# and are upgraded the next time their user logs in, as are hashes made
+# with a different cost.
+PASSWORD_HASHER = os.environ.get(
+    'PASSWORD_HASHER', 'argon2' if find_spec('argon2') else 'scrypt')
+PASSWORD_ARGON2_COST = {
+    'time_cost': int(os.environ.get('ARGON2_TIME_COST', 2)),
+    # KiB
+    'memory_cost': int(os.environ.get('ARGON2_MEMORY_COST', 19456)),
+    'parallelism': int(os.environ.get('ARGON2_PARALLELISM', 1)),
+}
+PASSWORD_SCRYPT_COST = {
+    'work_factor': 2 ** int(os.environ.get('SCRYPT_LOG2_N', 14)),
+    'block_size': int(os.environ.get('SCRYPT_BLOCK_SIZE', 8)),
+    'parallelism': int(os.environ.get('SCRYPT_PARALLELISM', 1)),
+}
+PASSWORD_HASHERS = [
+    'accounts.hashers.Argon2PasswordHasher',
+    'accounts.hashers.ScryptPasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+# New passwords are hashed with the first one.
+PASSWORD_HASHERS.insert(0, PASSWORD_HASHERS.pop([
+    'argon2', 'scrypt', 'pbkdf2'].index(PASSWORD_HASHER)))
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/4.1/topics/i18n/
 
@@ -123,10 +313,54 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.1/howto/static-files/
 
-STATIC_URL = 'static/'
+STATIC_URL = '/static/'
 STATIC_ROOT = os. path. join(BASE_DIR, 'staticfiles')
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
-django_heroku.settings(locals())
+
+# collectstatic writes every file under a content-hashed name, plus gzip
+# and (with the Brotli package) brotli copies. WhiteNoise serves the
+# hashed names with a one-year "immutable" Cache-Control, so browsers
+# never re-request an asset until a deploy changes its name.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# What django_heroku.settings() still did once DATABASES and static files
+# were configured above. Importing django_heroku pulls in django.test and
+# unittest at start-up, so its settings are spelled out instead.
+SECRET_KEY = os.environ.get('SECRET_KEY', SECRET_KEY)
+if 'CI' in os.environ:
+    TEST_RUNNER = 'django_heroku.HerokuDiscoverRunner'
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'verbose': {
+            'format': ('%(asctime)s [%(process)d] [%(levelname)s] '
+                       'pathname=%(pathname)s lineno=%(lineno)s '
+                       'funcname=%(funcName)s %(message)s'),
+            'datefmt': '%Y-%m-%d %H:%M:%S',
+        },
+    },
+    'handlers': {
+        'console': {
+            'level': 'DEBUG',
+            'class': 'logging.StreamHandler',
+            'formatter': 'verbose',
+        },
+    },
+    'loggers': {
+        'testlogger': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.1/ref/settings/#default-auto-field
@@ -0,0 +1,39 @@
+"""
+Settings for running the test suite.
+
+pytest uses them through ``pyproject.toml`` and ``manage.py test`` picks
+them by default. Everything comes from ``core.settings`` except for what
+makes the tests slow or depends on a deploy step.
+"""
+
+from .settings import *  # noqa: F401,F403
+
+# Each test process gets its own in-memory SQLite database, so parallel
+# workers (pytest -n, manage.py test --parallel) never share a file.
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+        'OPTIONS': {
+            'transaction_mode': 'IMMEDIATE',
+        },
+    },
+}
+
+# The real hashers are slow on purpose and almost every test creates a
+# user; the hashing tests override PASSWORD_HASHERS again.
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# Render {% static %} without needing collectstatic's manifest.
+STORAGES = {
+    **STORAGES,  # noqa: F405
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
+# Tests create many tickets and users in a row; the admission control
+# tests turn it back on with override_settings.
+ADMISSION_CONTROL = {}
@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin that fails a test when a block of code runs more SQL
+    statements than its budget. Unlike ``assertNumQueries`` the budget is an
+    upper bound, so views can get cheaper without the test breaking.
+    """
+
+    @contextmanager
+    def assertMaxQueries(self, budget, using=DEFAULT_DB_ALIAS):
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+        executed = len(context)
+        if executed > budget:
+            statements = "\n".join(
+                f"{i}. {query['sql']}"
+                for i, query in enumerate(context.captured_queries, start=1)
+            )
+            self.fail(
+                f"{executed} queries executed, budget is {budget}.\n"
+                f"Captured queries were:\n{statements}"
+            )
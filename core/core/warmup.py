@@ -0,0 +1,85 @@
+"""
+Do up front the work a new worker would otherwise do on its first
+requests.
+
+``warm_up()`` imports every view through the URL resolver and compiles
+its patterns, parses the project's templates into the cached loader
+(along with the tag libraries and context processors they use), opens
+the static files manifest, loads the translation catalogs and fills in
+each model's field caches. Run it before the server forks its workers
+(``gunicorn.conf.py`` does, with ``preload_app``) and every worker starts
+with all of this already in memory, shared with the master until written
+to. It never opens a database connection.
+"""
+
+import time
+from pathlib import Path
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template import TemplateSyntaxError, engines
+from django.urls import URLResolver, get_resolver
+from django.utils import translation
+from django.utils.module_loading import import_string
+
+
+def warm_up():
+    """Warm every cache above and return how many seconds each took."""
+    timings = {}
+    for name, step in (("urls", _warm_urls),
+                       ("translations", _warm_translations),
+                       ("templates", _warm_templates),
+                       ("models", _warm_models)):
+        started = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - started
+    return timings
+
+
+def _warm_urls():
+    # Populating the resolver imports every URLconf and view module.
+    resolver = get_resolver()
+    resolver.reverse_dict
+    _compile_patterns(resolver)
+    for status_code in (400, 403, 404, 500):
+        resolver.resolve_error_handler(status_code)
+    # Otherwise imported by the first request that uses them.
+    import_string(settings.MESSAGE_STORAGE)
+    import_string(settings.SESSION_SERIALIZER)
+
+
+def _compile_patterns(resolver):
+    # Each pattern compiles its regex the first time a path is matched
+    # against it.
+    for pattern in resolver.url_patterns:
+        pattern.pattern.regex
+        if isinstance(pattern, URLResolver):
+            _compile_patterns(pattern)
+
+
+def _warm_translations():
+    translation.activate(settings.LANGUAGE_CODE)
+    translation.deactivate()
+
+
+def _warm_templates():
+    # Opens the manifest of hashed names, which {% static %} reads.
+    staticfiles_storage.base_url
+    for engine in engines.all():
+        if hasattr(engine, "engine"):
+            engine.engine.template_context_processors
+        for directory in getattr(engine, "dirs", ()):
+            root = Path(directory)
+            for path in sorted(root.rglob("*.html")):
+                try:
+                    engine.get_template(path.relative_to(root).as_posix())
+                except TemplateSyntaxError:
+                    # Left for the request that uses it to report.
+                    pass
+
+
+def _warm_models():
+    for model in apps.get_models():
+        model._meta.get_fields()
+        model._meta._property_names
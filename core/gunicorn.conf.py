@@ -0,0 +1,35 @@
+"""
+gunicorn settings for the Procfile's web process.
+
+The application is imported and warmed up (``core.warmup``) once, in the
+master, before it forks the workers, so every worker starts with the
+views, templates and model metadata already loaded. ``gc.freeze()`` then
+moves everything loaded so far out of the garbage collector's sight:
+otherwise the first collection in each worker writes to every one of
+those objects and the kernel has to give the worker its own copy of the
+pages they sit on.
+"""
+
+import gc
+
+preload_app = True
+
+# No collections while the application loads, so freed objects do not
+# leave holes between the long-lived ones that workers would then fill.
+gc.disable()
+
+
+def when_ready(server):
+    # Runs in the master after the preload and before the first fork.
+    from django.db import connections
+
+    from core.warmup import warm_up
+
+    timings = warm_up()
+    # Workers must not inherit the master's database connections.
+    connections.close_all()
+    gc.freeze()
+    gc.enable()
+    server.log.info(
+        "Warmed up in %.0f ms, %d objects frozen",
+        sum(timings.values()) * 1000, gc.get_freeze_count())
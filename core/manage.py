@@ -6,6 +6,9 @@ import sys
 
 def main():
     """Run administrative tasks."""
+    if sys.argv[1:2] == ['test']:
+        # Run the tests with the test settings unless told otherwise.
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings_test')
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
     try:
         from django.core.management import execute_from_command_line
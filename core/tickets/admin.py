@@ -1,4 +1,65 @@
-from django.contrib import admin
-from .models import Ticket
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.auth import get_user_model
 
-admin.site.register(Ticket)
+from .archive import restore_tickets
+from .models import ArchivedTicket, Ticket
+
+
+class TicketActionForm(ActionForm):
+    author = forms.CharField(
+        required=False,
+        label="Reassign to (username)",
+        max_length=150,
+    )
+
+
+@admin.register(Ticket)
+class TicketAdmin(admin.ModelAdmin):
+    list_display = ("title", "author", "is_completed", "date")
+    list_filter = ("is_completed",)
+    list_select_related = ("author",)
+    action_form = TicketActionForm
+    actions = ["mark_completed", "mark_open", "reassign"]
+
+    # Each action is a single UPDATE over the selected rows.
+    @admin.action(description="Mark selected tickets as complete")
+    def mark_completed(self, request, queryset):
+        updated = queryset.complete()
+        self.message_user(request, f"{updated} tickets marked as complete.")
+
+    @admin.action(description="Reopen selected tickets")
+    def mark_open(self, request, queryset):
+        updated = queryset.reopen()
+        self.message_user(request, f"{updated} tickets reopened.")
+
+    @admin.action(description="Reassign selected tickets")
+    def reassign(self, request, queryset):
+        username = request.POST.get("author", "")
+        author = get_user_model().objects.filter(username=username).first()
+        if author is None:
+            self.message_user(
+                request,
+                f"There is no user called {username!r}.",
+                level=messages.ERROR,
+            )
+            return
+        updated = queryset.reassign(author)
+        self.message_user(
+            request, f"{updated} tickets reassigned to {author.username}.")
+
+    def delete_queryset(self, request, queryset):
+        queryset.bulk_delete()
+
+
+@admin.register(ArchivedTicket)
+class ArchivedTicketAdmin(admin.ModelAdmin):
+    list_display = ("title", "author", "date", "archived")
+    list_select_related = ("author",)
+    actions = ["restore"]
+
+    @admin.action(description="Restore selected tickets")
+    def restore(self, request, queryset):
+        restored = restore_tickets(queryset)
+        self.message_user(request, f"{len(restored)} tickets restored.")
@@ -0,0 +1,64 @@
+"""
+Read-only JSON projections of tickets for integrations.
+
+Rows are read with ``values()``, limited to the fields the client asked
+for, so no ``Ticket`` instances are built and the author is only joined
+when ``author`` is requested. Pages are serialised with orjson when it is
+installed and with the standard library otherwise.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Public field name -> lookup, in the order fields are returned by default.
+FIELDS = {
+    "id": "id",
+    "title": "title",
+    "body": "body",
+    "date": "date",
+    "modified": "modified",
+    "is_completed": "is_completed",
+    "author": "author__username",
+}
+# ``id`` is the only ordering key, so cursors need nothing else.
+ORDERING = ["-id"]
+CONTENT_TYPE = "application/json"
+
+
+def project(queryset, fields, status=None):
+    """
+    Return ``queryset`` as ``values()`` rows holding ``fields`` plus the
+    id. ``status`` is "open" or "completed".
+    """
+    if status == "open":
+        queryset = queryset.filter(is_completed=False)
+    elif status == "completed":
+        queryset = queryset.filter(is_completed=True)
+    lookups = dict.fromkeys(["id", *(FIELDS[name] for name in fields)])
+    return queryset.values(*lookups)
+
+
+def rows_to_dicts(rows, fields):
+    """Rename the lookups in ``rows`` to the public ``fields``."""
+    pairs = [(name, FIELDS[name]) for name in fields]
+    return [{name: row[lookup] for name, lookup in pairs} for row in rows]
+
+
+def _default(value):
+    # Match orjson: RFC 3339 datetimes, microseconds kept.
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(data):
+    """Serialise ``data`` to compact JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(
+        data, default=_default, separators=(",", ":")).encode()
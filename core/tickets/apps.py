@@ -1,5 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 
 
 class TicketsConfig(AppConfig):
     name = 'tickets'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .search import recreate_search_triggers
+
+        post_migrate.connect(recreate_search_triggers, sender=self)
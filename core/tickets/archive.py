@@ -0,0 +1,99 @@
+"""
+Move long-completed tickets to ``ArchivedTicket`` and back.
+
+The ticket list, its indexes and the search index only cover
+``tickets_ticket``, so keeping old completed tickets out of it keeps the
+hot path the same size however much history builds up. Tickets are moved
+in batches, each copied and deleted in its own transaction, so a run can
+be stopped at any point and readers never see a ticket in both tables or
+in neither.
+
+A moved ticket is still the same ticket: ``num_tickets_assigned`` and the
+stats rollups are left alone both ways, and the rebuild functions count
+archived tickets too.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import ArchivedTicket, Ticket, tickets_changed
+from .search import optimize_search_index
+
+BATCH_SIZE = 1000
+ARCHIVED_FIELDS = ("id", "title", "body", "date", "author_id", "modified")
+
+
+def archivable(days=None, using=None):
+    """Completed tickets not modified in the last ``days`` days
+    (``TICKETS_ARCHIVE_AFTER_DAYS`` by default)."""
+    if days is None:
+        days = settings.TICKETS_ARCHIVE_AFTER_DAYS
+    cutoff = timezone.now() - timedelta(days=days)
+    # The base manager's plain QuerySet, so deleting rows here leaves the
+    # counters and rollups as they are.
+    return Ticket._base_manager.db_manager(using).filter(
+        is_completed=True, modified__lt=cutoff)
+
+
+def archive_tickets(days=None, batch_size=BATCH_SIZE, using=None):
+    """
+    Move every ``archivable()`` ticket to the archive and yield how many
+    went in each batch. The search index is optimized at the end.
+    """
+    tickets = archivable(days, using)
+    last_pk = 0
+    while True:
+        with transaction.atomic(using=tickets.db):
+            batch = list(
+                tickets.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .select_for_update()
+                .values_list(*ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not batch:
+                break
+            now = timezone.now()
+            ArchivedTicket.objects.using(tickets.db).bulk_create(
+                ArchivedTicket(archived=now, **dict(zip(ARCHIVED_FIELDS, row)))
+                for row in batch
+            )
+            pks = [row[0] for row in batch]
+            Ticket._base_manager.db_manager(tickets.db).filter(
+                pk__in=pks)._raw_delete(tickets.db)
+        last_pk = pks[-1]
+        tickets_changed.send(
+            sender=Ticket, kind="deleted", pks=pks, using=tickets.db)
+        yield len(pks)
+    if last_pk:
+        optimize_search_index(tickets.db)
+
+
+def restore_tickets(archived, using=None):
+    """
+    Move the ``archived`` queryset of ``ArchivedTicket`` back into the
+    ticket table, still completed and under their old ids, and return the
+    restored tickets.
+    """
+    using = using or archived.db
+    with transaction.atomic(using=using):
+        rows = list(archived.using(using).select_for_update().order_by("pk"))
+        if not rows:
+            return []
+        restored = Ticket._base_manager.db_manager(using).bulk_create(
+            Ticket(
+                id=row.id,
+                title=row.title,
+                body=row.body,
+                date=row.date,
+                author_id=row.author_id,
+                is_completed=True,
+            )
+            for row in rows
+        )
+        pks = [row.pk for row in rows]
+        ArchivedTicket.objects.using(using).filter(pk__in=pks).delete()
+    tickets_changed.send(sender=Ticket, kind="created", pks=pks, using=using)
+    return restored
@@ -0,0 +1,136 @@
+from django.core.cache import caches
+from django.template.loader import get_template
+from django.urls import reverse
+from django.utils.formats import localize
+from django.utils.safestring import mark_safe
+from django.utils.timezone import template_localtime
+
+
+CACHE_ALIAS = "ticket_cards"
+CARD_TEMPLATE = "tickets/ticket_card.html"
+ROLES = ("owner", "superuser", "other")
+# Stands in for the ticket id when a card URL is reversed once per pass.
+_ID_PLACEHOLDER = 9876543210
+
+
+class CardCacheStats:
+    """In-process hit/miss counters for the ticket card cache."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+stats = CardCacheStats()
+
+
+def viewer_role(user, ticket):
+    """Which variant of a card ``user`` sees; owners and superusers get the
+    edit and delete links."""
+    if user.is_superuser:
+        return "superuser"
+    if ticket.author_id == user.pk:
+        return "owner"
+    return "other"
+
+
+def card_cache_key(ticket_id, modified, role):
+    return f"ticket-card:{ticket_id}:{modified.timestamp():.6f}:{role}"
+
+
+def _url_format(name):
+    url = reverse(name, args=[_ID_PLACEHOLDER])
+    return url.replace(str(_ID_PLACEHOLDER), "{}")
+
+
+def _render_cards(cards):
+    """
+    Render ``{key: (ticket, role)}`` and return ``{key: markup}``.
+
+    Everything a card needs beyond the ticket's own fields is worked out
+    here in one pass, so the template only prints values: each URL is
+    reversed once and filled in per ticket, and the links a viewer gets,
+    the author's name and the raised-on date are computed up front.
+    """
+    if not cards:
+        return {}
+    template = get_template(CARD_TEMPLATE)
+    complete_url = _url_format("ticket_complete")
+    edit_url = _url_format("ticket_edit")
+    delete_url = _url_format("ticket_delete")
+    rendered = {}
+    for key, (ticket, role) in cards.items():
+        can_edit = role != "other"
+        rendered[key] = template.render({
+            "ticket": ticket,
+            # A string, so it is not run through number localization.
+            "dom_id": f"ticket-{ticket.pk}",
+            "complete_url": (
+                None if ticket.is_completed
+                else complete_url.format(ticket.pk)),
+            "edit_url": edit_url.format(ticket.pk) if can_edit else None,
+            "delete_url": delete_url.format(ticket.pk) if can_edit else None,
+            "author": str(ticket.author),
+            # What {{ ticket.date }} would print.
+            "raised": localize(template_localtime(ticket.date)),
+        })
+    return rendered
+
+
+def render_ticket_cards(tickets, user):
+    """
+    Return the rendered card markup for each ticket, reusing cached
+    fragments. The whole page is read with one get_many() and the misses
+    are written back with one set_many().
+    """
+    cache = caches[CACHE_ALIAS]
+    keyed = {}
+    for ticket in tickets:
+        role = viewer_role(user, ticket)
+        keyed[card_cache_key(ticket.pk, ticket.modified, role)] = (
+            ticket, role)
+
+    cards = cache.get_many(keyed)
+    missing = _render_cards({
+        key: card for key, card in keyed.items() if key not in cards})
+    if missing:
+        cache.set_many(missing)
+    stats.hits += len(cards)
+    stats.misses += len(missing)
+    cards.update(missing)
+    return [mark_safe(cards[key]) for key in keyed]
+
+
+def render_ticket_card_variants(ticket):
+    """Return the card markup for ``ticket`` as each role sees it, keyed by
+    role, for pushing to viewers whose role is not known up front."""
+    cache = caches[CACHE_ALIAS]
+    keyed = {
+        card_cache_key(ticket.pk, ticket.modified, role): role
+        for role in ROLES
+    }
+    cards = cache.get_many(keyed)
+    missing = _render_cards({
+        key: (ticket, role) for key, role in keyed.items()
+        if key not in cards})
+    if missing:
+        cache.set_many(missing)
+    stats.hits += len(cards)
+    stats.misses += len(missing)
+    cards.update(missing)
+    return {role: cards[key] for key, role in keyed.items()}
+
+
+def invalidate_ticket_cards(ticket_id, modified):
+    """Drop every cached variant of a ticket's card at version
+    ``modified``."""
+    caches[CACHE_ALIAS].delete_many(
+        [card_cache_key(ticket_id, modified, role) for role in ROLES])
@@ -0,0 +1,45 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Subquery
+from django.db.models import Value, When
+from django.db.models.functions import Coalesce, Greatest
+
+
+def adjust_ticket_counts(deltas, using=None):
+    """
+    Apply ``{author_id: delta}`` to ``CustomUser.num_tickets_assigned`` in a
+    single UPDATE. The arithmetic happens in the database through F(), so
+    concurrent changes to the same user cannot overwrite each other.
+    """
+    deltas = {pk: delta for pk, delta in deltas.items() if pk and delta}
+    if not deltas:
+        return
+    User = get_user_model()
+    change = Case(
+        *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    User._default_manager.db_manager(using).filter(pk__in=deltas).update(
+        num_tickets_assigned=Greatest(F("num_tickets_assigned") + change, 0)
+    )
+
+
+def rebuild_ticket_counts(using=None):
+    """Recompute every user's ticket count, archived tickets included, with
+    one aggregate UPDATE and return the number of users updated."""
+    from .models import ArchivedTicket, Ticket
+
+    def count(model):
+        counts = (
+            model.objects.filter(author=OuterRef("pk"))
+            .order_by()
+            .values("author")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return Coalesce(Subquery(counts), 0)
+
+    User = get_user_model()
+    return User._default_manager.db_manager(using).update(
+        num_tickets_assigned=count(Ticket) + count(ArchivedTicket)
+    )
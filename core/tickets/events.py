@@ -0,0 +1,186 @@
+"""
+In-process publish/subscribe for live ticket list updates.
+
+Ticket signals are turned into small per-ticket events and fanned out to
+every connected ``/tickets/events/`` stream. Receivers are only connected
+while at least one stream is open, so writes cost nothing extra otherwise.
+Events only reach streams served by the same process.
+"""
+
+import asyncio
+import json
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+
+from .cards import render_ticket_card_variants, viewer_role
+from .models import Ticket, tickets_changed
+
+# Events buffered per connection before it is considered too slow.
+QUEUE_SIZE = 100
+HEARTBEAT_SECONDS = 15
+
+
+class TicketEvent:
+    """A change to one ticket, with its card rendered for every role."""
+
+    def __init__(self, kind, ticket_id, author_id=None, cards=None):
+        self.kind = kind
+        self.ticket_id = ticket_id
+        self.author_id = author_id
+        self.cards = cards or {}
+
+    def payload(self, user):
+        data = {"type": self.kind, "id": self.ticket_id}
+        if self.cards:
+            # viewer_role() only needs ``author_id``.
+            data["html"] = self.cards[viewer_role(user, self)]
+        return data
+
+
+# Sent in place of a connection's backlog once it overflows.
+RESYNC = TicketEvent("resync", None)
+
+
+class Subscription:
+    """
+    One open stream: a bounded queue of events, filled from any thread and
+    drained on the event loop that opened it.
+    """
+
+    def __init__(self, user, queue_size):
+        self.user = user
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(queue_size)
+        self.overflowed = False
+
+    def put(self, event):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client is not keeping up. Rather than buffer without
+            # bound or hold up the writer, drop its backlog and tell it to
+            # reload the page.
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class TicketEventBroker:
+    def __init__(self, queue_size=QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscriptions = set()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._subscriptions)
+
+    def subscribe(self, user):
+        """Open a subscription for ``user``; call from the event loop."""
+        subscription = Subscription(user, self.queue_size)
+        with self._lock:
+            if not self._subscriptions:
+                self._connect()
+            self._subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            self._subscriptions.discard(subscription)
+            if not self._subscriptions:
+                self._disconnect()
+
+    def publish(self, event):
+        """Queue ``event`` for every subscription. Safe from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(
+                    subscription.put, event)
+            except RuntimeError:
+                # Its loop has closed; the stream is already gone.
+                pass
+
+    def publish_tickets(self, kind, tickets):
+        for ticket in tickets:
+            self.publish(TicketEvent(
+                kind,
+                ticket.pk,
+                ticket.author_id,
+                render_ticket_card_variants(ticket),
+            ))
+
+    def _connect(self):
+        post_save.connect(self._saved, sender=Ticket, weak=False)
+        post_delete.connect(self._deleted, sender=Ticket, weak=False)
+        tickets_changed.connect(self._changed, sender=Ticket, weak=False)
+
+    def _disconnect(self):
+        post_save.disconnect(self._saved, sender=Ticket)
+        post_delete.disconnect(self._deleted, sender=Ticket)
+        tickets_changed.disconnect(self._changed, sender=Ticket)
+
+    # Events are published once the change is committed, so streams never
+    # show a write that is later rolled back.
+
+    def _saved(self, sender, instance, created, raw=False, using=None,
+               **kwargs):
+        if raw:
+            return
+        kind = "created" if created else "updated"
+        transaction.on_commit(
+            lambda: self.publish_tickets(kind, [instance]), using=using)
+
+    def _deleted(self, sender, instance, using=None, **kwargs):
+        event = TicketEvent("deleted", instance.pk, instance.author_id)
+        transaction.on_commit(lambda: self.publish(event), using=using)
+
+    def _changed(self, sender, kind, pks, using=None, **kwargs):
+        def publish():
+            if kind == "deleted":
+                for pk in pks:
+                    self.publish(TicketEvent(kind, pk))
+                return
+            tickets = Ticket.objects.using(using).filter(
+                pk__in=pks).select_related("author")
+            self.publish_tickets(kind, tickets)
+
+        transaction.on_commit(publish, using=using)
+
+
+broker = TicketEventBroker()
+
+
+def format_event(data):
+    return f"data: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def event_stream(user, broker=broker, heartbeat=HEARTBEAT_SECONDS):
+    """
+    Yield server-sent events for ``user`` until the client disconnects or
+    falls too far behind, in which case it is sent a ``resync`` event.
+    """
+    subscription = broker.subscribe(user)
+    try:
+        # Reconnect after 5s if the connection drops.
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat)
+            except asyncio.TimeoutError:
+                # Keeps proxies from closing an idle connection.
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event.payload(user))
+            if event is RESYNC:
+                return
+    finally:
+        broker.unsubscribe(subscription)
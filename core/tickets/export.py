@@ -0,0 +1,80 @@
+import csv
+from datetime import datetime, time, timedelta
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+
+from .models import Ticket
+
+
+FIELDS = ("title", "body", "date", "author", "is_completed")
+FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+# Rows fetched per round trip and serialised per yielded chunk.
+CHUNK_SIZE = 2000
+
+
+def export_queryset(status=None, author=None, since=None, until=None):
+    """
+    Return the tickets to export as plain tuples in ``FIELDS`` order.
+    ``status`` is "open" or "completed", ``author`` a username and
+    ``since``/``until`` inclusive dates.
+    """
+    tickets = Ticket.objects.all()
+    if status == "open":
+        tickets = tickets.filter(is_completed=False)
+    elif status == "completed":
+        tickets = tickets.filter(is_completed=True)
+    if author:
+        tickets = tickets.filter(author__username=author)
+    if since:
+        tickets = tickets.filter(date__gte=_start_of(since))
+    if until:
+        tickets = tickets.filter(date__lt=_start_of(until + timedelta(days=1)))
+    return tickets.order_by("pk").values_list(
+        "title", "body", "date", "author__username", "is_completed")
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class _Echo:
+    """File-like object whose write() hands the line back to the caller."""
+
+    def write(self, value):
+        return value
+
+
+def iter_export(rows, fmt, chunk_size=CHUNK_SIZE):
+    """
+    Serialise ``rows`` to ``fmt`` and yield the output in chunks of
+    ``chunk_size`` rows. Rows are pulled with ``iterator()`` so only one
+    chunk is ever held in memory, whatever the size of the table.
+    """
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(FIELDS)
+
+        def serialise(row):
+            return writer.writerow(
+                [value.isoformat() if isinstance(value, datetime) else value
+                 for value in row])
+    elif fmt == "ndjson":
+        encoder = DjangoJSONEncoder()
+
+        def serialise(row):
+            return encoder.encode(dict(zip(FIELDS, row))) + "\n"
+    else:
+        raise ValueError(f"Unknown export format {fmt!r}.")
+
+    lines = []
+    for row in rows.iterator(chunk_size=chunk_size):
+        lines.append(serialise(row))
+        if len(lines) >= chunk_size:
+            yield "".join(lines)
+            lines = []
+    if lines:
+        yield "".join(lines)
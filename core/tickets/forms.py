@@ -0,0 +1,111 @@
+from django import forms
+from django.contrib.auth import get_user_model
+
+from .api import FIELDS as API_FIELDS
+
+
+class TicketIdsField(forms.Field):
+    """A list of ticket ids posted as repeated ``ids`` values."""
+
+    widget = forms.MultipleHiddenInput
+    default_error_messages = {
+        "invalid": "Enter a list of ticket ids.",
+        "max_ids": "At most %(max_ids)s tickets can be changed at once.",
+    }
+
+    def __init__(self, *, max_ids, **kwargs):
+        self.max_ids = max_ids
+        super().__init__(**kwargs)
+
+    def to_python(self, value):
+        if not value:
+            return []
+        if not isinstance(value, (list, tuple)):
+            value = [value]
+        try:
+            ids = {int(pk) for pk in value}
+        except (TypeError, ValueError):
+            raise forms.ValidationError(
+                self.error_messages["invalid"], code="invalid")
+        if len(ids) > self.max_ids:
+            raise forms.ValidationError(
+                self.error_messages["max_ids"],
+                code="max_ids",
+                params={"max_ids": self.max_ids},
+            )
+        return sorted(ids)
+
+
+class TicketBulkActionForm(forms.Form):
+    ACTIONS = [
+        ("complete", "Mark as complete"),
+        ("reopen", "Reopen"),
+        ("reassign", "Reassign"),
+        ("delete", "Delete"),
+    ]
+
+    action = forms.ChoiceField(choices=ACTIONS)
+    ids = TicketIdsField(max_ids=500)
+    author = forms.CharField(required=False, max_length=150)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get("action") != "reassign":
+            return cleaned_data
+        username = cleaned_data.get("author")
+        if not username:
+            self.add_error("author", "Choose who to reassign the tickets to.")
+            return cleaned_data
+        try:
+            cleaned_data["author"] = get_user_model().objects.get(
+                username=username)
+        except get_user_model().DoesNotExist:
+            self.add_error("author", f"There is no user called {username}.")
+        return cleaned_data
+
+
+class TicketExportForm(forms.Form):
+    format = forms.ChoiceField(
+        choices=[("csv", "CSV"), ("ndjson", "JSON lines")], required=False)
+    status = forms.ChoiceField(
+        choices=[("", "All"), ("open", "Open"), ("completed", "Completed")],
+        required=False,
+    )
+    author = forms.CharField(required=False, max_length=150)
+    since = forms.DateField(required=False)
+    until = forms.DateField(required=False)
+
+    def clean_format(self):
+        return self.cleaned_data["format"] or "csv"
+
+
+class TicketApiForm(forms.Form):
+    fields = forms.CharField(required=False)
+    status = forms.ChoiceField(
+        choices=[("", "All"), ("open", "Open"), ("completed", "Completed")],
+        required=False,
+    )
+    limit = forms.IntegerField(required=False, min_value=1, max_value=200)
+    after = forms.CharField(required=False)
+    before = forms.CharField(required=False)
+
+    def clean_fields(self):
+        value = self.cleaned_data["fields"]
+        if not value:
+            return list(API_FIELDS)
+        fields = list(dict.fromkeys(
+            name.strip() for name in value.split(",") if name.strip()))
+        unknown = [name for name in fields if name not in API_FIELDS]
+        if unknown:
+            raise forms.ValidationError(
+                "Unknown fields: %(unknown)s. Choose from %(choices)s.",
+                code="unknown_fields",
+                params={
+                    "unknown": ", ".join(unknown),
+                    "choices": ", ".join(API_FIELDS),
+                },
+            )
+        return fields
+
+    def clean_limit(self):
+        return self.cleaned_data["limit"] or 50
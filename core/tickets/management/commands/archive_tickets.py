@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.archive import BATCH_SIZE, archive_tickets, restore_tickets
+from tickets.models import ArchivedTicket
+
+
+class Command(BaseCommand):
+    help = (
+        "Move completed tickets that have not changed for --days days to "
+        "the archive table, or put archived tickets back with --restore."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days", type=int, default=settings.TICKETS_ARCHIVE_AFTER_DAYS,
+            help="Archive completed tickets not modified for this many "
+                 "days (default TICKETS_ARCHIVE_AFTER_DAYS).")
+        parser.add_argument(
+            "--batch-size", type=int, default=BATCH_SIZE,
+            help="Tickets moved per transaction.")
+        parser.add_argument(
+            "--restore", type=int, nargs="+", metavar="ID",
+            help="Move these archived tickets back instead.")
+
+    def handle(self, *args, **options):
+        if options["restore"]:
+            restored = restore_tickets(
+                ArchivedTicket.objects.filter(pk__in=options["restore"]))
+            self.stdout.write(self.style.SUCCESS(
+                f"Restored {len(restored)} tickets."))
+            return
+        if options["days"] < 0 or options["batch_size"] < 1:
+            raise CommandError(
+                "--days must be >= 0 and --batch-size at least 1.")
+        archived = 0
+        for count in archive_tickets(
+                options["days"], options["batch_size"]):
+            archived += count
+            self.stdout.write(f"Archived {archived} tickets...")
+        self.stdout.write(self.style.SUCCESS(
+            f"Archived {archived} tickets completed more than "
+            f"{options['days']} days ago."))
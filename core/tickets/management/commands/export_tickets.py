@@ -0,0 +1,46 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tickets.export import CHUNK_SIZE, FORMATS, export_queryset, iter_export
+
+
+class Command(BaseCommand):
+    help = "Export tickets as CSV or JSON lines without loading them all."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", choices=sorted(FORMATS), default="csv")
+        parser.add_argument(
+            "--status", choices=["open", "completed"],
+            help="Only export open or completed tickets.")
+        parser.add_argument(
+            "--author", help="Only export tickets by this username.")
+        parser.add_argument(
+            "--since", type=date.fromisoformat,
+            help="Only tickets raised on or after this date (YYYY-MM-DD).")
+        parser.add_argument(
+            "--until", type=date.fromisoformat,
+            help="Only tickets raised on or before this date (YYYY-MM-DD).")
+        parser.add_argument(
+            "--output", help="File to write to instead of standard output.")
+        parser.add_argument(
+            "--chunk-size", type=int, default=CHUNK_SIZE,
+            help="Rows fetched from the database per round trip.")
+
+    def handle(self, *args, **options):
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be at least 1.")
+        rows = export_queryset(
+            status=options["status"],
+            author=options["author"],
+            since=options["since"],
+            until=options["until"],
+        )
+        chunks = iter_export(rows, options["format"], options["chunk_size"])
+        if options["output"]:
+            with open(options["output"], "w", newline="") as output:
+                output.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
@@ -0,0 +1,161 @@
+import csv
+import json
+import sys
+import time
+from itertools import islice
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from tickets.models import ImportCheckpoint, Ticket
+
+
+TRUE_VALUES = {"1", "true", "t", "yes", "y"}
+FALSE_VALUES = {"", "0", "false", "f", "no", "n"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk load tickets from CSV or JSON lines, in the format written by "
+        "export_tickets."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path", help="File to import, or - to read standard input.")
+        parser.add_argument(
+            "--format", choices=["csv", "ndjson"],
+            help="Input format. Defaults to the file extension.")
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Rows per INSERT statement.")
+        parser.add_argument(
+            "--transaction-size", type=int, default=20000,
+            help="Rows committed per transaction.")
+        parser.add_argument(
+            "--checkpoint",
+            help="Record progress under this name, and resume from it if "
+                 "an earlier run with the same name stopped part way.")
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1 or options["transaction_size"] < 1:
+            raise CommandError("Batch and transaction sizes must be >= 1.")
+        fmt = options["format"] or self.guess_format(options["path"])
+        checkpoint = None
+        skip = 0
+        if options["checkpoint"]:
+            checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+                name=options["checkpoint"])
+            skip = checkpoint.rows_done
+            if skip:
+                self.stdout.write(f"Resuming after {skip} rows.")
+
+        # Usernames are resolved from memory instead of one query per row.
+        self.authors = dict(
+            get_user_model().objects.values_list("username", "pk"))
+        self.skipped = 0
+        imported = 0
+        done = skip
+        started = time.perf_counter()
+
+        stream = sys.stdin if options["path"] == "-" else open(
+            options["path"], newline="", encoding="utf-8")
+        try:
+            records = islice(self.read_records(stream, fmt), skip, None)
+            while True:
+                chunk = list(islice(records, options["transaction_size"]))
+                if not chunk:
+                    break
+                tickets = [
+                    ticket for ticket in map(self.build_ticket, chunk)
+                    if ticket is not None
+                ]
+                with transaction.atomic():
+                    Ticket.objects.bulk_create(
+                        tickets, batch_size=options["batch_size"])
+                    done += len(chunk)
+                    if checkpoint is not None:
+                        checkpoint.rows_done = done
+                        checkpoint.save(update_fields=["rows_done", "updated"])
+                imported += len(tickets)
+                self.stdout.write(
+                    f"{done} rows read, {imported} imported "
+                    f"({self.rate(imported, started):.0f} rows/s)")
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {imported} tickets, skipped {self.skipped} invalid "
+            f"rows in {time.perf_counter() - started:.1f}s "
+            f"({self.rate(imported, started):.0f} rows/s)."))
+
+    def guess_format(self, path):
+        if path.endswith((".ndjson", ".jsonl")):
+            return "ndjson"
+        if path.endswith(".csv"):
+            return "csv"
+        raise CommandError("Cannot tell the input format, pass --format.")
+
+    def read_records(self, stream, fmt):
+        if fmt == "csv":
+            yield from csv.DictReader(stream)
+            return
+        for number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                raise CommandError(f"Line {number} is not valid JSON.")
+
+    def build_ticket(self, record):
+        """Return an unsaved Ticket for ``record``, or None if it is
+        invalid or names an unknown author."""
+        if not isinstance(record, dict):
+            # A JSON line holding a list, string or number.
+            self.skipped += 1
+            return None
+        author_id = self.authors.get(record.get("author"))
+        title = record.get("title") or ""
+        body = record.get("body") or ""
+        date = self.parse_date(record.get("date"))
+        is_completed = self.parse_bool(record.get("is_completed"))
+        if (author_id is None or not title or len(title) > 255
+                or date is None or is_completed is None):
+            self.skipped += 1
+            return None
+        return Ticket(
+            title=title,
+            body=body,
+            date=date,
+            author_id=author_id,
+            is_completed=is_completed,
+        )
+
+    def parse_date(self, value):
+        if not value:
+            return timezone.now()
+        try:
+            date = parse_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if date is not None and timezone.is_naive(date):
+            date = timezone.make_aware(date)
+        return date
+
+    def parse_bool(self, value):
+        if isinstance(value, bool) or value is None:
+            return bool(value)
+        value = str(value).strip().lower()
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        return None
+
+    def rate(self, rows, started):
+        return rows / max(time.perf_counter() - started, 1e-9)
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from tickets.counters import rebuild_ticket_counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute CustomUser.num_tickets_assigned from the ticket and "
+        "archive tables.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database alias to rebuild the counters in.",
+        )
+
+    def handle(self, *args, **options):
+        updated = rebuild_ticket_counts(using=options["database"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt ticket counts for {updated} users."))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from tickets.stats import rebuild_ticket_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the dashboard's ticket stats from the ticket and archive "
+        "tables.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database alias to rebuild the stats in.",
+        )
+
+    def handle(self, *args, **options):
+        authors, days = rebuild_ticket_stats(using=options["database"])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt ticket stats for {authors} users and {days} days."))
@@ -0,0 +1,105 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Run in a fresh interpreter, so every import is timed from scratch.
+# Prints its timings as JSON; -X importtime writes the imports to stderr.
+PROBE = """
+import io, json, sys, time
+started = time.perf_counter()
+import django
+from django.utils.module_loading import import_string
+timings = {}
+application = import_string(sys.argv[1])
+timings["import application"] = time.perf_counter() - started
+if sys.argv[2] == "1":
+    from core.warmup import warm_up
+    started = time.perf_counter()
+    warm_up()
+    timings["warm_up()"] = time.perf_counter() - started
+for path in sys.argv[3:]:
+    environ = {
+        "REQUEST_METHOD": "GET", "PATH_INFO": path, "QUERY_STRING": "",
+        "SERVER_NAME": "localhost", "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1", "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(), "wsgi.errors": sys.stderr,
+    }
+    started = time.perf_counter()
+    response = application(environ, lambda status, headers: None)
+    b"".join(response)
+    response.close()
+    timings[f"first GET {path}"] = time.perf_counter() - started
+print(json.dumps(timings))
+"""
+
+
+def parse_importtime(lines):
+    """``(module, self_us, cumulative_us)`` for each ``-X importtime``
+    line."""
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        yield name.strip(), int(own), int(cumulative)
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the WSGI application in a fresh interpreter under "
+        "python -X importtime and report what its start-up and first "
+        "requests spend their time on.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--application", default=settings.WSGI_APPLICATION,
+            help="Dotted path of the WSGI application (default "
+                 "WSGI_APPLICATION).")
+        parser.add_argument(
+            "--path", action="append", dest="paths",
+            help="Time a first anonymous GET of this path; repeatable "
+                 "(default: the login and signup pages).")
+        parser.add_argument(
+            "--no-warm-up", action="store_false", dest="warm_up",
+            help="Skip core.warmup.warm_up() before the first requests.")
+        parser.add_argument(
+            "--limit", type=int, default=15,
+            help="How many packages and modules to list.")
+
+    def handle(self, *args, **options):
+        paths = options["paths"] or ["/accounts/login/", "/accounts/signup/"]
+        env = {**os.environ,
+               "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE}
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", PROBE,
+             options["application"], "1" if options["warm_up"] else "0",
+             *paths],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR)
+        if result.returncode:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        timings = json.loads(result.stdout.strip().splitlines()[-1])
+        imports = list(parse_importtime(result.stderr.splitlines()))
+
+        by_package = defaultdict(int)
+        for name, own, _ in imports:
+            by_package[name.partition(".")[0]] += own
+        total = sum(by_package.values())
+        limit = options["limit"]
+
+        self.stdout.write(f"{'step':<44}{'ms':>9}")
+        for step, seconds in timings.items():
+            self.stdout.write(f"{step:<44}{seconds * 1000:>9.1f}")
+        self.stdout.write(
+            f"\n{len(imports)} modules imported in {total / 1000:.1f} ms")
+        self.stdout.write(f"\n{'package':<44}{'ms':>9}{'share':>8}")
+        for package, own in sorted(
+                by_package.items(), key=lambda item: -item[1])[:limit]:
+            self.stdout.write(
+                f"{package:<44}{own / 1000:>9.1f}{own / total:>8.0%}")
+        self.stdout.write(f"\n{'slowest modules (self time)':<44}{'ms':>9}")
+        for name, own, _ in sorted(imports, key=lambda row: -row[1])[:limit]:
+            self.stdout.write(f"{name:<44}{own / 1000:>9.1f}")
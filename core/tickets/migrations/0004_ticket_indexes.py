@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0003_ticket_is_completed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['is_completed', '-date', '-id'], name='ticket_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['author', 'is_completed', '-date', '-id'], name='ticket_author_listing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['-date', '-id'], name='ticket_open_idx'),
+        ),
+    ]
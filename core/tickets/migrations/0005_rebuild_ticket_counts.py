@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def rebuild_ticket_counts(apps, schema_editor):
+    # Counters were never maintained before this migration, so bring them in
+    # line with the existing tickets before the model starts adjusting them.
+    Ticket = apps.get_model('tickets', 'Ticket')
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    counts = (
+        Ticket.objects.filter(author=OuterRef('pk'))
+        .order_by()
+        .values('author')
+        .annotate(total=Count('pk'))
+        .values('total')
+    )
+    User.objects.using(schema_editor.connection.alias).update(
+        num_tickets_assigned=Coalesce(Subquery(counts), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0004_ticket_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_ticket_counts, migrations.RunPython.noop),
+    ]
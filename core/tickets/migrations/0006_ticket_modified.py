@@ -0,0 +1,18 @@
+# Generated by Django 5.2.9 on 2026-10-17 21:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0005_rebuild_ticket_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='modified',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
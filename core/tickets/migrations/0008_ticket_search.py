@@ -0,0 +1,89 @@
+from django.db import migrations
+
+
+# SQLite: an external-content FTS5 table over title and body, kept in step
+# with tickets_ticket by triggers so bulk updates and deletes are covered.
+# SQLite migrations which rebuild tickets_ticket drop these triggers;
+# tickets.search.recreate_search_triggers() puts them back after migrate.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE tickets_ticket_fts USING fts5(
+        title, body,
+        content='tickets_ticket', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER tickets_ticket_fts_insert AFTER INSERT ON tickets_ticket
+    BEGIN
+        INSERT INTO tickets_ticket_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER tickets_ticket_fts_delete AFTER DELETE ON tickets_ticket
+    BEGIN
+        INSERT INTO tickets_ticket_fts(tickets_ticket_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER tickets_ticket_fts_update
+    AFTER UPDATE OF title, body ON tickets_ticket
+    BEGIN
+        INSERT INTO tickets_ticket_fts(tickets_ticket_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO tickets_ticket_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    "INSERT INTO tickets_ticket_fts(tickets_ticket_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS tickets_ticket_fts_update",
+    "DROP TRIGGER IF EXISTS tickets_ticket_fts_delete",
+    "DROP TRIGGER IF EXISTS tickets_ticket_fts_insert",
+    "DROP TABLE IF EXISTS tickets_ticket_fts",
+]
+
+# Postgres: a stored generated tsvector, weighted towards the title, so it
+# can never drift from the row, plus a GIN index over it.
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE tickets_ticket ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX tickets_ticket_search_idx
+    ON tickets_ticket USING GIN (search_vector)
+    """,
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS tickets_ticket_search_idx",
+    "ALTER TABLE tickets_ticket DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run(statements):
+    def apply(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, []):
+            schema_editor.execute(sql)
+    return apply
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0007_import_checkpoint'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            run({'sqlite': SQLITE_BACKWARD, 'postgresql': POSTGRES_BACKWARD}),
+        ),
+    ]
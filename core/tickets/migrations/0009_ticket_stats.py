@@ -0,0 +1,61 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+
+def build_ticket_stats(apps, schema_editor):
+    # Start the rollups from the existing tickets; the model keeps them up
+    # to date from here on.
+    alias = schema_editor.connection.alias
+    Ticket = apps.get_model('tickets', 'Ticket')
+    AuthorTicketStats = apps.get_model('tickets', 'AuthorTicketStats')
+    DailyTicketStats = apps.get_model('tickets', 'DailyTicketStats')
+    tickets = Ticket.objects.using(alias).order_by()
+    counts = {
+        'open': Count('pk', filter=Q(is_completed=False)),
+        'completed': Count('pk', filter=Q(is_completed=True)),
+    }
+    AuthorTicketStats.objects.using(alias).bulk_create(
+        AuthorTicketStats(author_id=row.pop('author'), **row)
+        for row in tickets.values('author').annotate(**counts))
+    DailyTicketStats.objects.using(alias).bulk_create(
+        DailyTicketStats(**row)
+        for row in tickets.values(day=TruncDate(
+            'date', tzinfo=timezone.get_default_timezone()),
+        ).annotate(**counts))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_alter_customuser_id'),
+        ('tickets', '0008_ticket_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyTicketStats',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False)),
+                ('open', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AuthorTicketStats',
+            fields=[
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ticket_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('open', models.PositiveIntegerField(default=0)),
+                ('completed', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-open', '-completed'], name='ticket_stats_busiest_idx')],
+            },
+        ),
+        migrations.RunPython(build_ticket_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-17 23:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0009_ticket_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedTicket',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(max_length=255)),
+                ('date', models.DateTimeField()),
+                ('modified', models.DateTimeField()),
+                ('archived', models.DateTimeField(default=django.utils.timezone.now)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_tickets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-date', '-id'], name='archived_listing_idx'), models.Index(fields=['author', '-date', '-id'], name='archived_author_listing_idx')],
+            },
+        ),
+    ]
@@ -1,21 +1,322 @@
 # from django.conf import settings
+from collections import Counter
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth import get_user_model
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.functions import Now
+from django.dispatch import Signal
 from django.urls import reverse
+from django.utils import timezone
+
+from .counters import adjust_ticket_counts
+from .stats import adjust_ticket_stats, count_by_key, stats_key, ticket_day
+
+# Sent by the TicketQuerySet methods that change rows without loading them
+# (and so without post_save/post_delete), with ``kind`` ("updated",
+# "completed" or "deleted"), the affected ``pks`` and ``using``. Archiving
+# sends "deleted" and restoring from the archive "created".
+tickets_changed = Signal()
+
+
+def adjust_ticket_totals(deltas, using=None):
+    """
+    Apply ``{(author_id, day, is_completed): delta}`` to both the per-user
+    ``num_tickets_assigned`` counters and the stats rollups.
+    """
+    by_author = Counter()
+    for (author_id, _, _), delta in deltas.items():
+        by_author[author_id] += delta
+    adjust_ticket_counts(by_author, using=using)
+    adjust_ticket_stats(deltas, using=using)
+
+
+class TicketQuerySet(models.QuerySet):
+    """
+    Keeps ``CustomUser.num_tickets_assigned`` and the stats rollups in step
+    with bulk changes. Each operation adjusts them from one aggregate query
+    instead of touching authors row by row.
+    """
+
+    def _removed(self):
+        """Negated ``count_by_key()``: the rows are about to go."""
+        return {key: -total for key, total in count_by_key(self).items()}
+
+    def bulk_create(self, objs, *args, **kwargs):
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            adjust_ticket_totals(
+                Counter(stats_key(ticket) for ticket in created),
+                using=self.db)
+        return created
+
+    def _changing_pks(self):
+        # Only worth a query when someone is listening.
+        if not tickets_changed.has_listeners(self.model):
+            return None
+        return list(self.values_list("pk", flat=True))
+
+    def _send_changed(self, kind, pks):
+        if pks:
+            tickets_changed.send(
+                sender=self.model, kind=kind, pks=pks, using=self.db)
+
+    def update(self, **kwargs):
+        # QuerySet.update() skips auto_now, but cached ticket cards are
+        # keyed on ``modified`` so it has to move with every change.
+        kwargs.setdefault("modified", Now())
+        pks = self._changing_pks()
+        reassigned = "author" in kwargs or "author_id" in kwargs
+        if not reassigned and "is_completed" not in kwargs:
+            updated = super().update(**kwargs)
+        else:
+            author = kwargs.get("author_id", kwargs.get("author"))
+            author_id = getattr(author, "pk", author)
+            with transaction.atomic(using=self.db):
+                before = count_by_key(self)
+                updated = super().update(**kwargs)
+                deltas = Counter()
+                for (old_author_id, day, is_completed), total in (
+                        before.items()):
+                    deltas[old_author_id, day, is_completed] -= total
+                    deltas[
+                        author_id if reassigned else old_author_id,
+                        day,
+                        kwargs.get("is_completed", is_completed),
+                    ] += total
+                adjust_ticket_totals(deltas, using=self.db)
+        completed = kwargs.get("is_completed") is True
+        self._send_changed("completed" if completed else "updated", pks)
+        return updated
+
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            removed = self._removed()
+            deleted = super().delete()
+            adjust_ticket_totals(removed, using=self.db)
+        return deleted
+
+    def complete(self):
+        return self.update(is_completed=True)
+
+    def reopen(self):
+        return self.update(is_completed=False)
+
+    def reassign(self, author):
+        return self.update(author=author)
+
+    async def acomplete(self):
+        return await sync_to_async(self.complete)()
+
+    def bulk_delete(self):
+        """
+        Delete the matching tickets with a single DELETE and return how
+        many went. Unlike delete() the rows are never loaded to send
+        post_delete, so stale cached cards are left to age out of the
+        cache; their keys include ``modified`` so they are never served.
+        """
+        if self.model._meta.related_objects:
+            # Something references tickets; let the collector cascade.
+            return self.delete()[0]
+        pks = self._changing_pks()
+        with transaction.atomic(using=self.db):
+            removed = self._removed()
+            deleted = self._raw_delete(self.db)
+            adjust_ticket_totals(removed, using=self.db)
+        self._send_changed("deleted", pks)
+        return deleted
+
+    bulk_create.alters_data = True
+    update.alters_data = True
+    delete.alters_data = True
+    delete.queryset_only = True
+    complete.alters_data = True
+    reopen.alters_data = True
+    reassign.alters_data = True
+    acomplete.alters_data = True
+    bulk_delete.alters_data = True
+    bulk_delete.queryset_only = True
+
+
+class ImportCheckpoint(models.Model):
+    """
+    How many records of an ``import_tickets`` source have been committed.
+    It is saved in the same transaction as each chunk of tickets, so a
+    resumed import neither skips nor duplicates rows.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    rows_done = models.PositiveBigIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.rows_done} rows)"
 
 
 class Ticket(models.Model):
     title = models.CharField(max_length=255)
     body = models.TextField(max_length=255)
-    date = models.DateTimeField(auto_now_add=True)
+    # A default rather than auto_now_add so imported tickets keep the date
+    # they were raised on.
+    date = models.DateTimeField(default=timezone.now, editable=False)
     author = models.ForeignKey(
         get_user_model(),
         on_delete=models.CASCADE,
     )
     is_completed = models.BooleanField(default=False)
+    modified = models.DateTimeField(auto_now=True)
+
+    objects = TicketQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Matches TicketListView.ordering so the list and its keyset
+            # pages are read straight off the index without a sort.
+            models.Index(
+                fields=["is_completed", "-date", "-id"],
+                name="ticket_listing_idx",
+            ),
+            # Owner-filtered listings (OwnerOrSuperuserQuerysetMixin).
+            models.Index(
+                fields=["author", "is_completed", "-date", "-id"],
+                name="ticket_author_listing_idx",
+            ),
+            # Open tickets only; ignored on backends without partial indexes.
+            models.Index(
+                fields=["-date", "-id"],
+                condition=models.Q(is_completed=False),
+                name="ticket_open_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    def _stored_key(self, using):
+        """
+        ``stats_key()`` of the row as stored, or None if there is none. The
+        row is locked until the end of the transaction, so two requests
+        changing the same ticket apply their deltas one after the other.
+        """
+        row = (
+            type(self)._base_manager.db_manager(using)
+            .select_for_update()
+            .filter(pk=self.pk)
+            .values_list("author_id", "date", "is_completed")
+            .first()
+        )
+        if row is None:
+            return None
+        author_id, date, is_completed = row
+        return author_id, ticket_day(date), is_completed
+
+    def _saved_key(self, stored, update_fields):
+        """``stats_key()`` of the row once ``update_fields`` (all fields
+        when None) have been written over ``stored``."""
+        if update_fields is None:
+            return stats_key(self)
+        author_id, day, is_completed = stored
+        if {"author", "author_id"} & set(update_fields):
+            author_id = self.author_id
+        if "date" in update_fields:
+            day = ticket_day(self.date)
+        if "is_completed" in update_fields:
+            is_completed = self.is_completed
+        return author_id, day, is_completed
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "modified"}
+        using = kwargs.get("using") or router.db_for_write(
+            type(self), instance=self)
+        with transaction.atomic(using=using):
+            stored = None if adding else self._stored_key(using)
+            super().save(*args, **kwargs)
+            if stored is None:
+                adjust_ticket_totals({stats_key(self): 1}, using=using)
+            else:
+                key = self._saved_key(stored, kwargs.get("update_fields"))
+                if key != stored:
+                    adjust_ticket_totals(
+                        {stored: -1, key: 1}, using=using)
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(
+            type(self), instance=self)
+        with transaction.atomic(using=using):
+            stored = self._stored_key(using)
+            deleted = super().delete(*args, **kwargs)
+            if stored is not None:
+                adjust_ticket_totals({stored: -1}, using=using)
+        return deleted
+
     def get_absolute_url(self):
         return reverse('ticket_detail', args=[str(self.id)])
+
+
+class ArchivedTicket(models.Model):
+    """
+    A completed ticket moved out of ``Ticket`` by ``archive_tickets``. It
+    keeps its id, so restoring it puts the same ticket back. Archived
+    tickets still count in ``num_tickets_assigned`` and the stats rollups.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=255)
+    body = models.TextField(max_length=255)
+    date = models.DateTimeField()
+    author = models.ForeignKey(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        related_name="archived_tickets",
+    )
+    modified = models.DateTimeField()
+    archived = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Matches ArchivedTicketListView.ordering, with and without the
+            # owner filter.
+            models.Index(
+                fields=["-date", "-id"], name="archived_listing_idx"),
+            models.Index(
+                fields=["author", "-date", "-id"],
+                name="archived_author_listing_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+class AuthorTicketStats(models.Model):
+    """Open and completed tickets assigned to one user."""
+    author = models.OneToOneField(
+        get_user_model(),
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="ticket_stats",
+    )
+    open = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # The dashboard's busiest-authors table.
+            models.Index(
+                fields=["-open", "-completed"],
+                name="ticket_stats_busiest_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.author}: {self.open} open, {self.completed} completed"
+
+
+class DailyTicketStats(models.Model):
+    """Tickets raised on one day that are still open or now completed."""
+    day = models.DateField(primary_key=True)
+    open = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day}: {self.open} open, {self.completed} completed"
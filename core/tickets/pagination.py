@@ -0,0 +1,187 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.http import Http404
+
+
+def _encode_value(value):
+    # DjangoJSONEncoder truncates datetimes to milliseconds, which would
+    # make the cursor skip or repeat rows sharing a millisecond.
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class CursorPage:
+    """A single page of results returned by ``KeysetPaginator``."""
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self._has_next and bool(self.object_list)
+
+    def has_previous(self):
+        return self._has_previous and bool(self.object_list)
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if not self.has_next():
+            return None
+        return self.paginator.encode_cursor(self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if not self.has_previous():
+            return None
+        return self.paginator.encode_cursor(self.object_list[0])
+
+
+class KeysetPaginator:
+    """
+    Paginate a queryset by seeking past the last row seen instead of using
+    OFFSET, so every page costs the same and no COUNT(*) is needed.
+
+    ``ordering`` must be a total order, i.e. end with a unique field such
+    as ``-id``. Cursors are opaque, URL-safe tokens holding the ordering
+    values of the first or last row on a page.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = list(ordering)
+        self.keys = [
+            (name.lstrip("-"), name.startswith("-")) for name in self.ordering
+        ]
+
+    def encode_cursor(self, row):
+        values = [self._value(row, name) for name, _ in self.keys]
+        data = json.dumps(values, default=_encode_value, separators=(",", ":"))
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            if not isinstance(values, list) or len(values) != len(self.keys):
+                raise ValueError
+            return [
+                self._to_python(name, value)
+                for (name, _), value in zip(self.keys, values)
+            ]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            raise Http404("Invalid cursor.")
+
+    def page_querysets(self, after=None, before=None):
+        """
+        Yield the ordered querysets ``page()`` reads from, in turn, until it
+        has a full page. Without a cursor that is the whole queryset;
+        after a cursor it is one queryset per ``_seek`` branch.
+        """
+        reverse = bool(before)
+        ordering = self._reversed_ordering() if reverse else self.ordering
+        queryset = self.queryset.order_by(*ordering)
+        cursor = before or after
+        if not cursor:
+            yield queryset
+            return
+        values = self.decode_cursor(cursor)
+        for condition in self._seek(values, reverse):
+            yield queryset.filter(condition)
+
+    def page(self, after=None, before=None):
+        """Return the page following ``after``, preceding ``before``, or the
+        first page when neither cursor is given."""
+        # Fetch one extra row to find out whether there is another page.
+        limit = self.per_page + 1
+        rows = []
+        for queryset in self.page_querysets(after=after, before=before):
+            rows.extend(queryset[:limit - len(rows)])
+            if len(rows) == limit:
+                break
+        return self._make_page(rows, after, before)
+
+    async def apage(self, after=None, before=None):
+        """Asynchronous version of ``page()``."""
+        limit = self.per_page + 1
+        rows = []
+        for queryset in self.page_querysets(after=after, before=before):
+            async for row in queryset[:limit - len(rows)]:
+                rows.append(row)
+            if len(rows) == limit:
+                break
+        return self._make_page(rows, after, before)
+
+    def _make_page(self, rows, after, before):
+        reverse = bool(before)
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if reverse:
+            rows.reverse()
+            return CursorPage(rows, self, True, has_more)
+        return CursorPage(rows, self, has_more, bool(after))
+
+    def _seek(self, values, reverse):
+        """
+        Return disjoint conditions that, in order, select every row past
+        the cursor values.
+
+        A single ``a > x OR (a = x AND (b < y OR ...))`` filter handles
+        mixed ASC/DESC orderings but forces the database to scan the index
+        from the start. Instead each condition fixes a prefix of the keys
+        and bounds the next one, so it is answered by one index range
+        scan. The last two keys share a condition, which means a page is
+        normally one query and takes a second only when it crosses into
+        a new value of the leading keys (e.g. from open to completed).
+        """
+        names = [name for name, _ in self.keys]
+        lookups = ["lt" if desc != reverse else "gt" for _, desc in self.keys]
+
+        def equal(count):
+            return Q(**{names[i]: values[i] for i in range(count)})
+
+        def past(i, inclusive=False):
+            lookup = lookups[i] + ("e" if inclusive else "")
+            return Q(**{f"{names[i]}__{lookup}": values[i]})
+
+        if len(names) == 1:
+            return [past(0)]
+        a, b = len(names) - 2, len(names) - 1
+        conditions = [
+            equal(a) & past(a, inclusive=True)
+            & (past(a) | (equal(a + 1) & past(b)))
+        ]
+        for i in range(a - 1, -1, -1):
+            conditions.append(equal(i) & past(i))
+        return conditions
+
+    def _reversed_ordering(self):
+        return [name if desc else f"-{name}" for name, desc in self.keys]
+
+    def _value(self, row, name):
+        if isinstance(row, dict):
+            return row[name]
+        return getattr(row, name)
+
+    def _to_python(self, name, value):
+        try:
+            field = self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return value
+        return field.to_python(value)
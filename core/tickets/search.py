@@ -0,0 +1,162 @@
+import re
+
+from django.db import connections
+from django.db.models import FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+# Lower ranks are better matches on every backend, so results are ordered
+# by ascending ``rank`` (SQLite's bm25() already works that way).
+ORDERING = ["rank", "-id"]
+
+# Only the newest this many matching tickets are ranked. A word found in
+# most tickets would otherwise have every one of them scored and sorted
+# to show the first page.
+MAX_RANKED = 1000
+
+# SQLite keeps the FTS5 table in step with tickets_ticket through these
+# triggers. Migrations that remake tickets_ticket drop them, so they are
+# recreated after every migrate (see ``recreate_search_triggers()``).
+SQLITE_TRIGGERS = {
+    "tickets_ticket_fts_insert": """
+    CREATE TRIGGER IF NOT EXISTS tickets_ticket_fts_insert
+    AFTER INSERT ON tickets_ticket
+    BEGIN
+        INSERT INTO tickets_ticket_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    "tickets_ticket_fts_delete": """
+    CREATE TRIGGER IF NOT EXISTS tickets_ticket_fts_delete
+    AFTER DELETE ON tickets_ticket
+    BEGIN
+        INSERT INTO tickets_ticket_fts(tickets_ticket_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    "tickets_ticket_fts_update": """
+    CREATE TRIGGER IF NOT EXISTS tickets_ticket_fts_update
+    AFTER UPDATE OF title, body ON tickets_ticket
+    BEGIN
+        INSERT INTO tickets_ticket_fts(tickets_ticket_fts, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO tickets_ticket_fts(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+}
+
+_WORD = re.compile(r"\w+")
+
+
+def _fts5_query(text):
+    # Quote each word so user input can never be read as FTS5 syntax
+    # (NEAR, column filters, stray quotes...). Words are ANDed together.
+    return " ".join(f'"{word}"' for word in _WORD.findall(text))
+
+
+def _sqlite(queryset, text):
+    # Both subqueries stop after MAX_RANKED hits in rowid order, so FTS5
+    # only scores those. The rank one does not depend on the ticket, so
+    # SQLite fills it in once and looks each ticket up in it.
+    table = queryset.model._meta.db_table
+    hits = (
+        "SELECT rowid, rank FROM tickets_ticket_fts "
+        "WHERE tickets_ticket_fts MATCH %s ORDER BY rowid DESC LIMIT %s"
+    )
+    params = (_fts5_query(text), MAX_RANKED)
+    rank = RawSQL(
+        f'SELECT hits.rank FROM ({hits}) AS hits '
+        f'WHERE hits.rowid = "{table}"."id"',
+        params,
+        output_field=FloatField(),
+    )
+    return queryset.filter(
+        id__in=RawSQL(f"SELECT rowid FROM ({hits}) AS hits", params),
+    ).annotate(rank=rank)
+
+
+def _postgresql(queryset, text):
+    tsquery = "websearch_to_tsquery('english', %s)"
+    table = queryset.model._meta.db_table
+    vector = f'"{table}"."search_vector"'
+    candidates = RawSQL(
+        f'SELECT "id" FROM "{table}" WHERE "search_vector" @@ {tsquery} '
+        f'ORDER BY "id" DESC LIMIT %s',
+        (text, MAX_RANKED),
+    )
+    rank = RawSQL(
+        f"-ts_rank_cd({vector}, {tsquery})",
+        (text,),
+        output_field=FloatField(),
+    )
+    return queryset.filter(id__in=candidates).annotate(rank=rank)
+
+
+def _fallback(queryset, text):
+    condition = Q()
+    for word in _WORD.findall(text):
+        condition &= Q(title__icontains=word) | Q(body__icontains=word)
+    return queryset.filter(condition).annotate(
+        rank=Value(0.0, output_field=FloatField()))
+
+
+def search_tickets(queryset, text):
+    """
+    Filter ``queryset`` to tickets whose title or body match ``text`` and
+    annotate each with a ``rank``; order by ``ORDERING`` for best first.
+
+    Uses the FTS5 index on SQLite and the ``search_vector`` GIN index on
+    PostgreSQL (both created by migration 0008), ranking the newest
+    ``MAX_RANKED`` matches. Other backends fall back to an unranked
+    ``icontains`` scan.
+    """
+    if not _WORD.search(text):
+        # Nothing searchable, e.g. only punctuation.
+        return queryset.annotate(
+            rank=Value(0.0, output_field=FloatField())).none()
+    search = {
+        "sqlite": _sqlite,
+        "postgresql": _postgresql,
+    }.get(connections[queryset.db].vendor, _fallback)
+    return search(queryset, text)
+
+
+def optimize_search_index(using="default"):
+    """
+    Merge the search index after many rows have gone at once. SQLite's FTS5
+    table keeps a marker for each deleted row until its segments are
+    merged; PostgreSQL's GIN index is cleaned up by autovacuum.
+    """
+    connection = connections[using]
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO tickets_ticket_fts(tickets_ticket_fts) "
+                "VALUES ('optimize')")
+
+
+def recreate_search_triggers(using="default", **kwargs):
+    """
+    ``post_migrate`` receiver: put back any of the SQLITE_TRIGGERS that a
+    migration dropped, then rebuild the index, which missed every write
+    made without them.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, type FROM sqlite_master "
+            "WHERE name IN (%s, %s, %s, %s)",
+            ["tickets_ticket_fts", *SQLITE_TRIGGERS])
+        existing = dict(cursor.fetchall())
+        if "tickets_ticket_fts" not in existing:
+            # Migration 0008 has not run (yet) on this database.
+            return
+        missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+        for name in missing:
+            cursor.execute(SQLITE_TRIGGERS[name])
+        if missing:
+            cursor.execute(
+                "INSERT INTO tickets_ticket_fts(tickets_ticket_fts) "
+                "VALUES ('rebuild')")
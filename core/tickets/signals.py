@@ -0,0 +1,50 @@
+from collections import Counter
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.db.models.signals import post_delete, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cards import invalidate_ticket_cards
+from .models import ArchivedTicket, Ticket
+from .stats import adjust_ticket_stats, count_by_key
+
+
+@receiver(pre_save, sender=Ticket)
+def invalidate_cards_on_save(sender, instance, raw=False, **kwargs):
+    # ``modified`` still holds the stored version here; auto_now only
+    # replaces it once the row is written.
+    modified = instance.__dict__.get("modified")
+    if not raw and instance.pk and modified:
+        invalidate_ticket_cards(instance.pk, modified)
+
+
+@receiver(post_delete, sender=Ticket)
+def invalidate_cards_on_delete(sender, instance, **kwargs):
+    modified = instance.__dict__.get("modified")
+    if modified:
+        invalidate_ticket_cards(instance.pk, modified)
+
+
+@receiver(pre_delete, sender=get_user_model())
+def remove_user_tickets_from_stats(sender, instance, using, **kwargs):
+    # The collector cascades to the user's tickets and archived tickets
+    # without going through Ticket.delete() or TicketQuerySet.delete(), so
+    # take them off the daily rollup here, in the same transaction. Their
+    # AuthorTicketStats row is deleted with the user.
+    removed = Counter()
+    tickets = Ticket._base_manager.using(using).filter(author=instance)
+    for key, total in count_by_key(tickets).items():
+        removed[key] -= total
+    archived = (
+        ArchivedTicket._base_manager.using(using).filter(author=instance)
+        .order_by()
+        .values_list(TruncDate(
+            "date", tzinfo=timezone.get_default_timezone()))
+        .annotate(total=Count("pk"))
+    )
+    for day, total in archived:
+        removed[instance.pk, day, True] -= total
+    adjust_ticket_stats(removed, using=using)
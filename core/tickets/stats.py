@@ -0,0 +1,122 @@
+"""
+Rollups of open and completed tickets per author and per day raised.
+
+Ticket writes report how many tickets entered or left each
+``(author_id, day, is_completed)`` bucket and ``adjust_ticket_stats``
+applies the difference to ``AuthorTicketStats`` and ``DailyTicketStats``
+in the same transaction, so the dashboard reads a few small rows instead
+of grouping the whole ticket table. ``rebuild_ticket_stats`` recomputes
+them from scratch.
+"""
+
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest, TruncDate
+from django.utils import timezone
+
+
+def ticket_day(date):
+    """The day a ticket raised at ``date`` is counted under."""
+    return timezone.localtime(date, timezone.get_default_timezone()).date()
+
+
+def stats_key(ticket):
+    return (ticket.author_id, ticket_day(ticket.date), ticket.is_completed)
+
+
+def count_by_key(queryset):
+    """``Counter({(author_id, day, is_completed): tickets})`` for
+    ``queryset`` in one aggregate query."""
+    rows = (
+        queryset.order_by()
+        .values_list(
+            "author",
+            TruncDate("date", tzinfo=timezone.get_default_timezone()),
+            "is_completed",
+        )
+        .annotate(total=Count("pk"))
+    )
+    return Counter({
+        (author_id, day, is_completed): total
+        for author_id, day, is_completed, total in rows
+    })
+
+
+def _change(deltas, index):
+    return Case(
+        *[When(pk=pk, then=Value(delta[index]))
+          for pk, delta in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+
+
+def _apply(model, deltas, using):
+    deltas = {pk: delta for pk, delta in deltas.items() if any(delta)}
+    if not deltas:
+        return
+    manager = model._default_manager.db_manager(using)
+    # Make sure every row exists, then move them all in one UPDATE; the
+    # arithmetic happens in the database so concurrent writers add up.
+    manager.bulk_create(
+        [model(pk=pk) for pk in deltas], ignore_conflicts=True)
+    manager.filter(pk__in=deltas).update(
+        open=Greatest(F("open") + _change(deltas, 0), 0),
+        completed=Greatest(F("completed") + _change(deltas, 1), 0),
+    )
+
+
+def adjust_ticket_stats(deltas, using=None):
+    """Apply ``{(author_id, day, is_completed): delta}`` to the rollups with
+    at most two queries per table."""
+    from .models import AuthorTicketStats, DailyTicketStats
+
+    by_author = defaultdict(lambda: [0, 0])
+    by_day = defaultdict(lambda: [0, 0])
+    for (author_id, day, is_completed), delta in deltas.items():
+        by_author[author_id][is_completed] += delta
+        by_day[day][is_completed] += delta
+    _apply(AuthorTicketStats, by_author, using)
+    _apply(DailyTicketStats, by_day, using)
+
+
+def rebuild_ticket_stats(using=None):
+    """Recompute both rollups from the ticket and archive tables and return
+    how many author and day rows were written."""
+    from .models import (
+        ArchivedTicket, AuthorTicketStats, DailyTicketStats, Ticket)
+
+    tickets = Ticket.objects.using(using).order_by()
+    archived = ArchivedTicket.objects.using(using).order_by()
+    counts = {
+        "open": Count("pk", filter=Q(is_completed=False)),
+        "completed": Count("pk", filter=Q(is_completed=True)),
+    }
+    day = TruncDate("date", tzinfo=timezone.get_default_timezone())
+    by_author = defaultdict(lambda: [0, 0])
+    by_day = defaultdict(lambda: [0, 0])
+    with transaction.atomic(using=using):
+        for row in tickets.values("author").annotate(**counts):
+            by_author[row["author"]] = [row["open"], row["completed"]]
+        for row in tickets.values(day=day).annotate(**counts):
+            by_day[row["day"]] = [row["open"], row["completed"]]
+        # Every archived ticket is completed.
+        for author_id, total in archived.values_list("author").annotate(
+                Count("pk")):
+            by_author[author_id][1] += total
+        for archived_day, total in archived.values_list(day).annotate(
+                Count("pk")):
+            by_day[archived_day][1] += total
+
+        AuthorTicketStats.objects.using(using).all().delete()
+        DailyTicketStats.objects.using(using).all().delete()
+        AuthorTicketStats.objects.using(using).bulk_create(
+            AuthorTicketStats(
+                author_id=pk, open=totals[0], completed=totals[1])
+            for pk, totals in by_author.items())
+        DailyTicketStats.objects.using(using).bulk_create(
+            DailyTicketStats(day=pk, open=totals[0], completed=totals[1])
+            for pk, totals in by_day.items())
+    return len(by_author), len(by_day)
@@ -1,24 +1,67 @@
+import asyncio
+import csv
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
 from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import caches
+from django.core.management import CommandError, call_command
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection, transaction
+from django.http import Http404, HttpResponse
+from django.templatetags.static import static
+from django.test import AsyncRequestFactory, Client, TestCase
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 
-from .models import Ticket
+from benchmarks import factories, suite
+from core import admission, metrics
+from core.cache import LRUFileBasedCache
+from core.profiling import TemplateProfiler
+from core.settings import ADMISSION_CONTROL as DEFAULT_ADMISSION_CONTROL
+from core.warmup import warm_up
+from core.testing import QueryBudgetMixin
+
+from . import api, cards
+from .archive import archive_tickets, restore_tickets
+from .counters import rebuild_ticket_counts
+from .events import RESYNC, TicketEventBroker, event_stream
+from .export import export_queryset, iter_export
+from .management.commands.startup_profile import parse_importtime
+from .models import ArchivedTicket, AuthorTicketStats, DailyTicketStats
+from .models import ImportCheckpoint
+from .models import Ticket, TicketQuerySet, tickets_changed
+from .stats import rebuild_ticket_stats, ticket_day
+from .views import AsyncTicketCreateView, AsyncTicketDeleteView
+from .views import AsyncTicketListView, TicketListView, aticket_complete
 
 
 class TestTicketModel(TestCase):
-    def setUp(self):
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             username="testuser",
             email="testuser@example.com",
             password="pass12345!",
         )
-        self.ticket = Ticket.objects.create(
+        cls.ticket = Ticket.objects.create(
             title="Printer not working",
             body="The office printer is showing an error code.",
-            author=self.user,
+            author=cls.user,
         )
 
     def test_ticket_str_returns_title(self):
@@ -26,33 +69,34 @@ class TestTicketModel(TestCase):
 
 
 class TestTicketViews(TestCase):
-    def setUp(self):
-        self.user = get_user_model().objects.create_user(
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
             username="testuser",
             email="testuser@example.com",
             password="pass12345!",
         )
-        self.other_user = get_user_model().objects.create_user(
+        cls.other_user = get_user_model().objects.create_user(
             username="otheruser",
             email="otheruser@example.com",
             password="pass12345!",
         )
-        self.superuser = get_user_model().objects.create_superuser(
+        cls.superuser = get_user_model().objects.create_superuser(
             username="admin",
             email="admin@example.com",
             password="pass12345!",
         )
 
-        self.ticket = Ticket.objects.create(
+        cls.ticket = Ticket.objects.create(
             title="Cannot log in",
             body="User cannot log into the portal.",
-            author=self.user,
+            author=cls.user,
             is_completed=False,
         )
-        self.other_ticket = Ticket.objects.create(
+        cls.other_ticket = Ticket.objects.create(
             title="VPN drops frequently",
             body="VPN disconnects multiple times per day.",
-            author=self.other_user,
+            author=cls.other_user,
             is_completed=False,
         )
 
@@ -233,3 +277,1808 @@ class TestTicketViews(TestCase):
 
         self.ticket.refresh_from_db()
         self.assertTrue(self.ticket.is_completed)
+
+
+class TestTicketListQueryBudget(QueryBudgetMixin, TestCase):
+    # Session, user and one query for the page of tickets with authors.
+    LIST_QUERY_BUDGET = 3
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        for i in range(20):
+            author = User.objects.create(
+                username=f"author{i}",
+                first_name="Author",
+                last_name=str(i),
+            )
+            Ticket.objects.create(
+                title=f"Ticket {i}",
+                body="Ticket with its own author.",
+                author=author,
+            )
+
+    def setUp(self):
+        self.client.login(username="testuser", password="pass12345!")
+
+    def test_ticket_list_stays_within_query_budget(self):
+        with self.assertMaxQueries(self.LIST_QUERY_BUDGET):
+            response = self.client.get(reverse("ticket_list"))
+        self.assertContains(response, "Author 7 (author7)")
+
+    def test_query_budget_fails_when_exceeded(self):
+        with self.assertRaises(AssertionError):
+            with self.assertMaxQueries(1):
+                list(Ticket.objects.all())
+                list(get_user_model().objects.all())
+
+
+class TestTicketListPagination(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        now = timezone.now()
+        cls.tickets = [
+            Ticket.objects.create(
+                title=f"Ticket {i}",
+                body="Paged ticket.",
+                author=cls.user,
+                is_completed=i % 4 == 0,
+            )
+            for i in range(12)
+        ]
+        # Give several tickets the same date so the id tiebreaker is used.
+        for i, ticket in enumerate(cls.tickets):
+            Ticket.objects.filter(pk=ticket.pk).update(
+                date=now - timedelta(hours=i // 3))
+
+    def setUp(self):
+        self.client.login(username="testuser", password="pass12345!")
+
+        patcher = mock.patch.object(TicketListView, "paginate_by", 5)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_page(self, **params):
+        response = self.client.get(reverse("ticket_list"), params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_pages_cover_all_tickets_in_order_without_overlap(self):
+        expected = list(Ticket.objects.order_by(
+            "is_completed", "-date", "-id").values_list("pk", flat=True))
+
+        seen = []
+        params = {}
+        while True:
+            response = self.get_page(**params)
+            page = response.context["page_obj"]
+            seen.extend(t.pk for t in response.context["object_list"])
+            if not page.has_next():
+                break
+            params = {"after": page.next_cursor}
+
+        self.assertEqual(seen, expected)
+
+    def test_previous_cursor_returns_preceding_page(self):
+        first = self.get_page().context["page_obj"]
+        second = self.get_page(after=first.next_cursor).context["page_obj"]
+        self.assertTrue(second.has_previous())
+
+        back = self.get_page(before=second.previous_cursor)
+        self.assertEqual(
+            [t.pk for t in back.context["object_list"]],
+            [t.pk for t in first.object_list],
+        )
+        self.assertFalse(back.context["page_obj"].has_previous())
+
+    def test_list_does_not_count_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get_page()
+        self.assertFalse(
+            any("COUNT(" in q["sql"] for q in queries.captured_queries))
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(reverse("ticket_list"), {"after": "junk"})
+        self.assertEqual(response.status_code, 404)
+
+
+class TestTicketSearch(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        cls.printer = Ticket.objects.create(
+            title="Printer jammed",
+            body="The printer on floor two is jammed again.",
+            author=cls.user,
+        )
+        cls.vpn = Ticket.objects.create(
+            title="VPN drops",
+            body="Connection drops near the printer room.",
+            author=cls.user,
+        )
+        cls.other = Ticket.objects.create(
+            title="New laptop",
+            body="Please order a laptop for the new starter.",
+            author=cls.user,
+        )
+
+    def setUp(self):
+        self.client.login(username="testuser", password="pass12345!")
+
+    def search(self, q, **params):
+        response = self.client.get(reverse("ticket_list"), {"q": q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [t.pk for t in response.context["object_list"]]
+
+    def test_matches_title_and_body_ranked_best_first(self):
+        self.assertEqual(
+            self.search("printer"), [self.printer.pk, self.vpn.pk])
+
+    def test_matches_word_stems(self):
+        self.assertEqual(self.search("printers jamming"), [self.printer.pk])
+
+    def test_query_syntax_in_input_is_treated_as_words(self):
+        self.assertEqual(self.search('laptop" OR NEAR(vpn'), [])
+        self.assertEqual(self.search('"laptop*'), [self.other.pk])
+        self.assertEqual(self.search("!!!"), [])
+
+    def test_index_follows_edits_and_deletes(self):
+        self.printer.title = "Scanner jammed"
+        self.printer.save()
+        self.assertEqual(self.search("scanner"), [self.printer.pk])
+
+        self.vpn.delete()
+        Ticket.objects.filter(pk=self.other.pk).bulk_delete()
+        self.assertEqual(self.search("printer"), [self.printer.pk])
+        self.assertEqual(self.search("laptop"), [])
+
+    def test_results_are_paginated_by_rank(self):
+        for i in range(5):
+            Ticket.objects.create(
+                title=f"Printer {i}", body="Toner low.", author=self.user)
+        expected = self.search("printer")
+        self.assertEqual(len(expected), 7)
+
+        with mock.patch.object(TicketListView, "paginate_by", 3):
+            seen, params = [], {}
+            while True:
+                response = self.client.get(
+                    reverse("ticket_list"), {"q": "printer", **params})
+                page = response.context["page_obj"]
+                seen.extend(t.pk for t in page.object_list)
+                if not page.has_next():
+                    break
+                self.assertContains(response, "q=printer&amp;after=")
+                params = {"after": page.next_cursor}
+
+        self.assertEqual(seen, expected)
+
+    def test_only_the_newest_matches_are_ranked(self):
+        newest = Ticket.objects.create(
+            title="Printer offline", body="", author=self.user)
+        with mock.patch("tickets.search.MAX_RANKED", 2):
+            self.assertEqual(
+                sorted(self.search("printer")), [self.vpn.pk, newest.pk])
+
+    def test_migrate_puts_back_dropped_triggers(self):
+        # As a migration that remakes tickets_ticket on SQLite would.
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER tickets_ticket_fts_insert")
+            cursor.execute("DROP TRIGGER tickets_ticket_fts_update")
+        missed = Ticket.objects.create(
+            title="Stapler empty", body="", author=self.user)
+        self.assertEqual(self.search("stapler"), [])
+
+        emit_post_migrate_signal(0, False, connection.alias)
+
+        self.assertEqual(self.search("stapler"), [missed.pk])
+        added = Ticket.objects.create(
+            title="Projector dim", body="", author=self.user)
+        self.assertEqual(self.search("projector"), [added.pk])
+
+
+class TestTicketAssignmentCounts(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        cls.other_user = User.objects.create_user(
+            username="otheruser",
+            email="otheruser@example.com",
+            password="pass12345!",
+        )
+
+    def assertCounts(self, user_count, other_count):
+        self.user.refresh_from_db()
+        self.other_user.refresh_from_db()
+        self.assertEqual(self.user.num_tickets_assigned, user_count)
+        self.assertEqual(self.other_user.num_tickets_assigned, other_count)
+
+    def make_tickets(self, author, count):
+        return [
+            Ticket.objects.create(title=f"T{i}", body="Body", author=author)
+            for i in range(count)
+        ]
+
+    def test_create_and_delete_adjust_count(self):
+        ticket, _ = self.make_tickets(self.user, 2)
+        self.assertCounts(2, 0)
+
+        ticket.delete()
+        self.assertCounts(1, 0)
+
+    def test_reassigning_a_ticket_moves_the_count(self):
+        ticket = self.make_tickets(self.user, 1)[0]
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        ticket.author = self.other_user
+        ticket.save()
+        self.assertCounts(0, 1)
+
+        ticket.title = "Renamed"
+        ticket.save()
+        self.assertCounts(0, 1)
+
+    def assertStats(self, user, open_count, completed):
+        stats = AuthorTicketStats.objects.get(author=user)
+        self.assertEqual((stats.open, stats.completed),
+                         (open_count, completed))
+
+    def test_delete_counts_the_stored_row_not_unsaved_changes(self):
+        ticket = Ticket.objects.get(pk=self.make_tickets(self.user, 1)[0].pk)
+        ticket.is_completed = True
+        ticket.author = self.other_user
+
+        ticket.delete()
+
+        self.assertCounts(0, 0)
+        self.assertStats(self.user, 0, 0)
+
+    def test_save_only_counts_the_fields_it_writes(self):
+        ticket = Ticket.objects.get(pk=self.make_tickets(self.user, 1)[0].pk)
+        ticket.is_completed = True
+        ticket.author = self.other_user
+
+        ticket.save(update_fields=["title"])
+        self.assertCounts(1, 0)
+        self.assertStats(self.user, 1, 0)
+
+        ticket.save(update_fields=["is_completed"])
+        self.assertCounts(1, 0)
+        self.assertStats(self.user, 0, 1)
+
+    def test_stale_copies_do_not_apply_a_change_twice(self):
+        pk = self.make_tickets(self.user, 1)[0].pk
+        first, second = Ticket.objects.get(pk=pk), Ticket.objects.get(pk=pk)
+        for ticket in (first, second):
+            ticket.is_completed = True
+            ticket.author = self.other_user
+            ticket.save()
+
+        self.assertCounts(0, 1)
+        self.assertStats(self.other_user, 0, 1)
+        self.assertStats(self.user, 0, 0)
+
+    def test_bulk_create_update_and_delete_adjust_counts(self):
+        Ticket.objects.bulk_create(
+            Ticket(title=f"T{i}", body="Body", author=self.user)
+            for i in range(5)
+        )
+        self.assertCounts(5, 0)
+
+        # Savepoint, counts per bucket, the UPDATE, counters, author stats
+        # (rows ensured, then one UPDATE), release. Reassigning leaves the
+        # daily stats alone.
+        with self.assertNumQueries(7):
+            moved = Ticket.objects.filter(
+                title__in=["T0", "T1"]).update(author=self.other_user)
+        self.assertEqual(moved, 2)
+        self.assertCounts(3, 2)
+
+        Ticket.objects.filter(author=self.user).delete()
+        self.assertCounts(0, 2)
+
+    def test_rebuild_ticket_counts_fixes_drift(self):
+        self.make_tickets(self.user, 3)
+        get_user_model().objects.update(num_tickets_assigned=7)
+
+        with self.assertNumQueries(1):
+            rebuild_ticket_counts()
+        self.assertCounts(3, 0)
+
+    def test_rebuild_ticket_counts_command(self):
+        self.make_tickets(self.other_user, 2)
+        get_user_model().objects.update(num_tickets_assigned=0)
+
+        call_command("rebuild_ticket_counts", stdout=StringIO())
+        self.assertCounts(0, 2)
+
+
+class TestTicketStats(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser", password="pass12345!")
+        cls.other_user = User.objects.create_user(
+            username="otheruser", password="pass12345!")
+        cls.admin = User.objects.create_superuser(
+            username="admin", password="pass12345!")
+
+    def snapshot(self):
+        return (
+            sorted(AuthorTicketStats.objects.exclude(
+                open=0, completed=0).values_list(
+                    "author", "open", "completed")),
+            sorted(DailyTicketStats.objects.exclude(
+                open=0, completed=0).values_list(
+                    "day", "open", "completed")),
+        )
+
+    def assertMatchesRebuild(self):
+        maintained = self.snapshot()
+        rebuild_ticket_stats()
+        self.assertEqual(maintained, self.snapshot())
+        return maintained
+
+    def test_writes_keep_stats_in_step(self):
+        last_week = timezone.now() - timedelta(days=7)
+        ticket = Ticket.objects.create(
+            title="Old", body="B", author=self.user, date=last_week)
+        Ticket.objects.bulk_create(
+            Ticket(title=f"T{i}", body="B", author=self.user)
+            for i in range(4))
+        self.assertMatchesRebuild()
+
+        ticket.is_completed = True
+        ticket.save()
+        Ticket.objects.filter(title__in=["T0", "T1"]).complete()
+        Ticket.objects.filter(title="T0").reopen()
+        Ticket.objects.filter(title="T2").reassign(self.other_user)
+        authors, days = self.assertMatchesRebuild()
+        self.assertEqual(authors, [
+            (self.user.pk, 2, 2), (self.other_user.pk, 1, 0)])
+        self.assertIn((ticket_day(last_week), 0, 1), days)
+
+        Ticket.objects.get(title="T1").delete()
+        Ticket.objects.filter(title="T3").bulk_delete()
+        Ticket.objects.filter(author=self.other_user).delete()
+        self.assertEqual(self.assertMatchesRebuild()[0], [
+            (self.user.pk, 1, 1)])
+
+    def test_deleting_a_user_takes_their_tickets_off_the_rollups(self):
+        Ticket.objects.bulk_create(
+            Ticket(title=f"T{i}", body="B", author=author)
+            for i, author in enumerate(
+                [self.user, self.user, self.other_user]))
+        Ticket.objects.filter(title="T0").complete()
+        sum(archive_tickets(days=-1))
+        self.assertEqual(ArchivedTicket.objects.count(), 1)
+
+        self.user.delete()
+
+        self.assertEqual(self.assertMatchesRebuild()[1], [
+            (ticket_day(timezone.now()), 1, 0)])
+
+    def test_rebuild_ticket_stats_command(self):
+        Ticket.objects.create(title="T", body="B", author=self.user)
+        AuthorTicketStats.objects.update(open=9)
+
+        out = StringIO()
+        call_command("rebuild_ticket_stats", stdout=out)
+
+        self.assertEqual(self.snapshot()[0], [(self.user.pk, 1, 0)])
+        self.assertIn("for 1 users and 1 days", out.getvalue())
+
+    def test_dashboard_reads_only_the_rollups(self):
+        Ticket.objects.bulk_create(
+            Ticket(title=f"T{i}", body="B", author=self.user,
+                   is_completed=i % 2 == 0)
+            for i in range(5))
+        self.client.login(username="admin", password="pass12345!")
+
+        # Session, user, totals, busiest authors, recent days.
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse("ticket_dashboard"))
+
+        self.assertEqual(response.context["totals"],
+                         {"open": 2, "completed": 3})
+        self.assertEqual(
+            [stats.author for stats in response.context["author_stats"]],
+            [self.user])
+        today = response.context["daily_stats"][0]
+        self.assertEqual((today.open, today.completed), (2, 3))
+        self.assertEqual(len(response.context["daily_stats"]), 30)
+
+    def test_dashboard_is_for_superusers_only(self):
+        self.client.login(username="testuser", password="pass12345!")
+        response = self.client.get(reverse("ticket_dashboard"))
+        self.assertEqual(response.status_code, 403)
+
+
+class TestTicketCardCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        cls.other_user = User.objects.create_user(
+            username="otheruser",
+            email="otheruser@example.com",
+            password="pass12345!",
+        )
+        cls.ticket = Ticket.objects.create(
+            title="Cannot log in",
+            body="User cannot log into the portal.",
+            author=cls.user,
+        )
+        cls.edit_url = reverse("ticket_edit", args=[cls.ticket.pk])
+
+    def setUp(self):
+        caches[cards.CACHE_ALIAS].clear()
+        cards.stats.reset()
+
+    def test_second_render_is_served_from_cache(self):
+        self.client.login(username="testuser", password="pass12345!")
+        self.client.get(reverse("ticket_list"))
+        response = self.client.get(reverse("ticket_list"))
+
+        self.assertContains(response, "Cannot log in")
+        self.assertEqual((cards.stats.hits, cards.stats.misses), (1, 1))
+
+    def test_card_variant_depends_on_viewer_role(self):
+        self.client.login(username="testuser", password="pass12345!")
+        self.assertContains(self.client.get(reverse("ticket_list")),
+                            self.edit_url)
+
+        self.client.login(username="otheruser", password="pass12345!")
+        self.assertNotContains(self.client.get(reverse("ticket_list")),
+                               self.edit_url)
+        self.assertEqual(cards.stats.misses, 2)
+
+    def test_saving_a_ticket_invalidates_its_cards(self):
+        self.client.login(username="testuser", password="pass12345!")
+        self.client.get(reverse("ticket_list"))
+        old_key = cards.card_cache_key(
+            self.ticket.pk, self.ticket.modified, "owner")
+        self.assertIn(old_key, caches[cards.CACHE_ALIAS])
+
+        self.client.post(self.edit_url, {
+            "title": "Cannot log in (updated)",
+            "body": "Still failing.",
+        })
+
+        self.assertNotIn(old_key, caches[cards.CACHE_ALIAS])
+        response = self.client.get(reverse("ticket_list"))
+        self.assertContains(response, "Cannot log in (updated)")
+
+    def test_bulk_changes_are_never_served_stale(self):
+        self.client.login(username="testuser", password="pass12345!")
+        self.client.get(reverse("ticket_list"))
+
+        self.client.post(reverse("ticket_complete", args=[self.ticket.pk]))
+
+        response = self.client.get(reverse("ticket_list"))
+        self.assertContains(response, "Completed")
+
+    def test_deleting_a_ticket_invalidates_its_cards(self):
+        self.client.login(username="testuser", password="pass12345!")
+        self.client.get(reverse("ticket_list"))
+        key = cards.card_cache_key(
+            self.ticket.pk, self.ticket.modified, "owner")
+
+        Ticket.objects.get(pk=self.ticket.pk).delete()
+        self.assertNotIn(key, caches[cards.CACHE_ALIAS])
+
+    def test_card_links_follow_role_and_status(self):
+        variants = cards.render_ticket_card_variants(self.ticket)
+        complete_url = reverse("ticket_complete", args=[self.ticket.pk])
+        delete_url = reverse("ticket_delete", args=[self.ticket.pk])
+
+        for role in ("owner", "superuser"):
+            self.assertIn(self.edit_url, variants[role])
+            self.assertIn(delete_url, variants[role])
+        self.assertNotIn(self.edit_url, variants["other"])
+        self.assertNotIn(delete_url, variants["other"])
+        self.assertIn(complete_url, variants["other"])
+        self.assertIn(f'id="ticket-{self.ticket.pk}"', variants["other"])
+        self.assertIn("testuser", variants["other"])
+
+        Ticket.objects.filter(pk=self.ticket.pk).update(is_completed=True)
+        completed = cards.render_ticket_card_variants(
+            Ticket.objects.get(pk=self.ticket.pk))
+        self.assertNotIn(complete_url, completed["owner"])
+
+    def test_templates_are_parsed_once(self):
+        from django.template import engines
+        from django.template.loaders.cached import Loader
+
+        engine = engines["django"].engine
+        self.assertIsInstance(engine.template_loaders[0], Loader)
+        self.assertIs(engine.get_template(cards.CARD_TEMPLATE),
+                      engine.get_template(cards.CARD_TEMPLATE))
+
+    def test_nav_urls_are_rendered(self):
+        self.client.login(username="testuser", password="pass12345!")
+        response = self.client.get(reverse("ticket_list"))
+
+        for name in ("ticket_add", "ticket_archive", "logout"):
+            self.assertContains(response, f'"{reverse(name)}"')
+        self.assertNotContains(response, reverse("ticket_dashboard"))
+
+    def test_template_profiler_attributes_time(self):
+        self.client.login(username="testuser", password="pass12345!")
+        with TemplateProfiler() as profiler:
+            self.client.get(reverse("ticket_list"))
+
+        self.assertGreater(profiler.total, 0)
+        self.assertIn(cards.CARD_TEMPLATE, profiler.by_template)
+        self.assertEqual(profiler.by_tag["{{ ticket.title }}"].calls, 1)
+        self.assertIn("Template render time", profiler.report())
+
+
+class TestLRUFileBasedCache(TestCase):
+    def test_cull_evicts_least_recently_used_entries(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = LRUFileBasedCache(directory, {
+                "OPTIONS": {"MAX_ENTRIES": 3, "CULL_FREQUENCY": 3},
+            })
+            for key in ("a", "b", "c"):
+                cache.set(key, key)
+                time.sleep(0.01)
+            self.assertEqual(cache.get("a"), "a")
+
+            cache.set("d", "d")
+
+            self.assertIsNone(cache.get("b"))
+            self.assertEqual(cache.get_many(["a", "c", "d"]),
+                             {"a": "a", "c": "c", "d": "d"})
+
+
+class TestStaticAssets(TestCase):
+    def test_assets_are_self_hosted(self):
+        response = self.client.get(reverse("login"))
+        self.assertContains(
+            response, "/static/vendor/bootstrap-4.1.3/css/bootstrap.min.css")
+        self.assertContains(response, "/static/css/style.css")
+        self.assertNotContains(response, "https://")
+
+    def test_collected_assets_are_hashed_compressed_and_immutable(self):
+        storages = {
+            "staticfiles": {
+                "BACKEND": "whitenoise.storage."
+                           "CompressedManifestStaticFilesStorage",
+            },
+        }
+        with tempfile.TemporaryDirectory() as root, \
+                override_settings(STATIC_ROOT=root, STORAGES=storages):
+            # Only the site's own stylesheet, to keep compression quick.
+            call_command(
+                "collectstatic", interactive=False, verbosity=0,
+                ignore_patterns=["admin", "vendor"])
+            url = static("css/style.css")
+            self.assertRegex(url, r"^/static/css/style\.[0-9a-f]{12}\.css$")
+
+            asset = self.client.get(url, headers={"Accept-Encoding": "br"})
+
+        self.assertEqual(asset.status_code, 200)
+        self.assertEqual(asset["Content-Encoding"], "br")
+        self.assertIn("immutable", asset["Cache-Control"])
+
+
+class TestRequestMetrics(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser", password="pass12345!")
+        Ticket.objects.create(title="T", body="B", author=cls.user)
+
+    def sample(self, series):
+        for line in metrics.registry.expose().splitlines():
+            name, _, value = line.rpartition(" ")
+            if name == series:
+                return float(value)
+        return 0.0
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram("h", "Help.", ["view"], (1, 5))
+        for value in (0, 3, 3, 9):
+            histogram.observe(("a",), value)
+        self.assertEqual(list(histogram.samples()), [
+            ("h_bucket", '{view="a",le="1"}', 1),
+            ("h_bucket", '{view="a",le="5"}', 3),
+            ("h_bucket", '{view="a",le="+Inf"}', 4),
+            ("h_sum", '{view="a"}', 15.0),
+            ("h_count", '{view="a"}', 4),
+        ])
+
+    def test_records_requests_queries_and_rendering_by_url_name(self):
+        requests = ('http_requests_total'
+                    '{view="ticket_list",method="GET",status="200"}')
+        queries = 'http_request_db_queries_count{view="ticket_list"}'
+        rendered = ('http_request_template_duration_seconds_count'
+                    '{view="ticket_list"}')
+        before = [self.sample(name) for name in (requests, queries, rendered)]
+        self.client.login(username="testuser", password="pass12345!")
+
+        with CaptureQueriesContext(connection) as queries_run:
+            self.client.get(reverse("ticket_list"))
+
+        self.assertEqual(
+            [self.sample(name) for name in (requests, queries, rendered)],
+            [n + 1 for n in before])
+        output = metrics.registry.expose()
+        self.assertIn(
+            'http_request_db_queries_bucket{view="ticket_list",le="+Inf"}',
+            output)
+        sql_sum = self.sample(
+            'http_request_db_queries_sum{view="ticket_list"}')
+        self.assertGreaterEqual(sql_sum, len(queries_run))
+
+    async def test_records_queries_under_asgi(self):
+        queries = 'http_request_db_queries_sum{view="ticket_list"}'
+        before = self.sample(queries)
+        await self.async_client.aforce_login(self.user)
+
+        response = await self.async_client.get(reverse("ticket_list"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self.sample(queries), before)
+
+    def test_middleware_runs_natively_under_asgi(self):
+        async def get_response(request):
+            return HttpResponse()
+
+        # Otherwise Django wraps them in sync_to_async() under ASGI.
+        for middleware_class, hook in (
+                (metrics.MetricsMiddleware, "process_template_response"),
+                (admission.AdmissionControlMiddleware, "process_view")):
+            middleware = middleware_class(get_response)
+            self.assertTrue(iscoroutinefunction(middleware))
+            self.assertTrue(iscoroutinefunction(getattr(middleware, hook)))
+
+    def test_metrics_endpoint_serves_prometheus_text(self):
+        self.user.is_staff = True
+        self.user.save()
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], metrics.CONTENT_TYPE)
+        self.assertContains(
+            response, "# TYPE http_request_duration_seconds histogram")
+
+    def test_metrics_endpoint_is_closed_unless_debug(self):
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_metrics_endpoint_requires_token_when_configured(self):
+        url = reverse("metrics")
+        self.assertEqual(self.client.get(url).status_code, 403)
+        response = self.client.get(
+            url, headers={"Authorization": "Bearer secret"})
+        self.assertEqual(response.status_code, 200)
+
+
+ADMISSION_LIMITS = {
+    "ticket_add": {"user": (0.001, 3), "global": (0.001, 5),
+                   "concurrency": 1},
+    "ticket_complete": {"user": (0.001, 2)},
+    "signup": {"user": (0.001, 2)},
+}
+
+
+@override_settings(ADMISSION_CONTROL=ADMISSION_LIMITS)
+class TestAdmissionControl(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.users = [
+            User.objects.create_user(
+                username=f"user{n}", password="pass12345!")
+            for n in range(3)
+        ]
+        cls.url = reverse("ticket_add")
+
+    def setUp(self):
+        caches[settings.ADMISSION_CACHE].clear()
+
+    def burst(self, user, count):
+        self.client.force_login(user)
+        return [
+            self.client.post(self.url, {"title": "T", "body": "B"})
+            for _ in range(count)
+        ]
+
+    def count(self, decision):
+        series = (f'admission_requests_total{{view="ticket_add",'
+                  f'decision="{decision}"}}')
+        for line in metrics.registry.expose().splitlines():
+            name, _, value = line.rpartition(" ")
+            if name == series:
+                return float(value)
+        return 0.0
+
+    def test_burst_is_cut_off_per_user_with_retry_after(self):
+        admitted = self.count("admitted")
+
+        responses = self.burst(self.users[0], 5)
+
+        self.assertEqual([r.status_code for r in responses],
+                         [302, 302, 302, 429, 429])
+        self.assertEqual(Ticket.objects.count(), 3)
+        self.assertGreater(int(responses[-1]["Retry-After"]), 1)
+        self.assertEqual(self.count("admitted"), admitted + 3)
+        self.assertGreaterEqual(self.count("rejected_user"), 2)
+
+    async def test_limits_apply_under_asgi(self):
+        await self.async_client.aforce_login(self.users[0])
+        statuses = [
+            (await self.async_client.post(
+                self.url, {"title": "T", "body": "B"})).status_code
+            for _ in range(4)
+        ]
+        self.assertEqual(statuses, [302, 302, 302, 429])
+        self.assertEqual(admission.limiter.in_flight("ticket_add"), 0)
+
+    def test_global_bucket_sheds_load_across_users(self):
+        statuses = [r.status_code for user in self.users
+                    for r in self.burst(user, 2)]
+
+        self.assertEqual(statuses, [302] * 5 + [503])
+
+    def test_requests_over_the_concurrency_limit_fail_fast(self):
+        self.assertTrue(admission.limiter.acquire("ticket_add", 1))
+        try:
+            response, = self.burst(self.users[0], 1)
+        finally:
+            admission.limiter.release("ticket_add")
+
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.burst(self.users[0], 1)
+        self.assertEqual(admission.limiter.in_flight("ticket_add"), 0)
+
+    def test_reads_and_unlisted_views_are_not_limited(self):
+        self.client.force_login(self.users[0])
+        for _ in range(5):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+        ticket = Ticket.objects.create(
+            title="T", body="B", author=self.users[0])
+        for _ in range(5):
+            self.client.post(reverse("ticket_complete", args=[ticket.pk]))
+        self.assertEqual(self.burst(self.users[0], 1)[0].status_code, 302)
+
+    def test_completion_burst_from_the_ticket_list_is_limited(self):
+        tickets = Ticket.objects.bulk_create(
+            Ticket(title=f"T{i}", body="B", author=self.users[0])
+            for i in range(4))
+        client = Client(enforce_csrf_checks=True)
+        client.force_login(self.users[0])
+        page = client.get(reverse("ticket_list")).content.decode()
+        # What the cards' "Mark as complete" buttons submit.
+        token = re.search(
+            r'id="ticket-complete-form".*?name="csrfmiddlewaretoken" '
+            r'value="([^"]+)"', page, re.S).group(1)
+        actions = re.findall(
+            r'form="ticket-complete-form" formaction="([^"]+)"', page)
+        self.assertEqual(
+            sorted(actions),
+            sorted(reverse("ticket_complete", args=[ticket.pk])
+                   for ticket in tickets))
+
+        statuses = [
+            client.post(action, {"csrfmiddlewaretoken": token}).status_code
+            for action in actions
+        ]
+
+        self.assertEqual(statuses, [302, 302, 429, 429])
+        self.assertEqual(Ticket.objects.filter(is_completed=True).count(), 2)
+        self.assertEqual(client.get(actions[-1]).status_code, 405)
+
+    def test_anonymous_clients_are_limited_by_address(self):
+        data = {"username": "new", "password1": "x", "password2": "y"}
+        post = self.client.post
+        url = reverse("signup")
+        self.assertEqual(post(url, data).status_code, 200)
+        self.assertEqual(post(url, data).status_code, 200)
+        self.assertEqual(post(url, data).status_code, 429)
+        self.assertEqual(
+            post(url, data, REMOTE_ADDR="10.0.0.2").status_code, 200)
+
+    @override_settings(ADMISSION_PROXY_COUNT=1)
+    def test_behind_a_proxy_clients_are_told_apart_by_forwarded_address(
+            self):
+        data = {"username": "new", "password1": "x", "password2": "y"}
+        url = reverse("signup")
+
+        def post(forwarded_for):
+            return self.client.post(
+                url, data, REMOTE_ADDR="10.0.0.1",
+                HTTP_X_FORWARDED_FOR=forwarded_for).status_code
+
+        # The router's address is the same for everyone, and clients can
+        # put anything before the entry the router appends.
+        self.assertEqual([post("1.1.1.1"), post("9.9.9.9, 1.1.1.1")],
+                         [200, 200])
+        self.assertEqual(post("8.8.8.8, 1.1.1.1"), 429)
+        self.assertEqual(post("2.2.2.2"), 200)
+
+    def test_bucket_refills_over_time(self):
+        bucket = admission.TokenBucket(rate=2, burst=1)
+        cache = caches[settings.ADMISSION_CACHE]
+        self.assertEqual(bucket.take(cache, "k", now=100.0), 0)
+        self.assertAlmostEqual(bucket.take(cache, "k", now=100.0), 0.5)
+        self.assertAlmostEqual(bucket.take(cache, "k", now=100.25), 0.25)
+        self.assertEqual(bucket.take(cache, "k", now=100.5), 0)
+
+
+class TestBenchmarkSuite(TestCase):
+    @override_settings(ADMISSION_CONTROL=DEFAULT_ADMISSION_CONTROL)
+    def test_write_scenarios_run_past_the_admission_burst(self):
+        user = get_user_model().objects.create_user(
+            username="bench", password=factories.PASSWORD)
+        Ticket.objects.create(title="T", body="B", author=user)
+        bench = suite.Bench(user, repeat=25)
+        names = ["ticket_add", "ticket_complete", "signup"]
+        # More requests than any of their default per-user bursts.
+        self.assertTrue(all(
+            settings.ADMISSION_CONTROL[name]["user"][1] < 25
+            for name in names))
+
+        results = suite.run(bench, names, repeat=25, warmup=3)
+
+        self.assertEqual(list(results), names)
+        self.assertEqual(results["ticket_add"]["requests"], 25)
+
+
+class TestTicketListConditionalGet(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        User.objects.create_user(
+            username="otheruser",
+            email="otheruser@example.com",
+            password="pass12345!",
+        )
+        cls.ticket = Ticket.objects.create(
+            title="Cannot log in",
+            body="User cannot log into the portal.",
+            author=cls.user,
+        )
+
+    def setUp(self):
+        self.client.login(username="testuser", password="pass12345!")
+
+    def test_list_sends_private_etag(self):
+        response = self.client.get(reverse("ticket_list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("ETag"))
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_unchanged_list_returns_304_without_rendering(self):
+        etag = self.client.get(reverse("ticket_list"))["ETag"]
+
+        with self.assertMaxQueries(3):
+            response = self.client.get(
+                reverse("ticket_list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_changed_ticket_invalidates_etag(self):
+        etag = self.client.get(reverse("ticket_list"))["ETag"]
+        self.client.post(reverse("ticket_complete", args=[self.ticket.pk]))
+
+        response = self.client.get(
+            reverse("ticket_list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_deleted_ticket_invalidates_etag(self):
+        extra = Ticket.objects.create(
+            title="Extra", body="Extra ticket.", author=self.user)
+        etag = self.client.get(reverse("ticket_list"))["ETag"]
+        extra.delete()
+
+        response = self.client.get(
+            reverse("ticket_list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_etag_differs_between_viewers(self):
+        etag = self.client.get(reverse("ticket_list"))["ETag"]
+        self.client.login(username="otheruser", password="pass12345!")
+
+        response = self.client.get(
+            reverse("ticket_list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class TestTicketBulkActions(QueryBudgetMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        cls.other_user = User.objects.create_user(
+            username="otheruser",
+            email="otheruser@example.com",
+            password="pass12345!",
+        )
+        cls.superuser = User.objects.create_superuser(
+            username="admin",
+            email="admin@example.com",
+            password="pass12345!",
+        )
+        cls.own = [
+            Ticket.objects.create(title=f"Own {i}", body="B", author=cls.user)
+            for i in range(3)
+        ]
+        cls.others = [
+            Ticket.objects.create(
+                title=f"Other {i}", body="B", author=cls.other_user)
+            for i in range(2)
+        ]
+        cls.all_ids = [t.pk for t in cls.own + cls.others]
+
+    def bulk(self, action, ids, **extra):
+        return self.client.post(
+            reverse("ticket_bulk"), {"action": action, "ids": ids, **extra})
+
+    def test_bulk_redirects_anonymous_user_to_login(self):
+        response = self.bulk("complete", self.all_ids)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Ticket.objects.filter(is_completed=True).count(), 0)
+
+    def test_owner_only_completes_own_tickets(self):
+        self.client.login(username="testuser", password="pass12345!")
+        response = self.bulk("complete", self.all_ids)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"action": "complete", "requested": 5, "affected": 3},
+        )
+        completed = set(Ticket.objects.filter(
+            is_completed=True).values_list("pk", flat=True))
+        self.assertEqual(completed, {t.pk for t in self.own})
+
+    def test_bulk_change_is_a_single_statement(self):
+        self.client.login(username="admin", password="pass12345!")
+        # Session, user, savepoint, counts per bucket, the UPDATE itself,
+        # two queries each for the author and daily stats, release.
+        with self.assertMaxQueries(10) as queries:
+            self.bulk("complete", self.all_ids)
+        ticket_updates = [
+            query for query in queries.captured_queries
+            if query["sql"].startswith('UPDATE "tickets_ticket"')]
+        self.assertEqual(len(ticket_updates), 1)
+
+        Ticket.objects.update(is_completed=True)
+        response = self.bulk("reopen", self.all_ids[:2])
+        self.assertEqual(response.json()["affected"], 2)
+        self.assertEqual(Ticket.objects.filter(is_completed=False).count(), 2)
+
+    def test_superuser_can_reassign_and_counts_follow(self):
+        self.client.login(username="admin", password="pass12345!")
+        response = self.bulk(
+            "reassign", [t.pk for t in self.own], author="otheruser")
+
+        self.assertEqual(response.json()["affected"], 3)
+        self.other_user.refresh_from_db()
+        self.assertEqual(self.other_user.num_tickets_assigned, 5)
+        self.assertEqual(Ticket.objects.filter(author=self.user).count(), 0)
+
+    def test_regular_user_cannot_reassign(self):
+        self.client.login(username="testuser", password="pass12345!")
+        response = self.bulk(
+            "reassign", [t.pk for t in self.own], author="otheruser")
+        self.assertEqual(response.status_code, 403)
+
+    def test_bulk_delete_respects_ownership(self):
+        self.client.login(username="otheruser", password="pass12345!")
+        response = self.bulk("delete", self.all_ids)
+
+        self.assertEqual(response.json()["affected"], 2)
+        self.assertEqual(Ticket.objects.count(), 3)
+        self.other_user.refresh_from_db()
+        self.assertEqual(self.other_user.num_tickets_assigned, 0)
+
+    def test_invalid_request_returns_errors(self):
+        self.client.login(username="admin", password="pass12345!")
+        response = self.bulk("explode", ["x"])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()["errors"]), {"action", "ids"})
+
+        response = self.bulk("reassign", self.all_ids, author="nobody")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("author", response.json()["errors"])
+
+    def test_admin_actions_complete_and_reassign(self):
+        self.client.login(username="admin", password="pass12345!")
+        url = reverse("admin:tickets_ticket_changelist")
+        self.client.post(url, {
+            "action": "mark_completed",
+            "_selected_action": [t.pk for t in self.own],
+        })
+        self.assertEqual(Ticket.objects.filter(is_completed=True).count(), 3)
+
+        self.client.post(url, {
+            "action": "reassign",
+            "author": "admin",
+            "_selected_action": [t.pk for t in self.others],
+        })
+        self.superuser.refresh_from_db()
+        self.assertEqual(self.superuser.num_tickets_assigned, 2)
+
+
+class TestTicketExport(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        cls.other_user = User.objects.create_user(
+            username="otheruser",
+            email="otheruser@example.com",
+            password="pass12345!",
+        )
+        cls.open_ticket = Ticket.objects.create(
+            title="Printer jam", body="Tray 2, again.", author=cls.user)
+        cls.done_ticket = Ticket.objects.create(
+            title="VPN, drops", body='Says "timeout".',
+            author=cls.other_user, is_completed=True)
+        Ticket.objects.filter(pk=cls.done_ticket.pk).update(
+            date=timezone.now() - timedelta(days=10))
+
+    def export(self, **params):
+        self.client.login(username="testuser", password="pass12345!")
+        response = self.client.get(reverse("ticket_export"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_redirects_anonymous_user_to_login(self):
+        response = self.client.get(reverse("ticket_export"))
+        self.assertEqual(response.status_code, 302)
+
+    def test_csv_export_contains_every_ticket(self):
+        rows = list(csv.reader(self.export().splitlines()))
+
+        self.assertEqual(
+            rows[0], ["title", "body", "date", "author", "is_completed"])
+        self.assertEqual(
+            [row[0] for row in rows[1:]], ["Printer jam", "VPN, drops"])
+        self.assertEqual(rows[2][1], 'Says "timeout".')
+        self.assertEqual(rows[2][3], "otheruser")
+
+    def test_ndjson_export_filters_by_status_and_author(self):
+        lines = self.export(format="ndjson", status="completed").splitlines()
+        self.assertEqual(len(lines), 1)
+        record = json.loads(lines[0])
+        self.assertEqual(record["title"], "VPN, drops")
+        self.assertIs(record["is_completed"], True)
+
+        lines = self.export(format="ndjson", author="testuser").splitlines()
+        self.assertEqual(
+            [json.loads(line)["title"] for line in lines], ["Printer jam"])
+
+    def test_export_filters_by_date_range(self):
+        today = timezone.localdate()
+        rows = self.export(since=today.isoformat()).splitlines()
+        self.assertEqual(len(rows), 2)
+
+        until = (today - timedelta(days=5)).isoformat()
+        rows = list(csv.reader(self.export(until=until).splitlines()))
+        self.assertEqual([row[0] for row in rows[1:]], ["VPN, drops"])
+
+    def test_invalid_export_parameters_return_400(self):
+        self.client.login(username="testuser", password="pass12345!")
+        response = self.client.get(
+            reverse("ticket_export"), {"format": "xml", "since": "soon"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()["errors"]), {"format", "since"})
+
+    def test_export_tickets_command(self):
+        out = StringIO()
+        call_command("export_tickets", "--status", "open", stdout=out)
+        rows = list(csv.reader(out.getvalue().splitlines()))
+        self.assertEqual([row[0] for row in rows[1:]], ["Printer jam"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "tickets.ndjson")
+            call_command("export_tickets", "--format", "ndjson",
+                         "--output", path)
+            with open(path) as exported:
+                self.assertEqual(len(exported.readlines()), 2)
+
+    def test_export_memory_does_not_grow_with_table_size(self):
+        Ticket.objects.bulk_create(
+            Ticket(title=f"Bulk {i}", body="x" * 200, author=self.user)
+            for i in range(3000)
+        )
+
+        def peak(consume):
+            tracemalloc.start()
+            try:
+                consume()
+                return tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        rows = export_queryset()
+        streamed = peak(lambda: sum(
+            len(chunk) for chunk in iter_export(rows, "csv", chunk_size=100)))
+        loaded = peak(lambda: list(rows.all()))
+        self.assertLess(streamed * 4, loaded)
+
+
+class TestTicketApi(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser", password="pass12345!")
+        cls.other_user = User.objects.create_user(
+            username="otheruser", password="pass12345!")
+        cls.superuser = User.objects.create_superuser(
+            username="admin", password="pass12345!")
+        cls.own = [
+            Ticket.objects.create(
+                title=f"Own {i}", body="B", author=cls.user,
+                is_completed=i == 0)
+            for i in range(5)
+        ]
+        cls.other = Ticket.objects.create(
+            title="Other", body="B", author=cls.other_user)
+
+    def get(self, username="testuser", **params):
+        self.client.login(username=username, password="pass12345!")
+        response = self.client.get(reverse("ticket_api"), params)
+        self.assertEqual(response["Content-Type"], "application/json")
+        return response
+
+    def test_anonymous_user_is_forbidden(self):
+        response = self.client.get(reverse("ticket_api"))
+        self.assertEqual(response.status_code, 403)
+
+    def test_users_only_see_their_own_tickets(self):
+        results = self.get().json()["results"]
+        self.assertEqual(
+            [row["id"] for row in results],
+            [ticket.pk for ticket in reversed(self.own)])
+        self.assertEqual(
+            set(results[0]),
+            {"id", "title", "body", "date", "modified", "is_completed",
+             "author"})
+        self.assertEqual(results[0]["author"], "testuser")
+
+        results = self.get(username="admin").json()["results"]
+        self.assertEqual(results[0]["id"], self.other.pk)
+        self.assertEqual(len(results), 6)
+
+    def test_fields_select_the_projection(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(fields="title, is_completed")
+        self.assertEqual(response.json()["results"][-1],
+                         {"title": "Own 0", "is_completed": True})
+        # Only the requested columns, and no join for the author.
+        page_query = queries.captured_queries[-1]["sql"]
+        self.assertNotIn('"body"', page_query)
+        self.assertNotIn("JOIN", page_query)
+
+    def test_cursor_pages_through_every_ticket(self):
+        seen = []
+        params = {"limit": 2, "fields": "id"}
+        while True:
+            data = self.get(**params).json()
+            seen.extend(row["id"] for row in data["results"])
+            if not data["next"]:
+                break
+            params["after"] = data["next"]
+        self.assertEqual(seen, [ticket.pk for ticket in reversed(self.own)])
+
+        data = self.get(limit=2, fields="id", before=data["previous"]).json()
+        self.assertEqual([row["id"] for row in data["results"]],
+                         [self.own[2].pk, self.own[1].pk])
+
+    def test_status_filter(self):
+        results = self.get(status="completed", fields="id").json()["results"]
+        self.assertEqual(results, [{"id": self.own[0].pk}])
+
+    def test_invalid_parameters_return_400(self):
+        response = self.get(fields="title,password", limit=1000)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            set(response.json()["errors"]), {"fields", "limit"})
+        response = self.get(after="not-a-cursor")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("cursor", response.json()["errors"])
+
+    def test_serialises_without_orjson(self):
+        with mock.patch.object(api, "orjson", None):
+            fallback = self.get(fields="id,date,title").content
+        self.assertEqual(fallback, self.get(fields="id,date,title").content)
+
+
+class TestTicketArchive(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser", password="pass12345!")
+        cls.other_user = User.objects.create_user(
+            username="otheruser", password="pass12345!")
+        cls.superuser = User.objects.create_superuser(
+            username="admin", password="pass12345!")
+        long_ago = timezone.now() - timedelta(days=200)
+        cls.old = [
+            Ticket.objects.create(
+                title=f"Old printer {i}", body="Jammed", author=cls.user,
+                date=long_ago, is_completed=True)
+            for i in range(3)
+        ]
+        cls.others_old = Ticket.objects.create(
+            title="Old VPN", body="Drops", author=cls.other_user,
+            date=long_ago, is_completed=True)
+        cls.recent = Ticket.objects.create(
+            title="Recent printer", body="Jammed", author=cls.user,
+            is_completed=True)
+        cls.open = Ticket.objects.create(
+            title="Open printer", body="Jammed", author=cls.user)
+        # Open tickets stay in the list however long they go untouched.
+        Ticket.objects.filter(pk__in=[
+            ticket.pk for ticket in [*cls.old, cls.others_old, cls.open]
+        ]).update(modified=long_ago)
+        cls.old_ids = [ticket.pk for ticket in [*cls.old, cls.others_old]]
+
+    def totals(self):
+        return (
+            sorted(get_user_model().objects.values_list(
+                "username", "num_tickets_assigned")),
+            sorted(AuthorTicketStats.objects.values_list(
+                "author", "open", "completed")),
+            sorted(DailyTicketStats.objects.values_list(
+                "day", "open", "completed")),
+        )
+
+    def test_archives_old_completed_tickets_in_batches(self):
+        totals = self.totals()
+        batches = list(archive_tickets(days=90, batch_size=3))
+
+        self.assertEqual(batches, [3, 1])
+        self.assertEqual(
+            sorted(ArchivedTicket.objects.values_list("pk", flat=True)),
+            self.old_ids)
+        self.assertEqual(
+            set(Ticket.objects.values_list("pk", flat=True)),
+            {self.recent.pk, self.open.pk})
+        archived = ArchivedTicket.objects.get(pk=self.old[0].pk)
+        self.assertEqual(
+            (archived.title, archived.author, archived.date),
+            (self.old[0].title, self.user, self.old[0].date))
+        # Still the same tickets, so the totals stay as they were and a
+        # rebuild agrees with them.
+        self.assertEqual(self.totals(), totals)
+        rebuild_ticket_counts()
+        rebuild_ticket_stats()
+        self.assertEqual(self.totals(), totals)
+        self.assertEqual(list(archive_tickets(days=90)), [])
+
+    def test_archived_tickets_leave_the_list_and_search(self):
+        call_command("archive_tickets", days=90, stdout=StringIO())
+        self.client.login(username="testuser", password="pass12345!")
+        response = self.client.get(reverse("ticket_list"), {"q": "printer"})
+        self.assertEqual(
+            {ticket.pk for ticket in response.context["object_list"]},
+            {self.recent.pk, self.open.pk})
+
+    def test_restore_puts_the_ticket_back(self):
+        list(archive_tickets(days=90))
+        totals = self.totals()
+
+        restored = restore_tickets(
+            ArchivedTicket.objects.filter(pk=self.old[1].pk))
+
+        self.assertEqual([ticket.pk for ticket in restored], [self.old[1].pk])
+        ticket = Ticket.objects.get(pk=self.old[1].pk)
+        self.assertTrue(ticket.is_completed)
+        self.assertEqual(ticket.date, self.old[1].date)
+        self.assertFalse(
+            ArchivedTicket.objects.filter(pk=self.old[1].pk).exists())
+        self.assertEqual(self.totals(), totals)
+
+    def test_archive_view_reads_only_the_users_archive(self):
+        list(archive_tickets(days=90))
+        self.client.login(username="testuser", password="pass12345!")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("ticket_archive"))
+        self.assertEqual(
+            [ticket.pk for ticket in response.context["object_list"]],
+            [ticket.pk for ticket in reversed(self.old)])
+        self.assertFalse(any(
+            '"tickets_ticket"' in query["sql"]
+            for query in queries.captured_queries))
+
+        self.client.login(username="admin", password="pass12345!")
+        response = self.client.get(reverse("ticket_archive"))
+        self.assertEqual(len(response.context["object_list"]), 4)
+        self.assertContains(response, "otheruser")
+
+    def test_restore_view_is_limited_to_owner_or_superuser(self):
+        list(archive_tickets(days=90))
+        url = reverse("ticket_restore", args=[self.others_old.pk])
+        self.client.login(username="testuser", password="pass12345!")
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.assertEqual(self.client.post(url).status_code, 404)
+
+        self.client.login(username="admin", password="pass12345!")
+        response = self.client.post(url)
+        self.assertRedirects(response, reverse("ticket_list"))
+        self.assertTrue(Ticket.objects.filter(pk=self.others_old.pk).exists())
+
+    def test_archive_tickets_command(self):
+        out = StringIO()
+        call_command("archive_tickets", "--days", "300", stdout=out)
+        self.assertIn("Archived 0 tickets", out.getvalue())
+
+        call_command("archive_tickets", stdout=out)
+        self.assertIn("Archived 4 tickets completed more than 90 days ago",
+                      out.getvalue())
+
+        call_command("archive_tickets", "--restore", str(self.old[0].pk),
+                     stdout=out)
+        self.assertIn("Restored 1 tickets.", out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("archive_tickets", "--batch-size", "0")
+
+
+class TestWorkerStartup(TestCase):
+    def test_warm_up_fills_the_caches_without_queries(self):
+        from django.template import engines
+
+        loader = engines["django"].engine.template_loaders[0]
+        loader.reset()
+
+        with self.assertNumQueries(0):
+            timings = warm_up()
+
+        self.assertEqual(set(timings),
+                         {"urls", "translations", "templates", "models"})
+        self.assertIn("base.html", loader.get_template_cache)
+        self.assertIn(cards.CARD_TEMPLATE, loader.get_template_cache)
+
+    def test_parse_importtime(self):
+        lines = [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |   orjson.orjson",
+            "import time:        80 |        200 | orjson",
+        ]
+        self.assertEqual(list(parse_importtime(lines)),
+                         [("orjson.orjson", 120, 120), ("orjson", 80, 200)])
+
+    def test_startup_profile_reports_imports_and_first_requests(self):
+        out = StringIO()
+        call_command("startup_profile", "--path", "/accounts/login/",
+                     "--limit", "3", stdout=out)
+
+        output = out.getvalue()
+        for line in ("import application", "warm_up()",
+                     "first GET /accounts/login/", "django"):
+            self.assertIn(line, output)
+
+
+class TestImportTicketsCommand(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        cls.other_user = User.objects.create_user(
+            username="otheruser",
+            email="otheruser@example.com",
+            password="pass12345!",
+        )
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name, content):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w", newline="") as source:
+            source.write(content)
+        return path
+
+    def run_import(self, *args):
+        out = StringIO()
+        call_command("import_tickets", *args, stdout=out)
+        return out.getvalue()
+
+    def test_imports_csv_written_by_export(self):
+        Ticket.objects.create(title="Old", body="From the old tracker.",
+                              author=self.user, is_completed=True)
+        Ticket.objects.filter(title="Old").update(
+            date=timezone.now() - timedelta(days=30))
+        out = StringIO()
+        call_command("export_tickets", stdout=out)
+        Ticket.objects.all().delete()
+
+        path = self.write("tickets.csv", out.getvalue())
+        output = self.run_import(path)
+
+        ticket = Ticket.objects.get()
+        self.assertEqual(ticket.title, "Old")
+        self.assertTrue(ticket.is_completed)
+        self.assertLess(ticket.date, timezone.now() - timedelta(days=29))
+        self.assertIn("rows/s", output)
+
+    def test_imports_ndjson_and_skips_invalid_rows(self):
+        lines = [
+            {"title": "A", "body": "x", "author": "testuser"},
+            {"title": "B", "body": "x", "author": "otheruser",
+             "is_completed": True},
+            {"title": "C", "body": "x", "author": "nobody"},
+            {"title": "", "body": "x", "author": "testuser"},
+            {"title": "D", "body": "x", "author": "testuser",
+             "date": "yesterday"},
+        ]
+        path = self.write(
+            "tickets.ndjson", "\n".join(json.dumps(line) for line in lines))
+
+        output = self.run_import(path)
+
+        self.assertEqual(
+            sorted(Ticket.objects.values_list("title", flat=True)),
+            ["A", "B"])
+        self.assertIn("skipped 3 invalid rows", output)
+
+    def test_skips_ndjson_lines_that_are_not_objects(self):
+        path = self.write("tickets.ndjson", "\n".join([
+            '[1]', '"x"', '42', 'null',
+            json.dumps({"title": "A", "body": "x", "author": "testuser"}),
+        ]))
+
+        output = self.run_import(path)
+
+        self.assertEqual(Ticket.objects.get().title, "A")
+        self.assertIn("skipped 4 invalid rows", output)
+
+    def test_counters_are_updated_once_per_transaction(self):
+        rows = "".join(
+            f"T{i},body,,{'testuser' if i % 3 else 'otheruser'},False\n"
+            for i in range(30)
+        )
+        path = self.write(
+            "tickets.csv", "title,body,date,author,is_completed\n" + rows)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.run_import(path, "--transaction-size", "10")
+        counter_updates = [
+            q for q in queries.captured_queries
+            if q["sql"].startswith('UPDATE "accounts_customuser"')
+        ]
+        self.assertEqual(len(counter_updates), 3)
+
+        self.user.refresh_from_db()
+        self.other_user.refresh_from_db()
+        self.assertEqual(self.user.num_tickets_assigned, 20)
+        self.assertEqual(self.other_user.num_tickets_assigned, 10)
+
+    def test_resumes_from_checkpoint_after_failure(self):
+        rows = "".join(f"T{i},body,,testuser,False\n" for i in range(25))
+        path = self.write(
+            "tickets.csv", "title,body,date,author,is_completed\n" + rows)
+        original = TicketQuerySet.bulk_create
+        calls = []
+
+        def fail_on_second_chunk(queryset, *args, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("connection lost")
+            return original(queryset, *args, **kwargs)
+
+        with mock.patch.object(
+                TicketQuerySet, "bulk_create", fail_on_second_chunk):
+            with self.assertRaises(RuntimeError):
+                self.run_import(path, "--transaction-size", "10",
+                                "--checkpoint", "legacy")
+        self.assertEqual(Ticket.objects.count(), 10)
+        self.assertEqual(
+            ImportCheckpoint.objects.get(name="legacy").rows_done, 10)
+
+        output = self.run_import(path, "--transaction-size", "10",
+                                 "--checkpoint", "legacy")
+
+        self.assertIn("Resuming after 10 rows", output)
+        self.assertEqual(
+            sorted(Ticket.objects.values_list("title", flat=True)),
+            sorted(f"T{i}" for i in range(25)))
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.num_tickets_assigned, 25)
+
+    def test_unknown_format_is_an_error(self):
+        path = self.write("tickets.txt", "")
+        with self.assertRaises(CommandError):
+            self.run_import(path)
+
+
+class TestAsyncTicketViews(TestCase):
+    """The async views are only routed when TICKETS_ASYNC_VIEWS is set, so
+    they are called directly here."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        cls.other = get_user_model().objects.create_user(
+            username="otheruser",
+            email="otheruser@example.com",
+            password="pass12345!",
+        )
+        cls.ticket = Ticket.objects.create(
+            title="Async ticket", body="Body", author=cls.user)
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    def conn_max_age(self, module, **env):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": "core.settings", **env}
+        for name in ("DATABASE_URL", "DB_CONN_MAX_AGE"):
+            env.pop(name, None)
+        code = (f"import {module}; from django.conf import settings; "
+                f"print(settings.DATABASES['default']['CONN_MAX_AGE'])")
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True,
+            env=env, cwd=settings.BASE_DIR, check=True)
+        return int(result.stdout)
+
+    def test_async_profile_does_not_persist_connections(self):
+        self.assertEqual(self.conn_max_age("core.wsgi"), 600)
+        self.assertEqual(self.conn_max_age("core.asgi"), 0)
+        self.assertEqual(
+            self.conn_max_age("core.wsgi", TICKETS_ASYNC_VIEWS="1"), 0)
+
+    async def call(self, view, method="get", user=None, data=None, **kwargs):
+        request = getattr(self.factory, method)("/tickets/", data or {})
+        user = user or self.user
+
+        async def auser():
+            return user
+
+        request.auser = auser
+        response = await view(request, **kwargs)
+        if hasattr(response, "render"):
+            response.render()
+        return response
+
+    async def test_list_renders_page_of_cards(self):
+        response = await self.call(AsyncTicketListView.as_view())
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Async ticket")
+        self.assertIn("ETag", response.headers)
+
+    async def test_anonymous_users_are_redirected_to_login(self):
+        response = await self.call(
+            AsyncTicketListView.as_view(), user=AnonymousUser())
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse("login"), response.url)
+
+    async def test_create_saves_ticket_for_user(self):
+        response = await self.call(
+            AsyncTicketCreateView.as_view(), method="post",
+            data={"title": "Created", "body": "Async body"})
+        self.assertRedirects(
+            response, reverse("ticket_list"), fetch_redirect_response=False)
+        ticket = await Ticket.objects.aget(title="Created")
+        self.assertEqual(ticket.author_id, self.user.pk)
+        await self.user.arefresh_from_db()
+        self.assertEqual(self.user.num_tickets_assigned, 2)
+
+    async def test_create_rerenders_invalid_form(self):
+        response = await self.call(
+            AsyncTicketCreateView.as_view(), method="post", data={})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(await Ticket.objects.filter(title="").aexists())
+
+    async def test_complete(self):
+        response = await self.call(aticket_complete, pk=self.ticket.pk)
+        self.assertEqual(response.status_code, 405)
+
+        await self.call(aticket_complete, method="post", pk=self.ticket.pk)
+        await self.ticket.arefresh_from_db()
+        self.assertTrue(self.ticket.is_completed)
+        with self.assertRaises(Http404):
+            await self.call(
+                aticket_complete, method="post", pk=self.ticket.pk + 100)
+
+    async def test_delete_is_limited_to_owner(self):
+        view = AsyncTicketDeleteView.as_view()
+        with self.assertRaises(Http404):
+            await self.call(
+                view, method="post", user=self.other, pk=self.ticket.pk)
+
+        response = await self.call(view, pk=self.ticket.pk)
+        self.assertContains(response, "Async ticket")
+        await self.call(view, method="post", pk=self.ticket.pk)
+        self.assertFalse(
+            await Ticket.objects.filter(pk=self.ticket.pk).aexists())
+        await self.user.arefresh_from_db()
+        self.assertEqual(self.user.num_tickets_assigned, 0)
+
+
+class TestTicketEvents(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            username="testuser",
+            email="testuser@example.com",
+            password="pass12345!",
+        )
+        cls.other = get_user_model().objects.create_user(
+            username="otheruser",
+            email="otheruser@example.com",
+            password="pass12345!",
+        )
+        cls.ticket = Ticket.objects.create(
+            title="Live ticket", body="Body", author=cls.user)
+
+    def setUp(self):
+        self.broker = TicketEventBroker(queue_size=3)
+
+    def subscribe(self, user):
+        subscription = self.broker.subscribe(user)
+        self.addCleanup(self.broker.unsubscribe, subscription)
+        return subscription
+
+    def committed(self, func):
+        # Events are published on commit; run ``func`` and the commit
+        # callbacks it registers on the test thread.
+        def run():
+            with self.captureOnCommitCallbacks(execute=True):
+                func()
+        return sync_to_async(run)()
+
+    async def next_event(self, subscription):
+        return await asyncio.wait_for(subscription.get(), 1)
+
+    async def test_save_and_delete_publish_cards_for_each_viewer(self):
+        owner = self.subscribe(self.user)
+        other = self.subscribe(self.other)
+
+        def edit():
+            self.ticket.title = "Edited live"
+            self.ticket.save()
+        await self.committed(edit)
+
+        owner_event = (await self.next_event(owner)).payload(self.user)
+        other_event = (await self.next_event(other)).payload(self.other)
+        self.assertEqual(owner_event["type"], "updated")
+        self.assertEqual(owner_event["id"], self.ticket.pk)
+        self.assertIn("Edited live", owner_event["html"])
+        self.assertIn(f'id="ticket-{self.ticket.pk}"', owner_event["html"])
+        self.assertIn("Delete", owner_event["html"])
+        self.assertNotIn("Delete", other_event["html"])
+
+        pk = self.ticket.pk
+        await self.committed(self.ticket.delete)
+        event = await self.next_event(owner)
+        self.assertEqual(event.payload(self.user), {
+            "type": "deleted", "id": pk})
+
+    async def test_queryset_changes_publish_events(self):
+        subscription = self.subscribe(self.user)
+        tickets = Ticket.objects.filter(pk=self.ticket.pk)
+
+        await self.committed(tickets.complete)
+        event = await self.next_event(subscription)
+        self.assertEqual(event.kind, "completed")
+        self.assertIn("Completed", event.payload(self.user)["html"])
+
+        await self.committed(tickets.bulk_delete)
+        event = await self.next_event(subscription)
+        self.assertEqual(
+            (event.kind, event.ticket_id), ("deleted", self.ticket.pk))
+
+    async def test_rolled_back_changes_are_not_published(self):
+        subscription = self.subscribe(self.user)
+
+        def rolled_back():
+            try:
+                with transaction.atomic():
+                    Ticket.objects.create(
+                        title="Never", body="Body", author=self.user)
+                    raise ValueError
+            except ValueError:
+                pass
+        await self.committed(rolled_back)
+        self.assertTrue(subscription.queue.empty())
+
+    async def test_slow_subscriber_is_told_to_resync(self):
+        subscription = self.subscribe(self.user)
+
+        def create_many():
+            for i in range(5):
+                Ticket.objects.create(
+                    title=f"Burst {i}", body="Body", author=self.user)
+        await self.committed(create_many)
+        # Let the loop run the queued put() calls.
+        await asyncio.sleep(0)
+
+        self.assertTrue(subscription.overflowed)
+        self.assertIs(await self.next_event(subscription), RESYNC)
+        self.assertTrue(subscription.queue.empty())
+
+    async def test_receivers_only_connected_while_subscribed(self):
+        self.assertFalse(tickets_changed.has_listeners(Ticket))
+        subscription = self.broker.subscribe(self.user)
+        self.assertTrue(tickets_changed.has_listeners(Ticket))
+        self.broker.unsubscribe(subscription)
+        self.assertFalse(tickets_changed.has_listeners(Ticket))
+
+    async def test_stream_formats_events_and_unsubscribes(self):
+        stream = event_stream(self.user, broker=self.broker)
+        self.assertEqual(await anext(stream), "retry: 5000\n\n")
+        self.assertEqual(len(self.broker), 1)
+
+        await self.committed(
+            Ticket.objects.filter(pk=self.ticket.pk).complete)
+        chunk = await asyncio.wait_for(anext(stream), 1)
+        self.assertTrue(chunk.startswith("data: ") and chunk.endswith("\n\n"))
+        self.assertEqual(json.loads(chunk[6:])["type"], "completed")
+
+        await stream.aclose()
+        self.assertEqual(len(self.broker), 0)
+
+    def test_sync_servers_tell_clients_not_to_reconnect(self):
+        self.client.login(username="testuser", password="pass12345!")
+        response = self.client.get(reverse("ticket_events"))
+        self.assertEqual(response.status_code, 204)
+
+    def test_list_page_subscribes_to_events(self):
+        self.client.login(username="testuser", password="pass12345!")
+        response = self.client.get(reverse("ticket_list"))
+        self.assertContains(response, reverse("ticket_events"))
+        self.assertContains(response, f'id="ticket-{self.ticket.pk}"')
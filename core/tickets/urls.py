@@ -1,10 +1,31 @@
+from django.conf import settings
 from django.urls import path
 from .views import TicketListView, TicketCreateView, TicketUpdateView, TicketDeleteView, ticket_complete
+from .views import TicketBulkActionView, TicketExportView, ticket_events
+from .views import TicketApiView
+from .views import ArchivedTicketListView, ArchivedTicketRestoreView
+from .views import TicketDashboardView
+from .views import AsyncTicketListView, AsyncTicketCreateView, AsyncTicketDeleteView, aticket_complete
+
+if settings.TICKETS_ASYNC_VIEWS:
+    list_view, create_view = AsyncTicketListView, AsyncTicketCreateView
+    delete_view, complete_view = AsyncTicketDeleteView, aticket_complete
+else:
+    list_view, create_view = TicketListView, TicketCreateView
+    delete_view, complete_view = TicketDeleteView, ticket_complete
 
 urlpatterns = [
-    path('', TicketListView.as_view(), name='ticket_list'),
-    path('add', TicketCreateView.as_view(), name='ticket_add'),
+    path('', list_view.as_view(), name='ticket_list'),
+    path('add', create_view.as_view(), name='ticket_add'),
     path('<int:pk>/edit/', TicketUpdateView.as_view(), name='ticket_edit'),
-    path('<int:pk>/delete/', TicketDeleteView.as_view(), name='ticket_delete'),
-    path("<int:pk>/complete/", ticket_complete, name="ticket_complete"),
+    path('<int:pk>/delete/', delete_view.as_view(), name='ticket_delete'),
+    path("<int:pk>/complete/", complete_view, name="ticket_complete"),
+    path("bulk/", TicketBulkActionView.as_view(), name="ticket_bulk"),
+    path("export/", TicketExportView.as_view(), name="ticket_export"),
+    path("api/", TicketApiView.as_view(), name="ticket_api"),
+    path("events/", ticket_events, name="ticket_events"),
+    path("archive/", ArchivedTicketListView.as_view(), name="ticket_archive"),
+    path("archive/<int:pk>/restore/", ArchivedTicketRestoreView.as_view(),
+         name="ticket_restore"),
+    path("dashboard/", TicketDashboardView.as_view(), name="ticket_dashboard"),
 ]
@@ -1,16 +1,134 @@
-from django.contrib.auth.mixins import LoginRequiredMixin
+import hashlib
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+from django.middleware.csrf import get_token
 from django.urls import reverse_lazy
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_POST
 from django.views.generic import ListView, CreateView, UpdateView, DeleteView
-from django.shortcuts import get_object_or_404, redirect
+from django.views.generic import TemplateView, View
+from django.views.generic.list import MultipleObjectMixin
+from django.shortcuts import aget_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, HttpResponseRedirect
+from django.http import JsonResponse, StreamingHttpResponse
 
+from . import api
+from .archive import restore_tickets
+from .cards import render_ticket_cards
+from .events import event_stream
+from .export import FORMATS as EXPORT_FORMATS
+from .export import export_queryset, iter_export
+from .forms import TicketApiForm, TicketBulkActionForm, TicketExportForm
+from .models import ArchivedTicket, AuthorTicketStats, DailyTicketStats
 from .models import Ticket
+from .pagination import KeysetPaginator
+from .search import ORDERING as SEARCH_ORDERING
+from .search import search_tickets
 
 
 class TicketListView(LoginRequiredMixin, ListView):
     model = Ticket
     template_name = "tickets/ticket_list.html"
-    ordering = ["is_completed", "-date"]
+    # ``-id`` breaks ties between tickets raised at the same instant so the
+    # ordering is total, which keyset pagination relies on.
+    ordering = ["is_completed", "-date", "-id"]
+    paginate_by = 50
+
+    def get_search(self):
+        return self.request.GET.get("q", "").strip()
+
+    def get_ordering(self):
+        # Search results are ranked best first instead of by status/date.
+        if self.get_search():
+            return SEARCH_ORDERING
+        return super().get_ordering()
+
+    def get_queryset(self):
+        # Fetch the author in the same query, limited to the columns
+        # CustomUser.__str__ needs, instead of one query per card.
+        queryset = self.model._default_manager.select_related("author").only(
+            "title",
+            "body",
+            "date",
+            "is_completed",
+            "modified",
+            "author__username",
+            "author__first_name",
+            "author__last_name",
+        )
+        if self.get_search():
+            # Annotates ``rank``, so it has to come before the ordering.
+            queryset = search_tickets(queryset, self.get_search())
+        return queryset.order_by(*self.get_ordering())
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["search"] = self.get_search()
+        return context
+
+    def get_etag(self, context):
+        """
+        Validator for the page being served. It covers every input to the
+        rendered page: the viewer (cards and navbar depend on who is
+        looking), their CSRF secret (embedded in the logout form), the
+        search terms (echoed in the search box and page links), and the
+        id and ``modified`` stamp of each ticket on the page plus whether
+        there are pages either side. Edits, completions, deletions and
+        new tickets on this page all change it.
+        """
+        user = self.request.user
+        page = context["page_obj"]
+        # get_token() makes sure the secret the page will embed already
+        # exists, so the first response's ETag matches later requests.
+        get_token(self.request)
+        parts = [
+            user.pk,
+            user.username,
+            user.is_superuser,
+            self.request.META["CSRF_COOKIE"],
+            context["search"],
+            page.has_previous() if page else False,
+            page.has_next() if page else False,
+        ]
+        parts.extend(
+            (ticket.pk, ticket.modified.isoformat())
+            for ticket in context["object_list"]
+        )
+        digest = hashlib.sha256(repr(parts).encode()).hexdigest()
+        return quote_etag(digest[:32])
+
+    def render_to_response(self, context, **response_kwargs):
+        # The page query is a cheap keyset seek, so revalidation costs the
+        # same queries as a normal hit but skips the card and page render.
+        etag = self.get_etag(context)
+        response = get_conditional_response(self.request, etag=etag)
+        if response is None:
+            context["ticket_cards"] = render_ticket_cards(
+                context["object_list"], self.request.user)
+            response = super().render_to_response(context, **response_kwargs)
+        response.headers["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return KeysetPaginator(queryset, per_page, self.get_ordering())
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        page = paginator.page(
+            after=self.request.GET.get("after"),
+            before=self.request.GET.get("before"),
+        )
+        return (paginator, page, page.object_list, page.has_other_pages())
 
 
 class TicketCreateView(LoginRequiredMixin, CreateView):
@@ -52,8 +170,291 @@ class TicketDeleteView(
 
 
 @login_required
+@require_POST
 def ticket_complete(request, pk):
-    ticket = get_object_or_404(Ticket, pk=pk)
-    ticket.is_completed = True
-    ticket.save(update_fields=["is_completed"])
+    if not Ticket.objects.filter(pk=pk).complete():
+        raise Http404("No ticket matches the given query.")
+    return redirect("ticket_list")
+
+
+class TicketBulkActionView(
+        LoginRequiredMixin, OwnerOrSuperuserQuerysetMixin,
+        MultipleObjectMixin, View):
+    """
+    Apply one action to a list of tickets with a single UPDATE or DELETE
+    and report how many rows it touched. Ids the user may not change are
+    filtered out by the same owner-or-superuser rule as the edit views.
+    """
+    model = Ticket
+    http_method_names = ["post"]
+    login_url = reverse_lazy("login")
+
+    def post(self, request, *args, **kwargs):
+        form = TicketBulkActionForm(request.POST)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        action = form.cleaned_data["action"]
+        if action == "reassign" and not request.user.is_superuser:
+            raise PermissionDenied("Only superusers can reassign tickets.")
+
+        ids = form.cleaned_data["ids"]
+        tickets = self.get_queryset().filter(pk__in=ids)
+        if action == "complete":
+            affected = tickets.complete()
+        elif action == "reopen":
+            affected = tickets.reopen()
+        elif action == "reassign":
+            affected = tickets.reassign(form.cleaned_data["author"])
+        else:
+            affected = tickets.bulk_delete()
+        return JsonResponse({
+            "action": action,
+            "requested": len(ids),
+            "affected": affected,
+        })
+
+
+class TicketExportView(LoginRequiredMixin, View):
+    """Stream the ticket table as CSV or JSON lines in constant memory."""
+    login_url = reverse_lazy("login")
+
+    def get(self, request, *args, **kwargs):
+        form = TicketExportForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        filters = form.cleaned_data
+        fmt = filters.pop("format")
+        response = StreamingHttpResponse(
+            iter_export(export_queryset(**filters), fmt),
+            content_type=EXPORT_FORMATS[fmt],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="tickets.{fmt}"')
+        return response
+
+
+class TicketApiView(
+        LoginRequiredMixin, OwnerOrSuperuserQuerysetMixin,
+        MultipleObjectMixin, View):
+    """
+    Read-only JSON list of the tickets the user may edit, newest first.
+
+    ``fields`` picks a comma-separated subset of ``api.FIELDS`` (all by
+    default), ``status`` filters open or completed tickets and ``limit``
+    (at most 200) sets the page size. Pages are keyset paginated: pass the
+    ``next`` or ``previous`` cursor back as ``after`` or ``before``.
+    """
+    model = Ticket
+    http_method_names = ["get"]
+    # Clients get a 403 rather than a redirect to the login page.
+    raise_exception = True
+
+    def get(self, request, *args, **kwargs):
+        form = TicketApiForm(request.GET)
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        params = form.cleaned_data
+        fields = params["fields"]
+        paginator = KeysetPaginator(
+            api.project(self.get_queryset(), fields, params["status"]),
+            params["limit"],
+            api.ORDERING,
+        )
+        try:
+            page = paginator.page(
+                after=params["after"], before=params["before"])
+        except Http404:
+            return JsonResponse(
+                {"errors": {"cursor": ["Invalid cursor."]}}, status=400)
+        return HttpResponse(api.dumps({
+            "results": api.rows_to_dicts(page.object_list, fields),
+            "next": page.next_cursor,
+            "previous": page.previous_cursor,
+        }), content_type=api.CONTENT_TYPE)
+
+
+class ArchivedTicketListView(
+        LoginRequiredMixin, OwnerOrSuperuserQuerysetMixin, ListView):
+    """
+    The user's archived tickets (every one for superusers), newest first.
+    Reads only the archive table and pages through it by keyset, like the
+    ticket list.
+    """
+    model = ArchivedTicket
+    template_name = "tickets/archived_ticket_list.html"
+    login_url = reverse_lazy("login")
+    ordering = ["-date", "-id"]
+    paginate_by = 50
+
+    def get_queryset(self):
+        return super().get_queryset().select_related("author").only(
+            "title", "date", "modified", "archived", "author__username")
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        return KeysetPaginator(queryset, per_page, self.get_ordering())
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        page = paginator.page(
+            after=self.request.GET.get("after"),
+            before=self.request.GET.get("before"),
+        )
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+class ArchivedTicketRestoreView(
+        LoginRequiredMixin, OwnerOrSuperuserQuerysetMixin,
+        MultipleObjectMixin, View):
+    """Move one archived ticket back to the ticket list."""
+    model = ArchivedTicket
+    http_method_names = ["post"]
+    login_url = reverse_lazy("login")
+
+    def post(self, request, *args, **kwargs):
+        if not restore_tickets(self.get_queryset().filter(pk=kwargs["pk"])):
+            raise Http404("No archived ticket matches the given query.")
+        return redirect("ticket_list")
+
+
+class TicketDashboardView(
+        LoginRequiredMixin, UserPassesTestMixin, TemplateView):
+    """
+    Open and completed tickets overall, for the busiest authors and for
+    each recent day, read from the stats rollups (see tickets/stats.py)
+    with three small indexed queries however many tickets there are.
+    Superusers only.
+    """
+    template_name = "tickets/ticket_dashboard.html"
+    login_url = reverse_lazy("login")
+    days = 30
+    authors = 20
+
+    def test_func(self):
+        return self.request.user.is_superuser
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context["totals"] = AuthorTicketStats.objects.aggregate(
+            open=Coalesce(Sum("open"), 0),
+            completed=Coalesce(Sum("completed"), 0),
+        )
+        context["author_stats"] = (
+            AuthorTicketStats.objects.select_related("author")
+            .exclude(open=0, completed=0)
+            .order_by("-open", "-completed")[:self.authors]
+        )
+        today = timezone.localdate()
+        days = [today - timedelta(days=n) for n in range(self.days)]
+        stored = {
+            row.day: row for row in DailyTicketStats.objects.filter(
+                day__range=(days[-1], today))
+        }
+        # Days without tickets have no row.
+        context["daily_stats"] = [
+            stored.get(day) or DailyTicketStats(day=day) for day in days]
+        return context
+
+
+@login_required
+async def ticket_events(request):
+    """
+    Server-sent events announcing created, updated, completed and deleted
+    tickets, each with its card as the viewer should see it, so an open
+    ticket list can patch itself instead of being reloaded.
+    """
+    if not isinstance(request, ASGIRequest):
+        # A never-ending response would tie up a sync worker for good.
+        # EventSource treats 204 as "don't reconnect".
+        return HttpResponse(status=204)
+    response = StreamingHttpResponse(
+        event_stream(await request.auser()),
+        content_type="text/event-stream",
+    )
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx and similar proxies from buffering the stream.
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+# Async versions of the list, create, complete and delete views, served
+# instead of the sync ones when TICKETS_ASYNC_VIEWS is set (see
+# tickets/urls.py). They only pay off under an ASGI server; under WSGI
+# each request would need its own event loop.
+
+class AsyncLoginRequiredMixin(LoginRequiredMixin):
+    """
+    LoginRequiredMixin for views whose handlers are coroutines. The user is
+    loaded with the async ORM and replaces the lazy ``request.user``, so
+    templates and querysets never trigger a blocking lookup.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super(LoginRequiredMixin, self).dispatch(
+            request, *args, **kwargs)
+
+
+class AsyncTicketListView(AsyncLoginRequiredMixin, TicketListView):
+    async def get(self, request, *args, **kwargs):
+        self.object_list = self.get_queryset()
+        paginator = self.get_paginator(
+            self.object_list, self.get_paginate_by(self.object_list))
+        self.page = await paginator.apage(
+            after=request.GET.get("after"),
+            before=request.GET.get("before"),
+        )
+        context = self.get_context_data()
+        # Card cache backends do blocking I/O, so render off the loop.
+        return await sync_to_async(self.render_to_response)(context)
+
+    def paginate_queryset(self, queryset, page_size):
+        # get() has already fetched the page with the async ORM.
+        page = self.page
+        return (page.paginator, page, page.object_list, page.has_other_pages())
+
+
+class AsyncTicketCreateView(AsyncLoginRequiredMixin, TicketCreateView):
+    # Every handler of an async view must be a coroutine, so drop the
+    # inherited synchronous put().
+    http_method_names = ["get", "post", "head", "options"]
+
+    async def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    async def post(self, request, *args, **kwargs):
+        self.object = None
+        form = self.get_form()
+        if not form.is_valid():
+            return self.form_invalid(form)
+        form.instance.author = request.user
+        await form.instance.asave()
+        self.object = form.instance
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class AsyncTicketDeleteView(AsyncLoginRequiredMixin, TicketDeleteView):
+    # Drop the inherited synchronous delete() handler; see above.
+    http_method_names = ["get", "post", "head", "options"]
+
+    async def aget_object(self):
+        return await aget_object_or_404(
+            self.get_queryset(), pk=self.kwargs[self.pk_url_kwarg])
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        return self.render_to_response(self.get_context_data())
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.aget_object()
+        await self.object.adelete()
+        return HttpResponseRedirect(self.get_success_url())
+
+
+@login_required
+@require_POST
+async def aticket_complete(request, pk):
+    if not await Ticket.objects.filter(pk=pk).acomplete():
+        raise Http404("No ticket matches the given query.")
     return redirect("ticket_list")